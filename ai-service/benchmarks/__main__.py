@@ -0,0 +1,82 @@
+import argparse
+import json
+import sys
+
+from benchmarks import compare, corpus, load, micro
+from executor import PARSE_MAX_PENDING
+
+
+def _write(result, path):
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if path:
+        with open(path, "w") as out:
+            out.write(text + "\n")
+        print(f"Wrote {path}")
+    else:
+        print(text)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="AI service benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a synthetic resume corpus")
+    generate.add_argument("directory")
+    generate.add_argument("--count", type=int, default=20)
+    generate.add_argument("--formats", default="txt,pdf,docx")
+    generate.add_argument("--experience-entries", type=int, default=4)
+    generate.add_argument("--sections", default=",".join(corpus.SECTIONS), help="comma-separated, in order")
+    generate.add_argument("--no-adversarial", action="store_true")
+    generate.add_argument("--seed", type=int, default=0)
+
+    micro_parser = commands.add_parser("micro", help="time each extractor and match_skills in-process")
+    micro_parser.add_argument("--repeat", type=int, default=7)
+    micro_parser.add_argument("--min-seconds", type=float, default=0.05)
+    micro_parser.add_argument("--output")
+
+    load_parser = commands.add_parser("load", help="HTTP load test against a local uvicorn")
+    load_parser.add_argument("--requests", type=int, default=200)
+    load_parser.add_argument(
+        "--concurrency", type=int, default=PARSE_MAX_PENDING,
+        help="requests in flight; above PARSE_MAX_PENDING per worker the service answers 503",
+    )
+    load_parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when starting the service")
+    load_parser.add_argument("--url", help="test an already running service instead of starting one")
+    load_parser.add_argument("--only", help="comma-separated scenarios: parse-text, parse-pdf, match-skills")
+    load_parser.add_argument("--output")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 = 10%%")
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        paths = corpus.generate(
+            args.directory, args.count, args.formats.split(","), args.experience_entries,
+            args.sections.split(","), not args.no_adversarial, args.seed,
+        )
+        print(f"Wrote {len(paths)} files to {args.directory}")
+    elif args.command == "micro":
+        _write(micro.run(args.repeat, args.min_seconds), args.output)
+    elif args.command == "load":
+        only = args.only.split(",") if args.only else None
+        result = load.run(args.requests, args.concurrency, args.workers, args.url, only)
+        errors = load.failed(result)
+        if errors:
+            # Latencies of a run that dropped requests are not comparable, so it is never written
+            summary = ", ".join(f"{name}: {count}" for name, count in errors.items())
+            print(f"Requests failed ({summary}); lower --concurrency or add workers", file=sys.stderr)
+            return 1
+        _write(result, args.output)
+    else:
+        with open(args.baseline) as baseline_file, open(args.current) as current_file:
+            rows = compare.compare(json.load(baseline_file), json.load(current_file), args.threshold)
+        report, regressions = compare.format_report(rows)
+        print(report)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Tuple
+
+# Stats compared for each benchmark kind, and whether higher is better. The fastest
+# micro run is compared because it is the least disturbed by other load on the host.
+COMPARED_STATS = {
+    "micro": [("min_ms", False), ("allocated_kb", False)],
+    "load": [("p95_ms", False), ("throughput_rps", True), ("errors", False)],
+}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Every compared stat of every benchmark present in both runs, flagged when worse by more than threshold"""
+    if baseline.get("kind") != current.get("kind"):
+        raise ValueError(f"Cannot compare a {baseline.get('kind')} run with a {current.get('kind')} run")
+
+    rows = []
+    for name, stats in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        for stat, higher_is_better in COMPARED_STATS[current["kind"]]:
+            before, after = previous.get(stat), stats.get(stat)
+            if before is None or after is None:
+                continue
+            if before:
+                change = (after - before) / before
+            else:
+                # A zero baseline (no errors) has nothing to scale by: any increase is a regression
+                change = float("inf") if after > 0 else 0.0
+            worse = -change if higher_is_better else change
+            rows.append({
+                "benchmark": name,
+                "stat": stat,
+                "baseline": before,
+                "current": after,
+                "change": round(change * 100, 1),
+                "regression": worse > threshold,
+            })
+    return rows
+
+
+def format_report(rows: List[Dict[str, Any]]) -> Tuple[str, int]:
+    """Human-readable table and the number of regressions"""
+    width = max([len(row["benchmark"]) for row in rows] + [9])
+    lines = [f"{'benchmark':<{width}}  {'stat':<14} {'baseline':>10} {'current':>10} {'change':>8}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['benchmark']:<{width}}  {row['stat']:<14} {row['baseline']:>10} {row['current']:>10} "
+            f"{row['change']:>+7.1f}%{flag}"
+        )
+    regressions = sum(1 for row in rows if row["regression"])
+    lines.append(f"{regressions} regression(s) in {len(rows)} comparisons")
+    return "\n".join(lines), regressions
@@ -0,0 +1,202 @@
+import io
+import os
+import random
+from typing import Dict, List, Optional, Sequence
+
+FIRST_NAMES = ["Aarav", "Diya", "Kabir", "Meera", "Rohan", "Sara", "Vikram", "Ananya", "Arjun", "Isha"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Khan", "Reddy", "Gupta", "Nair", "Singh", "Das", "Joshi"]
+CITIES = ["Pune, Maharashtra", "Bangalore, Karnataka", "Austin, TX", "Chennai, Tamil Nadu", "Seattle, WA"]
+POSITIONS = [
+    "Software Engineer", "Senior Developer", "Full Stack Developer", "Data Scientist", "DevOps Engineer",
+    "Backend Developer", "QA Engineer", "Cloud Engineer", "Team Lead", "Business Analyst",
+]
+COMPANIES = [
+    "Infosys Technologies", "Acme Solutions Pvt Ltd", "Globex Systems", "Initech Software", "Umbrella Labs",
+    "Stark Consulting", "Wayne Services", "Hooli Inc", "Pied Piper Corp", "Vandelay Industries LLC",
+]
+DEGREES = ["Bachelor of Technology", "B.Sc Computer Science", "Master of Science", "MBA", "B.E. Electronics"]
+INSTITUTIONS = ["Savitribai Phule Pune University", "IIT Bombay", "Anna University", "University of Texas"]
+CERTIFICATES = [
+    "AWS Certified Solutions Architect", "Microsoft Certified: Azure", "Certified Kubernetes Administrator",
+    "PMP", "CCNA", "Google Cloud Professional Data Engineer", "Scrum Master",
+]
+SOFT_SKILLS = ["leadership", "communication", "teamwork", "problem solving", "time management"]
+FALLBACK_SKILLS = [
+    "python", "java", "javascript", "react", "node.js", "docker", "kubernetes", "aws", "postgresql", "git",
+]
+
+SECTIONS = ("summary", "experience", "education", "skills", "projects", "certifications")
+
+# Inputs that used to make the extractors super-linear (see patterns.py)
+ADVERSARIAL_KINDS = ("long-line", "no-sections", "letter-run", "company-scan")
+
+
+def taxonomy_skills() -> List[str]:
+    """Skills from the service taxonomy, so generated resumes exercise real matches"""
+    try:
+        from taxonomy import load_taxonomy
+        return load_taxonomy().names
+    except Exception:
+        return list(FALLBACK_SKILLS)
+
+
+def resume_text(
+    rng: random.Random,
+    experience_entries: int = 3,
+    sections: Sequence[str] = SECTIONS,
+    skills: Optional[List[str]] = None,
+) -> str:
+    """One resume as plain text, with the given sections in the given order"""
+    skills = skills or FALLBACK_SKILLS
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", "")
+    lines = [
+        name,
+        f"{handle}@example.com | +91 98{rng.randint(10000000, 99999999)} | {rng.choice(CITIES)}",
+        f"linkedin.com/in/{handle} | github.com/{handle}",
+        "",
+    ]
+    for section in sections:
+        if section == "summary":
+            lines += ["PROFESSIONAL SUMMARY", f"{rng.choice(POSITIONS)} with {rng.randint(1, 12)} years of experience "
+                      f"building {rng.choice(['web', 'data', 'cloud', 'mobile'])} platforms.", ""]
+        elif section == "experience":
+            lines.append("WORK EXPERIENCE")
+            year = 2024
+            for _ in range(experience_entries):
+                start = year - rng.randint(1, 3)
+                lines += [
+                    f"{rng.choice(POSITIONS)} at {rng.choice(COMPANIES)}",
+                    f"{start} - {'Present' if year == 2024 else year}",
+                    f"- Built services in {', '.join(rng.sample(skills, 3))}",
+                    f"- Improved latency by {rng.randint(10, 80)}% for {rng.randint(2, 50)}k users",
+                    "",
+                ]
+                year = start
+        elif section == "education":
+            lines += ["EDUCATION", rng.choice(DEGREES), f"{rng.choice(INSTITUTIONS)}, {rng.randint(2010, 2022)}", ""]
+        elif section == "skills":
+            picked = rng.sample(skills, min(len(skills), rng.randint(8, 20))) + rng.sample(SOFT_SKILLS, 2)
+            lines += ["TECHNICAL SKILLS", ", ".join(picked), ""]
+        elif section == "projects":
+            lines += ["PROJECTS", f"Resume parser using {rng.choice(skills)} and {rng.choice(skills)}", ""]
+        elif section == "certifications":
+            lines.append("CERTIFICATIONS")
+            for certificate in rng.sample(CERTIFICATES, 3):
+                lines.append(f"{certificate} - ID: {rng.choice(['AWS', 'MS', 'CKA'])}-{rng.randint(10000, 99999)} "
+                             f"({rng.randint(2018, 2024)})")
+            lines.append("")
+    return "\n".join(lines)
+
+
+def adversarial_text(kind: str, size: int) -> str:
+    """Worst-case inputs of roughly `size` characters"""
+    if kind == "long-line":
+        return "Experience " + " ".join("word" for _ in range(size // 5))
+    if kind == "no-sections":
+        rng = random.Random(size)
+        return "\n".join(f"{rng.choice(POSITIONS)} {rng.choice(FALLBACK_SKILLS)} {rng.randint(1990, 2024)}"
+                         for _ in range(size // 40))
+    if kind == "letter-run":
+        return "CERTIFICATIONS\n" + "A" * size
+    if kind == "company-scan":
+        return "EXPERIENCE\n" + "worked at " * (size // 10)
+    raise ValueError(f"Unknown adversarial kind: {kind}")
+
+
+def profiles(seed: int = 0) -> Dict[str, str]:
+    """The named texts every benchmark runs against"""
+    rng = random.Random(seed)
+    skills = taxonomy_skills()
+    corpus = {
+        "short": resume_text(rng, 1, ("experience", "education", "skills"), skills),
+        "medium": resume_text(rng, 4, SECTIONS, skills),
+        "long": resume_text(rng, 25, SECTIONS, skills),
+        "shuffled": resume_text(rng, 4, rng.sample(SECTIONS, len(SECTIONS)), skills),
+    }
+    for kind in ADVERSARIAL_KINDS:
+        corpus[f"adversarial-{kind}"] = adversarial_text(kind, 100_000)
+    return corpus
+
+
+def _pdf_escape(line: str) -> str:
+    return line.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def to_pdf(text: str, lines_per_page: int = 60) -> bytes:
+    """Minimal text-only PDF (Helvetica, one text object per page); no PDF library required"""
+    lines = text.split("\n") or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page) + " ET"
+        data = stream.encode("latin-1")
+        contents = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 %d 0 R >> >> "
+            b"/Contents %d 0 R >>" % (tree, font, contents)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % tree
+    kids = " ".join(f"{page} 0 R" for page in page_ids).encode()
+    objects[tree - 1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+def to_docx(text: str) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def generate(
+    directory: str,
+    count: int = 20,
+    formats: Sequence[str] = ("txt", "pdf", "docx"),
+    experience_entries: int = 4,
+    sections: Sequence[str] = SECTIONS,
+    adversarial: bool = True,
+    seed: int = 0,
+) -> List[str]:
+    """Write `count` resumes per format (plus adversarial cases) and return their paths"""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    skills = taxonomy_skills()
+    texts = {f"resume-{i:04d}": resume_text(rng, experience_entries, sections, skills) for i in range(count)}
+    if adversarial:
+        texts.update({f"adversarial-{kind}": adversarial_text(kind, 100_000) for kind in ADVERSARIAL_KINDS})
+
+    writers = {"txt": lambda text: text.encode(), "pdf": to_pdf, "docx": to_docx}
+    paths = []
+    for name, text in texts.items():
+        for extension in formats:
+            path = os.path.join(directory, f"{name}.{extension}")
+            with open(path, "wb") as out:
+                out.write(writers[extension](text))
+            paths.append(path)
+    return paths
@@ -0,0 +1,153 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks import corpus
+from benchmarks.micro import environment
+from executor import PARSE_MAX_PENDING
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (method, path, body, content type) for one request
+Request = Tuple[str, str, bytes, str]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_service(workers: int = 1, env: Optional[Dict[str, str]] = None) -> Tuple[subprocess.Popen, str]:
+    """Start uvicorn on a free local port and wait until /health answers"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=SERVICE_DIR,
+        env={**os.environ, **(env or {})},
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=1):
+                return process, url
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 60s")
+
+
+def multipart(field: str, filename: str, content: bytes) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def scenarios(seed: int = 0) -> Dict[str, Callable[[int], Request]]:
+    """Request factories by scenario; each call gets a sequence number so parses are never cache hits"""
+    texts = corpus.profiles(seed)
+    medium = texts["medium"]
+    pdf_text = texts["long"]
+    skills = corpus.taxonomy_skills()
+
+    def parse_text(i: int) -> Request:
+        body = json.dumps({"text": f"{medium}\nRef {i}"}).encode()
+        return "POST", "/parse-resume-text", body, "application/json"
+
+    def parse_pdf(i: int) -> Request:
+        body, content_type = multipart("file", f"resume-{i}.pdf", corpus.to_pdf(f"{pdf_text}\nRef {i}"))
+        return "POST", "/parse-resume-file", body, content_type
+
+    def match(i: int) -> Request:
+        body = json.dumps({"resume_skills": skills[i % 10:i % 10 + 30], "job_skills": skills[-30:]}).encode()
+        return "POST", "/match-skills", body, "application/json"
+
+    return {"parse-text": parse_text, "parse-pdf": parse_pdf, "match-skills": match}
+
+
+def _send(url: str, request: Request) -> Tuple[float, int]:
+    method, path, body, content_type = request
+    http_request = urllib.request.Request(f"{url}{path}", data=body, method=method, headers={"Content-Type": content_type})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(http_request, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = 0
+    return (time.perf_counter() - started) * 1000, status
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 2) if ordered else 0.0
+
+
+def run_scenario(url: str, factory: Callable[[int], Request], requests: int, concurrency: int) -> Dict[str, Any]:
+    """Send `requests` requests with `concurrency` in flight and summarize latency and throughput"""
+    prepared = [factory(i) for i in range(requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(lambda request: _send(url, request), prepared))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, status in outcomes if status == 200)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(1 for _, status in outcomes if status != 200),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+    }
+
+
+def run(
+    requests: int = 200,
+    concurrency: int = PARSE_MAX_PENDING,
+    workers: int = 1,
+    url: Optional[str] = None,
+    only: Optional[List[str]] = None,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Load-test a running service at `url`, or a fresh local uvicorn when url is None"""
+    process = None
+    if url is None:
+        process, url = start_service(workers)
+    try:
+        results = {}
+        for name, factory in scenarios(seed).items():
+            if only and name not in only:
+                continue
+            _send(url, factory(-1))  # warm up
+            results[name] = run_scenario(url, factory, requests, concurrency)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    meta = environment()
+    meta.update({"workers": workers, "url": url})
+    return {"kind": "load", "meta": meta, "results": results}
+
+
+def failed(result: Dict[str, Any]) -> Dict[str, int]:
+    """Scenarios with failed requests and how many; such a run is not a valid baseline"""
+    return {name: stats["errors"] for name, stats in result["results"].items() if stats["errors"]}
@@ -0,0 +1,91 @@
+import asyncio
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from benchmarks import corpus
+
+
+def _time(fn: Callable[[], Any], repeat: int, min_seconds: float) -> List[float]:
+    """Per-call durations in milliseconds: `repeat` rounds of as many calls as fill min_seconds"""
+    started = time.perf_counter()
+    fn()
+    calls = max(1, int(min_seconds / max(time.perf_counter() - started, 1e-6)))
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - started) / calls * 1000)
+    return samples
+
+
+def _allocated_kb(fn: Callable[[], Any]) -> float:
+    """Peak memory traced while fn runs once, in KiB"""
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "min_ms": round(ordered[0], 4),
+    }
+
+
+def run(repeat: int = 7, min_seconds: float = 0.05, seed: int = 0) -> Dict[str, Any]:
+    """Time DOCX text extraction, each extractor, the whole parse, rendering its response and match_skills on every corpus profile"""
+    import main
+
+    texts = corpus.profiles(seed)
+    results: Dict[str, Dict[str, float]] = {}
+    for profile, text in texts.items():
+        sections = main.segment(text)
+        parsed = main.parse_text(text)
+        docx = corpus.to_docx(text)
+        benchmarks = {
+            "extract_text_from_docx": lambda: main.extract_text_from_docx(docx),
+            "segment": lambda: main.segment(text),
+            "extract_personal_info": lambda: main.extract_personal_info(text),
+            "extract_experience": lambda: main.extract_experience(text, sections),
+            "extract_education": lambda: main.extract_education(text, sections),
+            "extract_skills": lambda: main.extract_skills(text),
+            "extract_certificates": lambda: main.extract_certificates(text, sections),
+            "parse_text": lambda: main.parse_text(text),
+            "render_parse_result": lambda: main.parsed_response(parsed),
+        }
+        for name, fn in benchmarks.items():
+            results[f"{name}[{profile}]"] = _summary(_time(fn, repeat, min_seconds))
+        for name in ("parse_text", "render_parse_result"):
+            results[f"{name}[{profile}]"]["allocated_kb"] = _allocated_kb(benchmarks[name])
+
+    skills = corpus.taxonomy_skills()
+    loop = asyncio.new_event_loop()
+    try:
+        for size in (10, 50):
+            request = main.SkillsMatchRequest(resume_skills=skills[:size], job_skills=skills[-size:])
+            results[f"match_skills[{size}x{size}]"] = _summary(
+                _time(lambda: loop.run_until_complete(main.match_skills(request)), repeat, min_seconds)
+            )
+    finally:
+        loop.close()
+
+    return {"kind": "micro", "meta": environment(), "results": results}
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
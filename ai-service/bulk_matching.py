@@ -0,0 +1,194 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from canonical import normalize_skill
+from semantic import SEMANTIC_MATCH_THRESHOLD, AnnIndex
+
+# Same threshold as /match-skills: a partial match needs word Jaccard above this
+PARTIAL_MATCH_THRESHOLD = 0.5
+
+
+class Vocabulary:
+    """Maps canonical skill spellings and their words to dense integer ids"""
+
+    def __init__(self, canonical: Optional[Dict[str, str]] = None):
+        # Canonical spelling of each input skill; lowercasing is the fallback
+        self.canonical = canonical or {}
+        self.skill_ids: Dict[str, int] = {}
+        self.word_ids: Dict[str, int] = {}
+        self.skill_words: List[List[int]] = []
+        # First input spelling of each skill, which is what semantic vectors are keyed by
+        self.spellings: List[str] = []
+
+    def key(self, skill: str) -> str:
+        return self.canonical.get(skill) or skill.lower()
+
+    def add(self, skill: str) -> int:
+        key = self.key(skill)
+        skill_id = self.skill_ids.get(key)
+        if skill_id is None:
+            skill_id = len(self.skill_ids)
+            self.skill_ids[key] = skill_id
+            words = {self.word_ids.setdefault(word, len(self.word_ids)) for word in key.split()}
+            self.skill_words.append(sorted(words))
+            self.spellings.append(skill)
+        return skill_id
+
+    def word_matrix(self) -> sparse.csr_matrix:
+        """Skill × word incidence matrix"""
+        rows = [skill_id for skill_id, words in enumerate(self.skill_words) for _ in words]
+        cols = [word for words in self.skill_words for word in words]
+        data = np.ones(len(rows), dtype=np.float64)
+        return sparse.csr_matrix((data, (rows, cols)), shape=(len(self.skill_words), max(1, len(self.word_ids))))
+
+
+def _incidence(profiles: List[List[str]], vocab: Vocabulary, counts: bool) -> sparse.csr_matrix:
+    """Profile × skill matrix; counts keeps duplicate skills, otherwise entries are 0/1"""
+    rows, cols = [], []
+    for row, skills in enumerate(profiles):
+        for skill in skills:
+            rows.append(row)
+            cols.append(vocab.add(skill))
+    data = np.ones(len(rows), dtype=np.float64)
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(profiles), len(vocab.skill_ids)))
+    if not counts:
+        matrix.data[:] = 1.0
+    return matrix
+
+
+def _semantic_similarity(vocab: Vocabulary, job_skill_ids: np.ndarray, vectors: Dict[str, np.ndarray]) -> sparse.csr_matrix:
+    """Embedding cosine of each job skill against every vocabulary skill, kept at or above the threshold"""
+    skills = vocab.spellings
+    index = AnnIndex(np.stack([vectors[normalize_skill(skill)] for skill in skills]))
+    neighbours = index.query_many(index.vectors[job_skill_ids], len(skills), SEMANTIC_MATCH_THRESHOLD)
+    rows, cols, data = [], [], []
+    for row, found in enumerate(neighbours):
+        for col, similarity in found:
+            # Rounded like /match-skills, which also keeps the number of score levels small
+            rows.append(row)
+            cols.append(col)
+            data.append(round(similarity, 2))
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(job_skill_ids), len(skills)))
+
+
+def _similarity(vocab: Vocabulary, job_skill_ids: np.ndarray, vectors: Optional[Dict[str, np.ndarray]] = None) -> sparse.csr_matrix:
+    """Thresholded word-Jaccard (and optionally embedding) similarity of each job skill against every vocabulary skill"""
+    words = vocab.word_matrix()
+    sizes = np.asarray(words.sum(axis=1)).ravel()
+    job_words = words[job_skill_ids]
+
+    overlap = (job_words @ words.T).tocoo()
+    union = sizes[job_skill_ids][overlap.row] + sizes[overlap.col] - overlap.data
+    jaccard = overlap.data / union
+    keep = jaccard > PARTIAL_MATCH_THRESHOLD
+    similarity = sparse.csr_matrix(
+        (jaccard[keep], (overlap.row[keep], overlap.col[keep])),
+        shape=(len(job_skill_ids), len(vocab.skill_ids)),
+    )
+    if vectors is not None and len(job_skill_ids):
+        similarity = similarity.maximum(_semantic_similarity(vocab, job_skill_ids, vectors))
+
+    # An exact (canonical) match always scores 1.0, even for skills with no words
+    exact = sparse.csr_matrix(
+        (np.ones(len(job_skill_ids)), (np.arange(len(job_skill_ids)), job_skill_ids)),
+        shape=similarity.shape,
+    )
+    return similarity.maximum(exact)
+
+
+class BulkMatchScores:
+    """Per-skill and overall match scores for every resume × job pair"""
+
+    def __init__(
+        self,
+        resumes: List[List[str]],
+        jobs: List[List[str]],
+        semantic_vectors: Optional[Dict[str, np.ndarray]] = None,
+        canonical: Optional[Dict[str, str]] = None,
+    ):
+        self.resumes = resumes
+        self.jobs = jobs
+
+        vocab = Vocabulary(canonical)
+        resume_matrix = _incidence(resumes, vocab, counts=False)
+        job_counts = _incidence(jobs, vocab, counts=True)
+        vocab_size = len(vocab.skill_ids)
+        resume_matrix.resize((len(resumes), vocab_size))
+
+        # Only skills that appear in some job need a score column
+        self._job_skill_ids = np.unique(job_counts.indices)
+        self._column = {int(skill_id): col for col, skill_id in enumerate(self._job_skill_ids)}
+        self._vocab = vocab
+        similarity = _similarity(vocab, self._job_skill_ids, semantic_vectors)
+
+        # score[i, j] = max over resume i's skills of similarity[j, skill]. Jaccard takes few
+        # distinct values, so the max is one sparse product per value level, best first.
+        scores = np.zeros((len(resumes), len(self._job_skill_ids)), dtype=np.float64)
+        for level in np.unique(similarity.data)[::-1]:
+            at_level = (similarity == level).astype(np.float64)
+            hits = (resume_matrix @ at_level.T).toarray() > 0
+            np.maximum(scores, np.where(hits, level, 0.0), out=scores)
+        self.skill_scores = scores
+
+        # matched[i, k] counts job k's skills (with duplicates) that resume i matches
+        job_columns = job_counts[:, self._job_skill_ids]
+        matched = sparse.csr_matrix(scores > 0, dtype=np.float64) @ job_columns.T
+        job_sizes = np.asarray(job_counts.sum(axis=1)).ravel()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.match_percentage = np.where(job_sizes > 0, matched.toarray() / job_sizes * 100, 0.0)
+        # Sum of per-skill scores breaks ties between equal match percentages
+        self.score_total = (sparse.csr_matrix(scores) @ job_columns.T).toarray()
+
+    def top_k(self, k: int, by_job: bool) -> List[List[int]]:
+        """Best k indices per job (ranking resumes) or per resume (ranking jobs)"""
+        percentage = self.match_percentage.T if by_job else self.match_percentage
+        total = self.score_total.T if by_job else self.score_total
+        rankings = []
+        for row_percentage, row_total in zip(percentage, total):
+            k_row = min(k, len(row_percentage))
+            if k_row == 0:
+                rankings.append([])
+                continue
+            # Rounded percentages compare the way clients see them
+            order = np.lexsort((-row_total, -np.round(row_percentage, 2)))
+            rankings.append(order[:k_row].tolist())
+        return rankings
+
+    def details(self, resume_index: int, job_index: int) -> Dict[str, Any]:
+        """Build the /match-skills response body for one pair"""
+        matched_skills, missing_skills, skill_scores = [], [], {}
+        for job_skill in self.jobs[job_index]:
+            column = self._column[self._vocab.skill_ids[self._vocab.key(job_skill)]]
+            score = float(self.skill_scores[resume_index, column])
+            if score > 0:
+                matched_skills.append(job_skill)
+            else:
+                missing_skills.append(job_skill)
+            skill_scores[job_skill] = score
+        return {
+            "match_percentage": round(float(self.match_percentage[resume_index, job_index]), 2),
+            "matched_skills": matched_skills,
+            "missing_skills": missing_skills,
+            "skill_scores": skill_scores,
+        }
+
+
+def rank_matches(
+    resumes: List[List[str]],
+    jobs: List[List[str]],
+    top_k: int,
+    by_job: bool,
+    semantic_vectors: Optional[Dict[str, np.ndarray]] = None,
+    canonical: Optional[Dict[str, str]] = None,
+) -> List[List[Tuple[int, Dict[str, Any]]]]:
+    """Score every pair and return, per row, the top_k (index, match details) entries"""
+    scores = BulkMatchScores(resumes, jobs, semantic_vectors, canonical)
+    rankings = []
+    for row, best in enumerate(scores.top_k(top_k, by_job)):
+        if by_job:
+            rankings.append([(index, scores.details(index, row)) for index in best])
+        else:
+            rankings.append([(index, scores.details(row, index)) for index in best])
+    return rankings
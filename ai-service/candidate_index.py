@@ -0,0 +1,324 @@
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from canonical import normalize_skill
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: single worker, no cross-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Index settings, overridable per deployment
+CANDIDATE_INDEX_DIR = os.getenv("CANDIDATE_INDEX_DIR", "")  # empty keeps the index in memory only
+CANDIDATE_INDEX_COMPACT_EVERY = int(os.getenv("CANDIDATE_INDEX_COMPACT_EVERY", "10000"))
+
+_EMPTY_POSTINGS = np.zeros(0, dtype=np.uint32)
+
+
+class CandidateIndex:
+    """Inverted index from normalized skill to candidate, with top-k retrieval.
+
+    On disk the index is a memory-mapped snapshot (one sorted uint32 posting array
+    per skill) plus an append-only ingest log. Every worker maps the same snapshot
+    and replays the log tail, so updates from any worker become visible to all and
+    a restart only has to map the file. Compaction folds the log into a new
+    snapshot generation.
+    """
+
+    def __init__(
+        self,
+        directory: str = CANDIDATE_INDEX_DIR,
+        compact_every: int = CANDIDATE_INDEX_COMPACT_EVERY,
+        normalize: Callable[[str], str] = normalize_skill,
+    ):
+        self.directory = directory
+        self.compact_every = compact_every
+        # Index terms; the service passes the taxonomy canonicalizer so aliases find each other
+        self.normalize = normalize
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._log_offset = 0
+        self._load_base(None, {}, [])
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            with self._lock:
+                self._catch_up()
+
+    # Snapshot (read-only base) and delta state
+
+    def _load_base(self, postings: Optional[np.ndarray], terms: Dict[str, List[int]], candidates: List[str]) -> None:
+        self._base_postings = postings if postings is not None else _EMPTY_POSTINGS
+        self._base_terms = terms
+        self._base_ids = candidates
+        self._base_docs = {candidate: doc for doc, candidate in enumerate(candidates)}
+        # Candidates changed since the snapshot: id -> skills (empty tuple means deleted)
+        self._delta: Dict[str, Tuple[str, ...]] = {}
+        self._delta_postings: Dict[str, Set[str]] = {}
+        self._delta_docs: Dict[str, int] = {}
+        self._delta_ids: List[str] = []
+        self._overridden: Set[int] = set()
+        self._overridden_array = _EMPTY_POSTINGS
+
+    def _apply(self, candidate_id: str, skills: Sequence[str]) -> None:
+        for term in self._delta.get(candidate_id, ()):
+            self._delta_postings[term].discard(candidate_id)
+
+        base_doc = self._base_docs.get(candidate_id)
+        if base_doc is not None and base_doc not in self._overridden:
+            self._overridden.add(base_doc)
+            self._overridden_array = np.array(sorted(self._overridden), dtype=np.uint32)
+
+        terms = tuple(sorted({self.normalize(skill) for skill in skills if skill.strip()}))
+        self._delta[candidate_id] = terms
+        if candidate_id not in self._delta_docs:
+            self._delta_docs[candidate_id] = len(self._base_ids) + len(self._delta_ids)
+            self._delta_ids.append(candidate_id)
+        for term in terms:
+            self._delta_postings.setdefault(term, set()).add(candidate_id)
+
+    # Files shared between workers
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        with self._lock:
+            if not self.directory or fcntl is None:
+                yield
+                return
+            with open(self._path("index.lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_generation(self) -> int:
+        try:
+            with open(self._path("CURRENT")) as current:
+                return int(current.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _catch_up(self) -> None:
+        """Map a newer snapshot if another worker compacted, then replay new log entries"""
+        if not self.directory:
+            return
+
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._map_snapshot(generation)
+
+        try:
+            with open(self._path(f"ingest-{self._generation}.log"), "rb") as log:
+                log.seek(self._log_offset)
+                tail = log.read()
+        except FileNotFoundError:
+            return
+
+        # A writer may be mid-append; only complete lines are applied
+        complete = tail.rfind(b"\n") + 1
+        for line in tail[:complete].splitlines():
+            entry = json.loads(line)
+            self._apply(entry["id"], entry.get("skills") or ())
+        self._log_offset += complete
+
+    def _map_snapshot(self, generation: int) -> None:
+        snapshot_dir = self._path(f"snapshot-{generation}")
+        with open(os.path.join(snapshot_dir, "meta.json")) as meta_file:
+            meta = json.load(meta_file)
+        postings_path = os.path.join(snapshot_dir, "postings.u32")
+        postings = np.memmap(postings_path, dtype=np.uint32, mode="r") if os.path.getsize(postings_path) else None
+        self._load_base(postings, meta["terms"], meta["candidates"])
+        self._generation = generation
+        self._log_offset = 0
+        logger.info(f"Mapped candidate index snapshot {generation} with {len(meta['candidates'])} candidates")
+
+    def _append(self, candidate_id: str, skills: Optional[Sequence[str]]) -> None:
+        line = json.dumps({"id": candidate_id, "skills": list(skills) if skills is not None else None}) + "\n"
+        fd = os.open(self._path(f"ingest-{self._generation}.log"), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+        self._log_offset += len(line.encode())
+
+    # Public API
+
+    def upsert(self, candidate_id: str, skills: Sequence[str]) -> None:
+        self._write(candidate_id, skills)
+
+    def delete(self, candidate_id: str) -> None:
+        self._write(candidate_id, None)
+
+    def _write(self, candidate_id: str, skills: Optional[Sequence[str]]) -> None:
+        with self._file_lock():
+            self._catch_up()
+            if self.directory:
+                self._append(candidate_id, skills)
+            self._apply(candidate_id, skills or ())
+            if len(self._delta) >= self.compact_every:
+                self._compact()
+
+    def snapshot(self) -> int:
+        """Fold every change so far into a new snapshot generation"""
+        with self._file_lock():
+            self._catch_up()
+            self._compact()
+            return self._generation
+
+    def _compact(self) -> None:
+        # Renumber surviving base documents in order, then append changed candidates;
+        # every merged posting list therefore stays sorted
+        keep = np.ones(len(self._base_ids), dtype=bool)
+        if self._overridden:
+            keep[self._overridden_array] = False
+        new_doc = np.cumsum(keep, dtype=np.int64) - 1
+        candidates = [candidate for candidate, kept in zip(self._base_ids, keep) if kept]
+
+        live = [(candidate, terms) for candidate, terms in self._delta.items() if terms]
+        delta_postings: Dict[str, List[int]] = {}
+        for candidate, terms in live:
+            doc = len(candidates)
+            candidates.append(candidate)
+            for term in terms:
+                delta_postings.setdefault(term, []).append(doc)
+
+        arrays, terms_meta, offset = [], {}, 0
+        for term in sorted(set(self._base_terms) | set(delta_postings)):
+            base = self._base_list(term)
+            merged = np.concatenate([
+                new_doc[base].astype(np.uint32),
+                np.array(delta_postings.get(term, []), dtype=np.uint32),
+            ])
+            if len(merged):
+                arrays.append(merged)
+                terms_meta[term] = [offset, len(merged)]
+                offset += len(merged)
+
+        if not self.directory:
+            self._load_base(np.concatenate(arrays) if arrays else None, terms_meta, candidates)
+            return
+
+        generation = self._generation + 1
+        snapshot_dir = self._path(f"snapshot-{generation}")
+        os.makedirs(snapshot_dir, exist_ok=True)
+        (np.concatenate(arrays) if arrays else _EMPTY_POSTINGS).tofile(os.path.join(snapshot_dir, "postings.u32"))
+        with open(os.path.join(snapshot_dir, "meta.json"), "w") as meta_file:
+            json.dump({"terms": terms_meta, "candidates": candidates}, meta_file)
+        open(self._path(f"ingest-{generation}.log"), "ab").close()
+
+        # Publishing CURRENT is the atomic switch; other workers pick it up on their next call
+        with open(self._path("CURRENT.tmp"), "w") as current:
+            current.write(str(generation))
+        os.replace(self._path("CURRENT.tmp"), self._path("CURRENT"))
+
+        previous = self._generation
+        self._map_snapshot(generation)
+        # Workers still holding the old mapping keep reading it until they catch up
+        shutil.rmtree(self._path(f"snapshot-{previous}"), ignore_errors=True)
+        try:
+            os.remove(self._path(f"ingest-{previous}.log"))
+        except FileNotFoundError:
+            pass
+
+    def _base_list(self, term: str) -> np.ndarray:
+        """Snapshot postings for a term, without candidates changed since the snapshot"""
+        location = self._base_terms.get(term)
+        if location is None:
+            return _EMPTY_POSTINGS
+        offset, length = location
+        postings = self._base_postings[offset:offset + length]
+        if self._overridden:
+            postings = postings[~np.isin(postings, self._overridden_array)]
+        return postings
+
+    def _postings(self, term: str) -> np.ndarray:
+        base = self._base_list(term)
+        delta = self._delta_postings.get(term)
+        if not delta:
+            return base
+        delta_docs = np.array(sorted(self._delta_docs[candidate] for candidate in delta), dtype=np.uint32)
+        return np.concatenate([base, delta_docs])
+
+    def _candidate(self, doc: int) -> str:
+        base_count = len(self._base_ids)
+        return self._base_ids[doc] if doc < base_count else self._delta_ids[doc - base_count]
+
+    def search(self, job_skills: Sequence[str], top_k: int = 20) -> List[Dict[str, Any]]:
+        """Top-k candidates by number of job skills matched"""
+        with self._lock:
+            if self.directory:
+                self._catch_up()
+
+            terms = sorted({self.normalize(skill) for skill in job_skills if skill.strip()})
+            lists = [self._postings(term) for term in terms]
+            # Each skill contributes 1, so a candidate's score is its matched-skill count
+            docs, scores = _top_k(lists, top_k)
+
+            results = []
+            for doc, score in zip(docs.tolist(), scores.tolist()):
+                matched = [
+                    term for term, postings in zip(terms, lists)
+                    if _contains(postings, doc)
+                ]
+                results.append({
+                    "id": self._candidate(doc),
+                    "score": float(score),
+                    "match_percentage": round(score / len(terms) * 100, 2),
+                    "matched_skills": matched,
+                })
+            return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "generation": self._generation,
+                "snapshot_candidates": len(self._base_ids),
+                "pending_changes": len(self._delta),
+                "skills": len(set(self._base_terms) | set(self._delta_postings)),
+            }
+
+
+def _contains(postings: np.ndarray, doc: int) -> bool:
+    position = int(np.searchsorted(postings, doc))
+    return position < len(postings) and int(postings[position]) == doc
+
+
+def _top_k(lists: List[np.ndarray], k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-k documents by the number of posting lists they appear in, ties to the lower doc id"""
+    if not lists:
+        return _EMPTY_POSTINGS, _EMPTY_POSTINGS
+
+    # Intersect shortest-first. If k documents contain every skill nothing can outrank
+    # them, so the rest of the posting lists are never merged.
+    ordered = sorted(lists, key=len)
+    common = ordered[0]
+    for postings in ordered[1:]:
+        if len(common) < k:
+            break
+        common = np.intersect1d(common, postings, assume_unique=True)
+    else:
+        if len(common) >= k:
+            return common[:k], np.full(k, len(lists))
+
+    # Otherwise merge every list and count how many each document appears in. WAND-style
+    # pivoting was measured and left out: every skill scores 1, so the threshold stays at
+    # a few matches and prunes little, while the per-document cursor loop runs in Python.
+    # On 200k candidates it was 100-200x slower than this merge, and a vectorized MaxScore
+    # variant (probing the longest lists instead of merging them) was still 1.5x slower.
+    all_docs = np.concatenate(lists)
+    docs, counts = np.unique(all_docs, return_counts=True)
+    order = np.lexsort((docs, -counts))[:k]
+    return docs[order], counts[order]
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# Distinct spellings whose canonical form is memoized per taxonomy version
+SKILL_CANONICAL_CACHE_ENTRIES = int(os.getenv("SKILL_CANONICAL_CACHE_ENTRIES", "100000"))
+
+# Bullets, quotes and sentence punctuation around a skill; "+", "#" and a leading "."
+# are kept because they are part of names such as "c++", "c#" and ".net"
+_SURROUNDING = " \t\r\n,;:!?()[]{}<>\"'`•*·|/-"
+# Separators ignored when comparing spellings: "Node JS", "node-js" and "nodejs" are "node.js"
+_SEPARATORS = re.compile(r"[\s._-]+")
+# A trailing version such as "python3", "java 8" or "angular v12"
+_VERSION = re.compile(r"^(?P<stem>.+?)[\s_-]*v?\d+(?:\.\d+)*[a-z]?$")
+# A trailing ".js" as in "react.js" or "vuejs"
+_JS_SUFFIX = re.compile(r"^(?P<stem>.+?)[\s.]?js$")
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(skill.lower().split())
+
+
+def _squash(key: str) -> str:
+    return _SEPARATORS.sub("", key)
+
+
+def _unknown_id(key: str) -> int:
+    # Skills outside the taxonomy get negative ids that are the same in every process
+    return -1 - int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big") // 2
+
+
+class SkillCanonicalizer:
+    """Maps skill spellings (case, punctuation, versions, aliases) to canonical names and integer ids"""
+
+    def __init__(self, names: List[str], aliases: Dict[str, str], cache_entries: int = SKILL_CANONICAL_CACHE_ENTRIES):
+        self.names = names
+        self._ids: Dict[str, int] = {}
+        for skill_id, name in enumerate(names):
+            self._ids.setdefault(normalize_skill(name), skill_id)
+        for alias, name in aliases.items():
+            skill_id = self._ids.get(normalize_skill(name))
+            if skill_id is not None:
+                self._ids.setdefault(normalize_skill(alias), skill_id)
+
+        # Spellings that only differ in separators, where that is unambiguous
+        squashed: Dict[str, Optional[int]] = {}
+        for key, skill_id in self._ids.items():
+            previous = squashed.setdefault(_squash(key), skill_id)
+            if previous != skill_id:
+                squashed[_squash(key)] = None
+        self._squashed = {key: skill_id for key, skill_id in squashed.items() if skill_id is not None}
+
+        self._resolve = lru_cache(maxsize=cache_entries)(self._resolve_uncached)
+
+    def _lookup(self, key: str) -> Optional[int]:
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            skill_id = self._squashed.get(_squash(key))
+        return skill_id
+
+    def _resolve_uncached(self, skill: str) -> Tuple[int, str]:
+        key = normalize_skill(skill).lstrip(_SURROUNDING).rstrip(_SURROUNDING + ".")
+        skill_id = self._lookup(key)
+        if skill_id is None:
+            # "python3" or "react.js" are the taxonomy skill when the stem is one
+            for pattern in (_VERSION, _JS_SUFFIX):
+                match = pattern.match(key)
+                if match:
+                    stem = match.group("stem").rstrip(" ._-")
+                    # Single letters are left alone: "r2" is not R
+                    skill_id = self._lookup(stem) if len(stem) > 1 else None
+                    if skill_id is not None:
+                        break
+        if skill_id is None:
+            return _unknown_id(key), key
+        return skill_id, self.names[skill_id]
+
+    def skill_id(self, skill: str) -> int:
+        """Taxonomy position for taxonomy skills, a stable negative id for anything else"""
+        return self._resolve(skill)[0]
+
+    def canonical(self, skill: str) -> str:
+        """Taxonomy name for taxonomy skills and their aliases, the normalized spelling otherwise"""
+        return self._resolve(skill)[1]
+
+    def words(self, skill: str) -> FrozenSet[str]:
+        return frozenset(self.canonical(skill).split())
+
+    def cache_stats(self) -> Dict[str, int]:
+        info = self._resolve.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "entries": info.currsize}
@@ -0,0 +1,138 @@
+import logging
+import os
+import re
+import zipfile
+from typing import IO, Iterator, List
+
+from lxml import etree
+
+import metrics
+from uploads import DocumentSource, open_document
+
+logger = logging.getLogger(__name__)
+
+# DOCX extraction settings, overridable per deployment
+DOCX_MAX_PART_BYTES = int(os.getenv("DOCX_MAX_PART_BYTES", str(20 * 1024 * 1024)))  # uncompressed XML read per part
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_PARAGRAPH = f"{_W}p"
+_TABLE = f"{_W}tbl"
+_TEXT = f"{_W}t"
+# Run children that stand for a character rather than holding text
+_CHARACTERS = {f"{_W}tab": "\t", f"{_W}br": "\n", f"{_W}cr": "\n", f"{_W}noBreakHyphen": "-"}
+_CONTENT = (_PARAGRAPH, _TEXT, *_CHARACTERS)
+
+_HEADER_PART = re.compile(r"^word/(header|footer)(\d*)\.xml$")
+
+
+class _CappedPart:
+    """File-like view of a zip member that stops after max_bytes of uncompressed XML"""
+
+    def __init__(self, part: IO[bytes], max_bytes: int):
+        self.part = part
+        self.remaining = max_bytes
+        self.truncated = False
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        chunk = self.part.read(size)
+        self.remaining -= len(chunk)
+        if not self.remaining and self.part.read(1):
+            self.truncated = True
+        return chunk
+
+
+def _paragraph_lines(paragraph: etree._Element) -> Iterator[str]:
+    # Text boxes hold paragraphs of their own, which become lines of their own
+    line: List[str] = []
+    for element in paragraph.iter(*_CONTENT):
+        tag = element.tag
+        if tag == _TEXT:
+            if element.text:
+                line.append(element.text)
+        elif tag == _PARAGRAPH:
+            if element is not paragraph:
+                yield "".join(line)
+                line = []
+        else:
+            line.append(_CHARACTERS[tag])
+    yield "".join(line)
+
+
+def iter_part_paragraphs(archive: zipfile.ZipFile, name: str, max_bytes: int = DOCX_MAX_PART_BYTES) -> Iterator[str]:
+    """Text of each paragraph of one XML part, in document order, without building the part's tree.
+
+    Only paragraph and table ends reach Python; each finished paragraph is read and dropped,
+    so memory stays at one paragraph however long the part is. Table cells and content
+    controls come out where they sit in the document.
+    """
+    with archive.open(name) as member:
+        part = _CappedPart(member, max_bytes)
+        events = etree.iterparse(part, events=("end",), tag=(_PARAGRAPH, _TABLE, _FALLBACK), resolve_entities=False)
+        try:
+            for _, element in events:
+                if element.tag == _FALLBACK:
+                    # Legacy copy of the text box content next to it
+                    element.clear()
+                    continue
+                if element.tag == _PARAGRAPH:
+                    if any(True for _ in element.iterancestors(_PARAGRAPH)):
+                        continue  # a text box paragraph, read with the paragraph anchoring it
+                    yield from _paragraph_lines(element)
+                elif any(True for _ in element.iterancestors(_TABLE)):
+                    continue  # nested tables are dropped with their outer table
+                element.clear()
+                # Cleared elements stay attached to the body; drop the ones already read
+                parent = element.getparent()
+                while parent is not None and element.getprevious() is not None:
+                    del parent[0]
+        except etree.XMLSyntaxError:
+            if not part.truncated:
+                raise
+        if part.truncated:
+            logger.warning(f"DOCX part {name} is larger than {max_bytes} bytes, extracting only the start")
+
+
+def _part_order(name: str) -> int:
+    number = _HEADER_PART.match(name).group(2)
+    return int(number) if number else 0
+
+
+def iter_paragraphs(source: DocumentSource, max_bytes: int = DOCX_MAX_PART_BYTES) -> Iterator[str]:
+    """Paragraphs in reading order: page headers, the body (tables included), then page footers.
+
+    A header repeated across sections is emitted once. Embedded objects are never read.
+    """
+    with open_document(source, mapped=False) as stream, zipfile.ZipFile(stream) as archive:
+        margins = {"header": [], "footer": []}
+        for name in sorted((name for name in archive.namelist() if _HEADER_PART.match(name)), key=_part_order):
+            margins[_HEADER_PART.match(name).group(1)].append(name)
+
+        yield from _iter_margin(archive, margins["header"], max_bytes)
+        yield from iter_part_paragraphs(archive, "word/document.xml", max_bytes)
+        yield from _iter_margin(archive, margins["footer"], max_bytes)
+
+
+def _iter_margin(archive: zipfile.ZipFile, names: List[str], max_bytes: int) -> Iterator[str]:
+    # First-page, even-page and default headers often repeat the same text
+    seen = set()
+    for name in names:
+        paragraphs = list(iter_part_paragraphs(archive, name, max_bytes))
+        key = "\n".join(paragraphs)
+        if key not in seen:
+            seen.add(key)
+            yield from paragraphs
+
+
+def extract_text(source: DocumentSource, max_chars: int, max_bytes: int = DOCX_MAX_PART_BYTES) -> str:
+    """One line per paragraph, stopping once max_chars have been read"""
+    lines, size = [], 0
+    for paragraph in iter_paragraphs(source, max_bytes):
+        lines.append(paragraph + "\n")
+        size += len(paragraph) + 1
+        if size >= max_chars:
+            break
+    metrics.count("docx_paragraphs", len(lines))
+    return "".join(lines)
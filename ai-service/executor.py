@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# Execution backend settings, overridable per deployment
+PARSE_BACKEND = os.getenv("PARSE_BACKEND", "process")  # process | thread | inline
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+PARSE_MAX_PENDING = int(os.getenv("PARSE_MAX_PENDING", str(PARSE_WORKERS * 4)))
+PARSE_TIMEOUT_SECONDS = float(os.getenv("PARSE_TIMEOUT_SECONDS", "30"))
+
+# Pools are created and replaced while the job worker and executor threads run, and a
+# fork could inherit a lock one of them holds, so workers start from a fork server
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class ParserBusyError(HTTPException):
+    """Raised when the parse queue is full; the same request can succeed shortly"""
+
+    def __init__(self):
+        super().__init__(status_code=503, detail="Parser is busy, please retry shortly", headers={"Retry-After": "1"})
+
+
+class ParseExecutor:
+    """Runs CPU-bound parsing off the event loop with bounded queue depth"""
+
+    def __init__(
+        self,
+        backend: str = PARSE_BACKEND,
+        max_workers: int = PARSE_WORKERS,
+        max_pending: int = PARSE_MAX_PENDING,
+        timeout: float = PARSE_TIMEOUT_SECONDS,
+        initializer: Optional[Callable[..., None]] = None,
+    ):
+        if backend not in ("process", "thread", "inline"):
+            raise ValueError(f"Unknown parse backend: {backend}")
+        self.backend = backend
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self.timeout = timeout
+        self.initializer = initializer
+        self.initargs: Tuple[Any, ...] = ()
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        """Create the worker pool; workers run the initializer with initargs before taking tasks"""
+        if self.backend == "inline" or self._pool is not None:
+            return
+        if self.backend == "process":
+            context = multiprocessing.get_context(_START_METHOD)
+            if _START_METHOD == "forkserver" and self.initializer is not None:
+                # The fork server imports the initializer's module once; each worker forks from it
+                context.set_forkserver_preload([self.initializer.__module__])
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=context, initializer=self.initializer, initargs=self.initargs
+            )
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="parse")
+        logger.info(f"Started {self.backend} parse pool with {self.max_workers} workers")
+
+    def shutdown(self) -> None:
+        self._reset_pool()
+
+    def restart(self, *initargs: Any) -> None:
+        """Replace the workers, initialized with initargs; tasks already submitted still finish on the old ones"""
+        self.initargs = initargs
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+            self.start()
+
+    def _reset_pool(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+        }
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on the pool, rejecting with 503 when the queue is full"""
+        if self.backend == "inline":
+            return fn(*args)
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ParserBusyError()
+            self._pending += 1
+
+        try:
+            self.start()
+            future = self._pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault in a parser); replace the pool for later calls
+            logger.error("Parse pool is broken, restarting it")
+            self._release()
+            self._reset_pool()
+            raise HTTPException(status_code=503, detail="Parser is restarting, please retry shortly")
+        except Exception:
+            self._release()
+            raise
+
+        # The slot is held until the worker actually finishes, even after a timeout,
+        # so abandoned tasks still count against the queue depth
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Parse task exceeded {self.timeout}s timeout")
+            raise HTTPException(status_code=503, detail="Parsing timed out")
+        except BrokenProcessPool:
+            logger.error("Parse worker crashed, restarting pool")
+            self._reset_pool()
+            raise HTTPException(status_code=503, detail="Parser is restarting, please retry shortly")
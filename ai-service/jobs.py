@@ -0,0 +1,387 @@
+import asyncio
+import http.client
+import ipaddress
+import logging
+import os
+import shutil
+import socket
+import sqlite3
+import ssl
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import orjson
+from fastapi import HTTPException
+
+from executor import ParserBusyError
+from uploads import discard
+
+logger = logging.getLogger(__name__)
+
+# Job queue settings, overridable per deployment
+JOB_QUEUE_DIR = os.getenv("JOB_QUEUE_DIR", "") or os.path.join(tempfile.gettempdir(), "resuchain-jobs")
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "10000"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "86400"))
+JOB_WEBHOOK_TIMEOUT_SECONDS = float(os.getenv("JOB_WEBHOOK_TIMEOUT_SECONDS", "10"))
+JOB_WEBHOOK_HOSTS = frozenset(
+    host.strip().lower() for host in os.getenv("JOB_WEBHOOK_HOSTS", "").split(",") if host.strip()
+)  # hosts webhooks may be sent to; webhooks are refused while this is empty
+
+_POLL_SECONDS = 0.5
+_RETRY_BASE_SECONDS = 2.0
+_BUSY_RETRY_SECONDS = 1.0
+_PRUNE_INTERVAL_SECONDS = 60.0
+
+_COLUMNS = (
+    "id", "idempotency_key", "sha256", "kind", "filename", "candidate_id", "webhook_url", "priority",
+    "status", "attempts", "error", "result", "created_at", "updated_at", "not_before", "lease_until",
+)
+
+
+class PermanentJobError(Exception):
+    """Raised by a job handler when retrying the job cannot succeed"""
+
+
+class JobQueue:
+    """Durable parse job queue in SQLite, shared by every uvicorn worker on the host.
+
+    Jobs are claimed inside an immediate transaction, so each is run by one worker at a
+    time. A claim is a lease: if its worker dies, the job becomes claimable again once
+    the lease runs out. Uploaded files live next to the database until the job ends.
+    """
+
+    def __init__(
+        self,
+        directory: str = JOB_QUEUE_DIR,
+        concurrency: int = JOB_CONCURRENCY,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        max_queued: int = JOB_MAX_QUEUED,
+        lease: float = JOB_LEASE_SECONDS,
+        result_ttl: float = JOB_RESULT_TTL_SECONDS,
+    ):
+        self.directory = directory
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.max_queued = max_queued
+        self.lease = lease
+        self.result_ttl = result_ttl
+        self._lock = threading.Lock()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._db: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            os.makedirs(os.path.join(self.directory, "files"), exist_ok=True)
+            db = sqlite3.connect(
+                os.path.join(self.directory, "jobs.db"), timeout=10, check_same_thread=False, isolation_level=None
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_jobs ("
+                "id TEXT PRIMARY KEY, idempotency_key TEXT NOT NULL UNIQUE, sha256 TEXT NOT NULL, "
+                "kind TEXT NOT NULL, filename TEXT NOT NULL, candidate_id TEXT, webhook_url TEXT, "
+                "priority INTEGER NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL, "
+                "error TEXT, result TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                "not_before REAL NOT NULL, lease_until REAL)"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS parse_jobs_ready ON parse_jobs (status, priority DESC, created_at)"
+            )
+            self._db = db
+        return self._db
+
+    def file_path(self, job_id: str) -> str:
+        return os.path.join(self.directory, "files", job_id)
+
+    def _row(self, row: Optional[tuple]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        job = dict(zip(_COLUMNS, row))
+        job["result"] = orjson.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _select(self, where: str, params: tuple) -> Optional[Dict[str, Any]]:
+        row = self._connect().execute(f"SELECT {', '.join(_COLUMNS)} FROM parse_jobs WHERE {where}", params).fetchone()
+        return self._row(row)
+
+    # Producer side
+
+    def submit(
+        self,
+        upload_path: str,
+        sha256: str,
+        kind: str,
+        filename: str,
+        candidate_id: Optional[str] = None,
+        priority: int = 0,
+        webhook_url: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Queue a parse of the file at upload_path; returns (job, deduplicated).
+
+        The idempotency key is the file hash plus the candidate id, so resubmitting the
+        same upload returns the existing job unless that job failed, in which case it
+        is queued again. The upload is moved into the queue only for a new job.
+        """
+        idempotency_key = f"{kind}:{sha256}:{candidate_id or ''}"
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                existing = self._select("idempotency_key = ?", (idempotency_key,))
+                if existing is not None and existing["status"] != "failed":
+                    db.execute("COMMIT")
+                    return existing, True
+
+                queued = db.execute("SELECT COUNT(*) FROM parse_jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+                if queued >= self.max_queued:
+                    raise HTTPException(
+                        status_code=503, detail="Job queue is full, please retry shortly", headers={"Retry-After": "5"}
+                    )
+
+                job_id = existing["id"] if existing is not None else uuid.uuid4().hex
+                shutil.move(upload_path, self.file_path(job_id))
+                if existing is not None:
+                    db.execute(
+                        "UPDATE parse_jobs SET status = 'queued', attempts = 0, error = NULL, result = NULL, "
+                        "priority = ?, webhook_url = ?, filename = ?, updated_at = ?, not_before = ?, lease_until = NULL "
+                        "WHERE id = ?",
+                        (priority, webhook_url, filename, now, now, job_id),
+                    )
+                else:
+                    db.execute(
+                        f"INSERT INTO parse_jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                        (job_id, idempotency_key, sha256, kind, filename, candidate_id, webhook_url, priority,
+                         "queued", 0, None, None, now, now, now, None),
+                    )
+                job = self._select("id = ?", (job_id,))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+        if self._wake is not None:
+            self._wake.set()
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._select("id = ?", (job_id,))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._connect().execute("SELECT status, COUNT(*) FROM parse_jobs GROUP BY status").fetchall()
+        counts = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    # Consumer side
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        """Take the highest-priority ready job, or one whose worker's lease ran out"""
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT id FROM parse_jobs WHERE (status = 'queued' AND not_before <= ?) "
+                    "OR (status = 'running' AND lease_until < ?) ORDER BY priority DESC, created_at LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    db.execute("COMMIT")
+                    return None
+                db.execute(
+                    "UPDATE parse_jobs SET status = 'running', attempts = attempts + 1, updated_at = ?, "
+                    "lease_until = ? WHERE id = ?",
+                    (now, now + self.lease, row[0]),
+                )
+                job = self._select("id = ?", (row[0],))
+                db.execute("COMMIT")
+                return job
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _update(self, job_id: str, assignments: str, params: tuple) -> None:
+        with self._lock:
+            self._connect().execute(f"UPDATE parse_jobs SET {assignments}, updated_at = ? WHERE id = ?", (*params, time.time(), job_id))
+
+    def _succeed(self, job: Dict[str, Any], result: Dict[str, Any]) -> None:
+        self._update(job["id"], "status = 'succeeded', result = ?, error = NULL, lease_until = NULL", (orjson.dumps(result),))
+        discard(self.file_path(job["id"]))
+
+    def _fail(self, job: Dict[str, Any], error: str, permanent: bool) -> bool:
+        """Record a failed attempt; returns True when the job will not be retried"""
+        if permanent or job["attempts"] >= self.max_attempts:
+            self._update(job["id"], "status = 'failed', error = ?, lease_until = NULL", (error,))
+            discard(self.file_path(job["id"]))
+            return True
+        delay = _RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1)
+        self._update(
+            job["id"], "status = 'queued', error = ?, not_before = ?, lease_until = NULL", (error, time.time() + delay)
+        )
+        return False
+
+    def _requeue(self, job: Dict[str, Any], delay: float = 0) -> None:
+        """Hand an interrupted or deferred job back without counting the attempt"""
+        self._update(
+            job["id"], "status = 'queued', attempts = attempts - 1, not_before = ?, lease_until = NULL",
+            (time.time() + delay,),
+        )
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            db = self._connect()
+            expired = db.execute(
+                "SELECT id FROM parse_jobs WHERE status IN ('succeeded', 'failed') AND updated_at < ?", (cutoff,)
+            ).fetchall()
+            db.execute("DELETE FROM parse_jobs WHERE status IN ('succeeded', 'failed') AND updated_at < ?", (cutoff,))
+        for (job_id,) in expired:
+            discard(self.file_path(job_id))
+
+    async def _process(self, job: Dict[str, Any], handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await handler(job)
+        except asyncio.CancelledError:
+            # The executor thread finishes the requeue even if this task is cancelled again
+            await loop.run_in_executor(None, self._requeue, job)
+            raise
+        except ParserBusyError:
+            # A full parse pool is the spike this queue absorbs, not a failure of the job
+            await loop.run_in_executor(None, self._requeue, job, _BUSY_RETRY_SECONDS)
+            return
+        except Exception as e:
+            error = str(getattr(e, "detail", e))
+            logger.warning(f"Parse job {job['id']} attempt {job['attempts']} failed: {error}")
+            if not await loop.run_in_executor(None, self._fail, job, error, isinstance(e, PermanentJobError)):
+                return
+            payload = {"job_id": job["id"], "status": "failed", "error": error}
+        else:
+            await loop.run_in_executor(None, self._succeed, job, result)
+            payload = {"job_id": job["id"], "status": "succeeded", "result": result}
+
+        if job["webhook_url"]:
+            await loop.run_in_executor(None, _post_webhook, job["webhook_url"], payload)
+
+    async def run(self, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
+        """Claim and process jobs, at most `concurrency` at a time, until cancelled"""
+        # SQLite calls wait on other workers' transactions, so they run off the event loop
+        loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        in_flight = set()
+        last_prune = 0.0
+        try:
+            while True:
+                while len(in_flight) < self.concurrency:
+                    job = await loop.run_in_executor(None, self._claim)
+                    if job is None:
+                        break
+                    in_flight.add(asyncio.ensure_future(self._process(job, handler)))
+
+                if time.monotonic() - last_prune > _PRUNE_INTERVAL_SECONDS:
+                    await loop.run_in_executor(None, self._prune)
+                    last_prune = time.monotonic()
+
+                # Other workers may queue jobs too, so idle waits are bounded by the poll interval
+                self._wake.clear()
+                waiters = [asyncio.ensure_future(self._wake.wait())]
+                done, _ = await asyncio.wait(
+                    in_flight | set(waiters), timeout=_POLL_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                )
+                waiters[0].cancel()
+                in_flight -= done
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    def start(self, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run(handler))
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+def check_webhook_url(url: str) -> None:
+    """Reject a webhook URL unless it is http(s) on a host listed in JOB_WEBHOOK_HOSTS"""
+    try:
+        parts = urlsplit(url)
+        parts.port
+    except ValueError:
+        raise HTTPException(status_code=400, detail="webhook_url is not a valid URL")
+    if parts.scheme not in ("http", "https") or not parts.hostname or parts.username or parts.password:
+        raise HTTPException(status_code=400, detail="webhook_url must be an http(s) URL without credentials")
+    if parts.hostname not in JOB_WEBHOOK_HOSTS:
+        raise HTTPException(status_code=400, detail="webhook_url host is not allowed")
+
+
+def _public_address(host: str, port: int) -> str:
+    # Every address the host resolves to must be public, so a listed name cannot be
+    # pointed at the metadata service or the internal network
+    addresses = {info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)}
+    for address in addresses:
+        if not ipaddress.ip_address(address.split("%")[0]).is_global:
+            raise ValueError(f"{host} resolves to non-public address {address}")
+    return sorted(addresses)[0]
+
+
+class _PinnedHTTPConnection(http.client.HTTPConnection):
+    """Connects to an address resolved and checked beforehand, so DNS cannot change it in between"""
+
+    def __init__(self, host: str, port: int, address: str, timeout: float):
+        super().__init__(host, port, timeout=timeout)
+        self.address = address
+
+    def connect(self) -> None:
+        self.sock = socket.create_connection((self.address, self.port), self.timeout)
+
+
+class _PinnedHTTPSConnection(_PinnedHTTPConnection):
+    default_port = http.client.HTTPS_PORT
+
+    def connect(self) -> None:
+        super().connect()
+        # The certificate is still checked against the host name
+        self.sock = ssl.create_default_context().wrap_socket(self.sock, server_hostname=self.host)
+
+
+def _post_webhook(url: str, payload: Dict[str, Any]) -> None:
+    try:
+        check_webhook_url(url)
+        parts = urlsplit(url)
+        secure = parts.scheme == "https"
+        port = parts.port or (http.client.HTTPS_PORT if secure else http.client.HTTP_PORT)
+        address = _public_address(parts.hostname, port)
+        connection_class = _PinnedHTTPSConnection if secure else _PinnedHTTPConnection
+        connection = connection_class(parts.hostname, port, address, JOB_WEBHOOK_TIMEOUT_SECONDS)
+        try:
+            # Redirects are not followed: they could lead anywhere
+            connection.request(
+                "POST", f"{parts.path or '/'}{'?' + parts.query if parts.query else ''}",
+                body=orjson.dumps(payload), headers={"Content-Type": "application/json"},
+            )
+            response = connection.getresponse()
+            if response.status >= 300:
+                raise ValueError(f"HTTP {response.status}")
+        finally:
+            connection.close()
+    except Exception as e:
+        logger.warning(f"Webhook delivery to {url} for job {payload['job_id']} failed: {getattr(e, 'detail', e)}")
@@ -1,16 +1,46 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, Form, Header, UploadFile, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-import json
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.routing import Match
+from typing import List, Dict, Any, FrozenSet, Optional, AsyncIterator, Set, Tuple, Literal
+import asyncio
+import hashlib
+import hmac
+import inspect
+import os
 import re
-import spacy
-import PyPDF2
-from docx import Document
-import io
-from datetime import datetime
+import signal
+import sys
+import time
+import zipfile
+import numpy as np
+import orjson
+from datetime import date, datetime
 import logging
 
+from executor import ParseExecutor, PARSE_WORKERS
+from jobs import JobQueue, PermanentJobError, check_webhook_url
+import metrics
+from models import MODEL_PRELOAD, MODEL_WARMUP, load_spacy, model_names, model_registry, process_uptime
+import patterns
+import docx_text
+import pdf_text
+from profiling import ADMIN_TOKEN, SlowParseLog, pattern_vocabulary, profile_call, vocabulary
+from bulk_matching import rank_matches
+from candidate_index import CandidateIndex
+from near_duplicates import NEAR_DUPLICATE_REUSE_THRESHOLD, DocumentSignature, NearDuplicateIndex, signature
+from canonical import normalize_skill
+from semantic import SEMANTIC_MATCH_THRESHOLD, SemanticUnavailableError, SkillEmbedder, best_similarities, load_sentence_model
+from parse_cache import ParseCache
+from single_flight import SingleFlight
+from parse_results import Certificate, Skill
+from resume_export import ResumeExport
+from sections import SECTION_HEADINGS, SectionIndex, segment
+from skill_scanner import SkillScanner, context_window
+from taxonomy import Taxonomy, TaxonomyError, TaxonomyStore
+from uploads import UPLOAD_MAX_BYTES, DocumentSource, SpooledUpload, release, spool_file
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,7 +48,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="ResuChain AI Service",
     description="AI-powered resume parsing and skills matching service",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -30,20 +61,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    logger.warning("spaCy model not found. Install with: python -m spacy download en_core_web_sm")
-    nlp = None
+# NLP models load on first use. MODEL_PRELOAD loads them now, before the parse pool
+# (or gunicorn --preload) forks, so workers share the memory instead of loading copies.
+model_registry.register("spacy", load_spacy)
+model_registry.register("semantic", load_sentence_model)
+skill_embedder = SkillEmbedder(loader=lambda: model_registry.get("semantic"))
+model_registry.preload(model_names(MODEL_PRELOAD))
+
+def get_nlp():
+    """spaCy pipeline, loaded on first call; None when the model is not installed"""
+    return model_registry.get("spacy")
 
 # Pydantic models
 class ResumeParseRequest(BaseModel):
     text: str
+    # When set, the extracted skills are added to the candidate index under this id
+    candidate_id: Optional[str] = None
+    # X-Document-Hash of an earlier version of this text; unchanged sections reuse its results
+    base_hash: Optional[str] = None
 
 class SkillsMatchRequest(BaseModel):
     resume_skills: List[str]
     job_skills: List[str]
+    # "semantic" also matches skills whose embeddings are close, e.g. "ReactJS" and "React"
+    mode: Literal["lexical", "semantic"] = "lexical"
 
 class ParsedResume(BaseModel):
     personal_info: Dict[str, Any]
@@ -51,6 +92,15 @@ class ParsedResume(BaseModel):
     education: List[Dict[str, Any]]
     skills: List[Dict[str, Any]]
     certificates: List[Dict[str, Any]]
+    # Uploads only: id shared by copies and near-copies of the same resume text
+    duplicate_cluster: Optional[str] = None
+
+def parsed_content(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """A parse result in ParsedResume's shape; cached_parse validated it when it was parsed"""
+    return {field: parsed.get(field) for field in ParsedResume.model_fields}
+
+def parsed_response(parsed: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    return ORJSONResponse(parsed_content(parsed), headers=headers)
 
 class SkillsMatchResponse(BaseModel):
     match_percentage: float
@@ -58,154 +108,197 @@ class SkillsMatchResponse(BaseModel):
     missing_skills: List[str]
     skill_scores: Dict[str, float]
 
-# Predefined skills database
-SKILLS_DATABASE = {
-    "programming": [
-        "python", "java", "javascript", "typescript", "c++", "c#", "php", "ruby", "go", "rust",
-        "swift", "kotlin", "scala", "r", "matlab", "sql", "html", "css", "react", "angular",
-        "vue", "node.js", "express", "django", "flask", "spring", "laravel", "rails"
-    ],
-    "databases": [
-        "mysql", "postgresql", "mongodb", "redis", "elasticsearch", "cassandra", "oracle",
-        "sqlite", "mariadb", "dynamodb", "firebase", "neo4j"
-    ],
-    "cloud": [
-        "aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "terraform", "ansible",
-        "cloudformation", "helm", "istio", "prometheus", "grafana"
-    ],
-    "tools": [
-        "git", "github", "gitlab", "bitbucket", "jira", "confluence", "slack", "trello",
-        "postman", "swagger", "figma", "sketch", "photoshop", "illustrator"
-    ],
-    "soft_skills": [
-        "leadership", "communication", "teamwork", "problem solving", "analytical thinking",
-        "project management", "time management", "adaptability", "creativity", "critical thinking"
-    ]
-}
+class SkillProfile(BaseModel):
+    id: str
+    skills: List[str]
+
+class BulkSkillsMatchRequest(BaseModel):
+    resumes: List[SkillProfile]
+    jobs: List[SkillProfile]
+    # "resumes" ranks the best resumes for each job; "jobs" ranks the best jobs for each resume
+    rank: Literal["resumes", "jobs"] = "resumes"
+    top_k: int = Field(default=20, ge=1, le=1000)
+    mode: Literal["lexical", "semantic"] = "lexical"
+
+class RankedMatch(BaseModel):
+    id: str
+    match: SkillsMatchResponse
+
+class BulkMatchRanking(BaseModel):
+    id: str
+    matches: List[RankedMatch]
 
-def extract_text_from_pdf(file_content: bytes) -> str:
+class BulkSkillsMatchResponse(BaseModel):
+    rankings: List[BulkMatchRanking]
+
+class CandidateIndexRequest(BaseModel):
+    candidates: List[SkillProfile]
+
+class CandidateSearchRequest(BaseModel):
+    job_skills: List[str]
+    top_k: int = Field(default=20, ge=1, le=1000)
+
+class CandidateSearchResult(BaseModel):
+    id: str
+    score: float
+    match_percentage: float
+    matched_skills: List[str]
+
+class CandidateSearchResponse(BaseModel):
+    candidates: List[CandidateSearchResult]
+
+class ParseJobResponse(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    attempts: int
+    priority: int
+    deduplicated: bool = False
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+class UnreadableDocumentError(ValueError):
+    """Raised when an uploaded document cannot be turned into text"""
+
+# Per-document work budget: text beyond the size cap is ignored, and extractors that
+# would start after the time budget is spent are skipped
+PARSE_MAX_TEXT_CHARS = int(os.getenv("PARSE_MAX_TEXT_CHARS", "200000"))
+PARSE_TIME_BUDGET_SECONDS = float(os.getenv("PARSE_TIME_BUDGET_SECONDS", "2"))
+
+# Entries kept per extractor; each stops scanning once it has this many, so a stage that
+# is already running stays bounded even when the time budget cannot stop it
+MAX_EXPERIENCE_ENTRIES = 10
+MAX_EDUCATION_ENTRIES = 10
+MAX_CERTIFICATES = 15
+# Characters of each experience entry searched for a title, company and dates; the
+# company patterns try every offset, and real entries are far shorter than this
+MAX_EXPERIENCE_ENTRY_CHARS = 2000
+# Texts at least this long run their extraction stages on separate parse workers, each
+# given up on after the stage timeout; shorter texts are not worth the extra round trips
+PARSE_PARALLEL_MIN_CHARS = int(os.getenv("PARSE_PARALLEL_MIN_CHARS", "20000"))
+PARSE_STAGE_TIMEOUT_SECONDS = float(os.getenv("PARSE_STAGE_TIMEOUT_SECONDS", str(PARSE_TIME_BUDGET_SECONDS)))
+
+# Batch parsing limits
+PARSE_BATCH_CONCURRENCY = int(os.getenv("PARSE_BATCH_CONCURRENCY", str(PARSE_WORKERS)))
+PARSE_BATCH_MAX_MEMBER_BYTES = int(os.getenv("PARSE_BATCH_MAX_MEMBER_BYTES", str(20 * 1024 * 1024)))
+
+# Skills taxonomy, loaded from SKILLS_TAXONOMY_PATH and compiled into a lookup map and a
+# scanner automaton; scanning a resume is a single pass regardless of taxonomy size
+taxonomy_store = TaxonomyStore()
+
+def slow_log_vocabulary() -> Set[str]:
+    """Headings, skills and regex keywords steer the extractors, so the slow-parse log keeps them readable"""
+    taxonomy = taxonomy_store.current
+    return pattern_vocabulary() | vocabulary(
+        taxonomy.names + list(taxonomy.aliases)
+        + [heading for headings in SECTION_HEADINGS.values() for heading in headings]
+    )
+
+slow_parse_log = SlowParseLog(keep=slow_log_vocabulary())
+
+def extract_text_from_pdf(file_content: DocumentSource) -> str:
     """Extract text from PDF file"""
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        return pdf_text.extract_text(file_content, pdf_text.PDF_MAX_PAGES, PARSE_MAX_TEXT_CHARS)
     except Exception as e:
         logger.error(f"Error extracting PDF text: {e}")
-        raise HTTPException(status_code=400, detail="Failed to extract text from PDF")
+        raise UnreadableDocumentError("Failed to extract text from PDF")
 
-def extract_text_from_docx(file_content: bytes) -> str:
+def extract_text_from_docx(file_content: DocumentSource) -> str:
     """Extract text from DOCX file"""
     try:
-        doc = Document(io.BytesIO(file_content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        return docx_text.extract_text(file_content, PARSE_MAX_TEXT_CHARS)
     except Exception as e:
         logger.error(f"Error extracting DOCX text: {e}")
-        raise HTTPException(status_code=400, detail="Failed to extract text from DOCX")
+        raise UnreadableDocumentError("Failed to extract text from DOCX")
 
 def extract_personal_info(text: str) -> Dict[str, Any]:
     """Extract personal information from resume text"""
     personal_info = {}
 
     # Extract email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    if emails:
-        personal_info["email"] = emails[0]
+    email_match = patterns.EMAIL.search(text)
+    if email_match:
+        personal_info["email"] = email_match.group(0)
 
     # Extract phone number (improved pattern)
-    phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4,5}'
-    phones = re.findall(phone_pattern, text)
-    if phones:
+    phone_match = patterns.PHONE.search(text)
+    if phone_match:
         # Clean up phone number
-        phone = ''.join(phones[0]) if isinstance(phones[0], tuple) else phones[0]
-        phone = re.sub(r'[^\d+\-\s\(\)]', '', phone)  # Remove unwanted characters
+        phone = patterns.PHONE_JUNK.sub('', phone_match.group(0))  # Remove unwanted characters
         personal_info["phone"] = phone.strip()
 
     # Extract LinkedIn profile
-    linkedin_pattern = r'(?:linkedin\.com/in/|linkedin\.com/profile/view\?id=|linkedin\.com/pub/)([a-zA-Z0-9_-]+)'
-    linkedin_match = re.search(linkedin_pattern, text, re.IGNORECASE)
+    linkedin_match = patterns.LINKEDIN_PROFILE.search(text)
     if linkedin_match:
         personal_info["linkedin"] = f"linkedin.com/in/{linkedin_match.group(1)}"
     else:
         # Look for LinkedIn URL without the specific pattern
-        linkedin_url_pattern = r'linkedin\.com/[^\s\n]+'
-        linkedin_url_match = re.search(linkedin_url_pattern, text, re.IGNORECASE)
+        linkedin_url_match = patterns.LINKEDIN_URL.search(text)
         if linkedin_url_match:
             personal_info["linkedin"] = linkedin_url_match.group(0).strip()
 
     # Extract GitHub profile
-    github_pattern = r'(?:github\.com/)([a-zA-Z0-9_-]+)'
-    github_match = re.search(github_pattern, text, re.IGNORECASE)
+    github_match = patterns.GITHUB_PROFILE.search(text)
     if github_match:
         personal_info["github"] = f"github.com/{github_match.group(1)}"
     else:
         # Look for GitHub URL
-        github_url_pattern = r'github\.com/[^\s\n]+'
-        github_url_match = re.search(github_url_pattern, text, re.IGNORECASE)
+        github_url_match = patterns.GITHUB_URL.search(text)
         if github_url_match:
             personal_info["github"] = github_url_match.group(0).strip()
 
     # Extract name (first few words before email or phone)
-    lines = text.split('\n')
+    lines = text.split('\n', 10)
     for i, line in enumerate(lines[:10]):  # Check first 10 lines
         line = line.strip()
         if line and not any(keyword in line.lower() for keyword in ['resume', 'cv', 'curriculum', 'contact', 'personal']):
             # Skip lines that are clearly not names
-            if not re.search(r'[@\d]', line) and len(line.split()) <= 5 and len(line) > 2:
+            if not patterns.NAME_REJECT.search(line) and len(line.split()) <= 5 and len(line) > 2:
                 # Check if it looks like a name (contains letters, possibly with spaces)
-                if re.match(r'^[A-Za-z\s\-\.\']+$', line.strip()):
+                if patterns.NAME_LINE.match(line.strip()):
                     personal_info["name"] = line.strip()
                     break
 
     # Extract location (look for city, state patterns)
-    location_pattern = r'([A-Z][a-z]+,\s*[A-Z][a-z]+)|([A-Z][a-z]+\s*,\s*[A-Z]{2})'
-    locations = re.findall(location_pattern, text)
-    if locations:
-        personal_info["location"] = locations[0][0] or locations[0][1]
+    location_match = patterns.LOCATION.search(text)
+    if location_match:
+        personal_info["location"] = location_match.group(1) or location_match.group(2)
 
     return personal_info
 
-def extract_experience(text: str) -> List[Dict[str, Any]]:
-    """Extract work experience from resume text"""
-    experience = []
-
-    # Look for experience section with multiple patterns
-    experience_patterns = [
-        r'(experience|work history|employment|professional experience)(.*?)(?=education|skills|projects|certifications|$)',
-        r'(work experience|career history)(.*?)(?=education|skills|projects|$)',
-        r'(professional background|work background)(.*?)(?=education|skills|$)',
-    ]
-
-    exp_text = ""
-    for pattern in experience_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-        if match:
-            exp_text = match.group(2)
-            break
+def experience_source(text: str, sections: SectionIndex) -> str:
+    """The text extract_experience reads"""
+    # Only the experience section is scanned when the resume has one
+    exp_text = sections.get("experience")
 
     if not exp_text:
         # Fallback: look for job titles and companies throughout the document
-        job_title_pattern = r'(software engineer|developer|manager|analyst|consultant|architect|specialist|lead|senior|junior|intern)'
-        if re.search(job_title_pattern, text, re.IGNORECASE):
+        if patterns.JOB_TITLE.search(text):
             exp_text = text
+    return exp_text
+
+def extract_experience(text: str, sections: Optional[SectionIndex] = None) -> List[Dict[str, Any]]:
+    """Extract work experience from resume text"""
+    return experience_entries(experience_source(text, sections or segment(text)))
+
+def experience_entries(exp_text: str) -> List[Dict[str, Any]]:
+    """Experience entries found in the text chosen by experience_source"""
+    experience = []
 
     if exp_text:
         # Split by common delimiters and date patterns
-        entries = re.split(r'\n\s*\n|\n(?=\d{1,2}/\d{4}|\d{4}\s*[-–]\s*\d{4}|\d{4}\s*[-–]\s*present|\d{4}\s*[-–]\s*current)', exp_text)
+        entries = patterns.EXPERIENCE_ENTRY_SPLIT.split(exp_text)
 
         for entry in entries:
-            entry = entry.strip()
+            if len(experience) >= MAX_EXPERIENCE_ENTRIES:
+                break
+            entry = entry.strip()[:MAX_EXPERIENCE_ENTRY_CHARS]
             if len(entry) > 30:  # Filter out very short entries
                 exp_dict = {}
 
                 # Extract position/title (look for common job titles)
-                position_pattern = r'(software engineer|senior developer|full stack developer|frontend developer|backend developer|devops engineer|data scientist|product manager|project manager|team lead|technical lead|engineering manager|software architect|system analyst|business analyst|qa engineer|automation engineer|database administrator|cloud engineer|security engineer)'
-                position_match = re.search(position_pattern, entry, re.IGNORECASE)
+                position_match = patterns.POSITION.search(entry)
                 if position_match:
                     exp_dict["position"] = position_match.group(0).title()
                 else:
@@ -213,7 +306,7 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
                     lines = entry.split('\n')
                     for line in lines[:2]:
                         line = line.strip()
-                        if len(line) > 3 and len(line) < 50 and not re.search(r'[@\d]', line):
+                        if len(line) > 3 and len(line) < 50 and not patterns.NAME_REJECT.search(line):
                             # Check if it looks like a job title
                             words = line.split()
                             if len(words) <= 6 and any(word[0].isupper() for word in words):
@@ -221,21 +314,15 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
                                 break
 
                 # Extract company (look for company patterns)
-                company_pattern = r'(pvt\.?\s*ltd\.?|ltd\.?|inc\.?|corp\.?|corporation|llc|technologies|systems|solutions|software|services|consulting|labs)'
-                company_match = re.search(r'(.{2,30}?)\s*(?:' + company_pattern + r'|•|\|)', entry, re.IGNORECASE)
+                company_match = patterns.COMPANY.search(entry)
                 if company_match:
                     company = company_match.group(1).strip()
                     if len(company) > 2 and len(company) < 30:
                         exp_dict["company"] = company.title()
                 else:
                     # Look for company names in parentheses or after "at"
-                    company_patterns = [
-                        r'at\s+([A-Za-z\s&]+?)(?:\s*\(|\s*\d|\s*$)',
-                        r'\(([A-Za-z\s&]+?)\)',
-                        r'for\s+([A-Za-z\s&]+?)(?:\s*\(|\s*\d|\s*$)',
-                    ]
-                    for pattern in company_patterns:
-                        match = re.search(pattern, entry, re.IGNORECASE)
+                    for pattern in patterns.COMPANY_FALLBACKS:
+                        match = pattern.search(entry)
                         if match:
                             company = match.group(1).strip()
                             if len(company) > 2 and len(company) < 30:
@@ -243,21 +330,15 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
                                 break
 
                 # Extract duration with multiple patterns
-                duration_patterns = [
-                    r'(\d{1,2}/\d{4})\s*[-–]\s*(\d{1,2}/\d{4}|present|current)',
-                    r'(\d{4})\s*[-–]\s*(\d{4}|present|current)',
-                    r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{4})\s*[-–]\s*(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|\d{4}|present|current)',
-                ]
-
-                for pattern in duration_patterns:
-                    dates = re.findall(pattern, entry, re.IGNORECASE)
+                for pattern in patterns.DURATIONS:
+                    dates = pattern.search(entry)
                     if dates:
-                        if len(dates[0]) == 2:  # Month/Year format
-                            start, end = dates[0]
-                            exp_dict["duration"] = f"{start} - {end}"
-                        else:  # Year format
-                            start, end = dates[0]
+                        if len(dates.groups()) == 2:  # Month/Year or Year format
+                            start, end = dates.groups()
                             exp_dict["duration"] = f"{start} - {end}"
+                        else:  # Month name, year and end
+                            month, year, end = dates.groups()
+                            exp_dict["duration"] = f"{month} {year} - {end}"
                         break
 
                 # Extract description (everything after position and company)
@@ -274,7 +355,7 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
                         description = re.sub(re.escape(exp_dict["duration"]), '', description, flags=re.IGNORECASE)
 
                     # Clean up description
-                    description = re.sub(r'\s+', ' ', description).strip()
+                    description = patterns.WHITESPACE.sub(' ', description).strip()
                     if description and len(description) > 10:
                         exp_dict["description"] = description[:300] + "..." if len(description) > 300 else description
 
@@ -285,7 +366,7 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
     # Remove duplicates and limit to reasonable number
     unique_experience = []
     seen = set()
-    for exp in experience[:10]:  # Limit to 10 experiences
+    for exp in experience:
         key = (exp.get("position", ""), exp.get("company", ""))
         if key not in seen:
             unique_experience.append(exp)
@@ -293,26 +374,27 @@ def extract_experience(text: str) -> List[Dict[str, Any]]:
 
     return unique_experience
 
-def extract_education(text: str) -> List[Dict[str, Any]]:
+def education_source(text: str, sections: SectionIndex) -> str:
+    """The text extract_education reads"""
+    # Look for education section
+    return sections.get("education")
+
+def extract_education(text: str, sections: Optional[SectionIndex] = None) -> List[Dict[str, Any]]:
     """Extract education information from resume text"""
+    return education_entries(education_source(text, sections or segment(text)))
+
+def education_entries(edu_text: str) -> List[Dict[str, Any]]:
+    """Education entries found in the text chosen by education_source"""
     education = []
     
-    # Look for education section
-    education_section = re.search(r'(education|academic|qualification)(.*?)(?=experience|skills|projects|$)', 
-                                text, re.IGNORECASE | re.DOTALL)
-    
-    if education_section:
-        edu_text = education_section.group(2)
+    if edu_text:
         
         # Common degree patterns
-        degree_patterns = [
-            r'(bachelor|master|phd|doctorate|b\.?tech|m\.?tech|b\.?sc|m\.?sc|mba|bba)',
-            r'(b\.?e\.?|m\.?e\.?|b\.?com|m\.?com)'
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.finditer(pattern, edu_text, re.IGNORECASE)
+        for pattern in patterns.DEGREES:
+            matches = pattern.finditer(edu_text)
             for match in matches:
+                if len(education) >= MAX_EDUCATION_ENTRIES:
+                    return education
                 edu_dict = {}
                 
                 # Get surrounding context
@@ -330,8 +412,7 @@ def extract_education(text: str) -> List[Dict[str, Any]]:
                         break
                 
                 # Extract year
-                year_pattern = r'20\d{2}|19\d{2}'
-                years = re.findall(year_pattern, context)
+                years = patterns.YEAR.findall(context)
                 if years:
                     edu_dict["year"] = years[-1]  # Take the latest year
                 
@@ -342,98 +423,63 @@ def extract_education(text: str) -> List[Dict[str, Any]]:
 
 def extract_skills(text: str) -> List[Dict[str, Any]]:
     """Extract skills from resume text"""
-    skills = []
-    text_lower = text.lower()
-    
-    # Check each skill category
-    for category, skill_list in SKILLS_DATABASE.items():
-        for skill in skill_list:
-            if skill.lower() in text_lower:
-                # Calculate skill level based on context
-                skill_context = re.search(rf'.{{0,50}}{re.escape(skill.lower())}.{{0,50}}', text_lower)
-                level = 3  # Default level
-                
-                if skill_context:
-                    context = skill_context.group(0)
-                    if any(word in context for word in ['expert', 'advanced', 'senior', 'lead']):
-                        level = 5
-                    elif any(word in context for word in ['intermediate', 'experienced']):
-                        level = 4
-                    elif any(word in context for word in ['beginner', 'basic', 'junior']):
-                        level = 2
-                
-                skills.append({
-                    "name": skill.title(),
-                    "category": category.replace('_', ' ').title(),
-                    "level": level
-                })
-    
-    # Remove duplicates
-    unique_skills = []
-    seen_skills = set()
-    for skill in skills:
-        if skill["name"].lower() not in seen_skills:
-            unique_skills.append(skill)
-            seen_skills.add(skill["name"].lower())
-    
-    return unique_skills
-
-def extract_certificates(text: str) -> List[Dict[str, Any]]:
-    """Extract certificates from resume text"""
-    certificates = []
-
-    # Look for certificates section with multiple patterns
-    cert_patterns = [
-        r'(certificate|certification|credential|certifications)(.*?)(?=experience|education|skills|projects|$)',
-        r'(professional certifications|technical certifications)(.*?)(?=experience|education|$)',
-        r'(licenses|qualifications)(.*?)(?=experience|education|skills|$)',
-    ]
-
-    cert_text = ""
-    for pattern in cert_patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-        if match:
-            cert_text = match.group(2)
-            break
+    return skill_entries(skill_levels(text.lower()))
+
+def skill_levels(text_lower: str) -> Dict[str, int]:
+    """Level of every skill mentioned in lowercased text, judged around its first mention"""
+    levels = {}
+    for match in taxonomy_store.current.scanner.scan(text_lower):
+        if match.skill in levels:
+            continue
+
+        # Calculate skill level based on context
+        context = context_window(text_lower, match.start, match.end)
+        level = 3  # Default level
+        if any(word in context for word in ['expert', 'advanced', 'senior', 'lead']):
+            level = 5
+        elif any(word in context for word in ['intermediate', 'experienced']):
+            level = 4
+        elif any(word in context for word in ['beginner', 'basic', 'junior']):
+            level = 2
+        levels[match.skill] = level
+    return levels
+
+def skill_entries(levels: Dict[str, int]) -> List[Dict[str, Any]]:
+    """Skills in taxonomy order, from the levels found by skill_levels"""
+    taxonomy = taxonomy_store.current
+    # Sorting what was found keeps this independent of the taxonomy's size
+    found = sorted((taxonomy.order[skill], skill) for skill in levels if skill in taxonomy.order)
+    return [Skill(taxonomy.labels[index], taxonomy.category_labels[index], levels[skill]) for index, skill in found]
+
+def certificate_source(text: str, sections: SectionIndex) -> str:
+    """The text extract_certificates reads"""
+    # Look for certificates section
+    cert_text = sections.get("certifications")
 
     if not cert_text:
         # Fallback: search entire document for certification keywords
         cert_keywords = ['aws certified', 'microsoft certified', 'google cloud', 'cisco', 'oracle', 'pmp', 'scrum master']
         if any(keyword in text.lower() for keyword in cert_keywords):
             cert_text = text
+    return cert_text
 
-    if cert_text:
-        # Common certification patterns with certificate IDs
-        cert_patterns = [
-            # AWS certifications
-            r'(aws certified (cloud architect|developer|sysops administrator|solutions architect|devops engineer|data analytics|machine learning|security))',
-            r'(aws-[a-zA-Z0-9-]+)',
-
-            # Microsoft certifications
-            r'(microsoft certified:? (azure|office|windows|sql|visual studio|dynamics))',
-            r'(mcsa|mcsd|mcse|mcp|mos)-?[a-zA-Z0-9-]*',
-
-            # Google Cloud certifications
-            r'(google cloud (professional cloud architect|professional data engineer|professional cloud developer|associate cloud engineer))',
-            r'(gcp-[a-zA-Z0-9-]+)',
-
-            # Cisco certifications
-            r'(cisco certified (network associate|network professional|design associate|security professional))',
-            r'(ccna|ccnp|ccie|ccda|ccdp)-?[a-zA-Z0-9-]*',
-
-            # Other common certifications
-            r'(pmp|scrum master|csm|cspo|safe|itil|cissp|cisa|cism|ceh|comp tia|oracle certified)',
-            r'(certified (kubernetes administrator|docker|jenkins|terraform|ansible))',
+def extract_certificates(text: str, sections: Optional[SectionIndex] = None) -> List[Dict[str, Any]]:
+    """Extract certificates from resume text"""
+    return certificate_entries(certificate_source(text, sections or segment(text)))
 
-            # Generic certificate with ID pattern
-            r'([A-Z]{2,}-[A-Z0-9-]+|[A-Z]{3,}\d+|[A-Z]{2,}\s*\d{4,})',
-        ]
+def certificate_entries(cert_text: str) -> List[Dict[str, Any]]:
+    """Certificates found in the text chosen by certificate_source"""
+    certificates = []
 
+    if cert_text:
         processed_certs = set()
 
-        for pattern in cert_patterns:
-            matches = re.finditer(pattern, cert_text, re.IGNORECASE)
+        # Common certification patterns with certificate IDs
+        for pattern in patterns.CERTIFICATES:
+            matches = pattern.finditer(cert_text)
             for match in matches:
+                if len(certificates) >= MAX_CERTIFICATES:
+                    break
                 cert_name = match.group(0).strip()
 
                 # Skip if already processed
@@ -441,36 +487,36 @@ def extract_certificates(text: str) -> List[Dict[str, Any]]:
                     continue
                 processed_certs.add(cert_name.lower())
 
-                cert_dict = {
-                    "name": cert_name.title(),
-                    "issuer": extract_certificate_issuer(cert_name),
-                    "certificateId": extract_certificate_id(cert_text, match.start(), match.end()),
-                    "date": extract_certificate_date(cert_text, match.start(), match.end())
-                }
-
-                certificates.append(cert_dict)
+                certificates.append(Certificate(
+                    cert_name.title(),
+                    extract_certificate_issuer(cert_name),
+                    extract_certificate_id(cert_text, match.start(), match.end()),
+                    extract_certificate_date(cert_text, match.start(), match.end()),
+                ))
 
         # Also look for certificate entries in list format
         lines = cert_text.split('\n')
         for line in lines:
+            # Later entries would be cut anyway, and the check below compares against every one kept
+            if len(certificates) >= MAX_CERTIFICATES:
+                break
             line = line.strip()
             if len(line) > 10 and len(line) < 100:
                 # Check if line contains certificate-like keywords
                 if any(keyword in line.lower() for keyword in ['certified', 'certificate', 'certification', 'license', 'diploma']):
                     # Skip if already extracted
                     if not any(cert['name'].lower() in line.lower() for cert in certificates):
-                        cert_dict = {
-                            "name": line,
-                            "issuer": extract_certificate_issuer(line),
-                            "certificateId": extract_certificate_id_from_line(line),
-                            "date": extract_certificate_date_from_line(line)
-                        }
-                        certificates.append(cert_dict)
+                        certificates.append(Certificate(
+                            line,
+                            extract_certificate_issuer(line),
+                            extract_certificate_id_from_line(line),
+                            extract_certificate_date_from_line(line),
+                        ))
 
     # Remove duplicates and limit
     unique_certificates = []
     seen = set()
-    for cert in certificates[:15]:  # Limit to 15 certificates
+    for cert in certificates:
         key = cert['name'].lower()
         if key not in seen:
             unique_certificates.append(cert)
@@ -478,27 +524,28 @@ def extract_certificates(text: str) -> List[Dict[str, Any]]:
 
     return unique_certificates
 
+# Issuer of certificates whose name contains the keyword, checked in order
+CERTIFICATE_ISSUERS = {
+    'aws': 'Amazon Web Services',
+    'microsoft': 'Microsoft',
+    'google': 'Google',
+    'cisco': 'Cisco',
+    'oracle': 'Oracle',
+    'pmp': 'Project Management Institute',
+    'scrum': 'Scrum Alliance',
+    'itil': 'AXELOS',
+    'cissp': 'ISC²',
+    'cisa': 'ISACA',
+    'cism': 'ISACA',
+    'ceh': 'EC-Council',
+    'comp tia': 'CompTIA',
+}
+
 def extract_certificate_issuer(cert_name: str) -> str:
     """Extract issuer from certificate name"""
     cert_lower = cert_name.lower()
 
-    issuer_map = {
-        'aws': 'Amazon Web Services',
-        'microsoft': 'Microsoft',
-        'google': 'Google',
-        'cisco': 'Cisco',
-        'oracle': 'Oracle',
-        'pmp': 'Project Management Institute',
-        'scrum': 'Scrum Alliance',
-        'itil': 'AXELOS',
-        'cissp': 'ISC²',
-        'cisa': 'ISACA',
-        'cism': 'ISACA',
-        'ceh': 'EC-Council',
-        'comp tia': 'CompTIA',
-    }
-
-    for keyword, issuer in issuer_map.items():
+    for keyword, issuer in CERTIFICATE_ISSUERS.items():
         if keyword in cert_lower:
             return issuer
 
@@ -507,7 +554,8 @@ def extract_certificate_issuer(cert_name: str) -> str:
         words = cert_name.split()
         for i, word in enumerate(words):
             if word.lower() == 'certified' and i > 0:
-                return words[i-1].title()
+                # Issuers repeat across resumes, so results share one copy of each
+                return sys.intern(words[i-1].title())
 
     return 'Unknown'
 
@@ -518,35 +566,18 @@ def extract_certificate_id(text: str, start: int, end: int) -> str:
     context = text[context_start:context_end]
 
     # Look for ID patterns in context
-    id_patterns = [
-        r'([A-Z]{2,}-[A-Z0-9-]+)',
-        r'([A-Z]{3,}\d+)',
-        r'(ID|Certificate|Cert|License):\s*([A-Z0-9-]+)',
-        r'#([A-Z0-9-]+)',
-    ]
-
-    for pattern in id_patterns:
-        matches = re.findall(pattern, context, re.IGNORECASE)
-        if matches:
-            # Return the first match (clean it up)
-            match = matches[0]
-            if isinstance(match, tuple):
-                return match[-1]  # Take the captured group
-            return match
+    for pattern in patterns.CERTIFICATE_IDS_IN_CONTEXT:
+        match = pattern.search(context)
+        if match:
+            # Return the first match, taking the last captured group
+            return match.groups()[-1]
 
     return ""
 
 def extract_certificate_id_from_line(line: str) -> str:
     """Extract certificate ID from a single line"""
-    id_patterns = [
-        r'([A-Z]{2,}-[A-Z0-9-]+)',
-        r'([A-Z]{3,}\d+)',
-        r'#([A-Z0-9-]+)',
-        r'(ID|Certificate|Cert):\s*([A-Z0-9-]+)',
-    ]
-
-    for pattern in id_patterns:
-        match = re.search(pattern, line, re.IGNORECASE)
+    for pattern in patterns.CERTIFICATE_IDS_IN_LINE:
+        match = pattern.search(line)
         if match:
             groups = match.groups()
             return groups[-1] if groups[-1] else groups[0]
@@ -560,14 +591,8 @@ def extract_certificate_date(text: str, start: int, end: int) -> str:
     context = text[context_start:context_end]
 
     # Look for date patterns
-    date_patterns = [
-        r'20\d{2}',
-        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+20\d{2}',
-        r'\d{1,2}/\d{4}',
-    ]
-
-    for pattern in date_patterns:
-        match = re.search(pattern, context, re.IGNORECASE)
+    for pattern in patterns.DATES:
+        match = pattern.search(context)
         if match:
             return match.group(0)
 
@@ -575,81 +600,757 @@ def extract_certificate_date(text: str, start: int, end: int) -> str:
 
 def extract_certificate_date_from_line(line: str) -> str:
     """Extract certificate date from a single line"""
-    date_patterns = [
-        r'20\d{2}',
-        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+20\d{2}',
-        r'\d{1,2}/\d{4}',
-    ]
-
-    for pattern in date_patterns:
-        match = re.search(pattern, line, re.IGNORECASE)
+    for pattern in patterns.DATES:
+        match = pattern.search(line)
         if match:
             return match.group(0)
 
     return ""
 
+def parse_text(text: str) -> Dict[str, Any]:
+    """Run every extractor over resume text within the per-document budget"""
+    return parse_sections(text, {})[0]
+
+def section_chunks(text: str, sections: SectionIndex) -> List[str]:
+    """The text cut at each heading line; no skill mention or context window crosses a cut"""
+    starts = sorted({0, *(text.rfind('\n', 0, section.start) + 1 for section in sections.sections)})
+    return [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+
+def clip_text(text: str) -> str:
+    if len(text) > PARSE_MAX_TEXT_CHARS:
+        logger.warning(f"Resume text truncated from {len(text)} to {PARSE_MAX_TEXT_CHARS} characters")
+        return text[:PARSE_MAX_TEXT_CHARS]
+    return text
+
+def segment_text(text: str) -> SectionIndex:
+    with metrics.stage("segment"):
+        return segment(text)
+
+# Extraction stages in result order, with the result a skipped stage gets; each only
+# depends on the text and its segmentation, so they can run in any order or at once
+EXTRACTION_STAGES = (
+    ("personal_info", dict),
+    ("experience", list),
+    ("education", list),
+    ("skills", list),
+    ("certificates", list),
+)
+
+def extract_stage(field: str, text: str, sections: SectionIndex, base_units: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+    """Run one extractor, reusing results from base_units for unchanged sections; returns its result and units"""
+    # Section results are keyed by the hash of the text they were extracted from;
+    # the units of this parse become the base_units of the next edit
+    units: Dict[str, Any] = {}
+
+    def unit(source: str, extract):
+        key = f"{field}:{hashlib.sha256(source.encode()).hexdigest()}"
+        if key in base_units:
+            metrics.count("sections_reused", 1)
+            units[key] = base_units[key]
+        else:
+            metrics.count("sections_parsed", 1)
+            units[key] = extract(source)
+        return units[key]
+
+    def skills() -> List[Dict[str, Any]]:
+        # The first mention of a skill is in the first chunk that mentions it
+        levels: Dict[str, int] = {}
+        for chunk in section_chunks(text, sections):
+            for skill, level in unit(chunk, lambda source: skill_levels(source.lower())).items():
+                levels.setdefault(skill, level)
+        return skill_entries(levels)
+
+    extractors = {
+        "personal_info": lambda: extract_personal_info(text),
+        "experience": lambda: unit(experience_source(text, sections), experience_entries),
+        "education": lambda: unit(education_source(text, sections), education_entries),
+        "skills": skills,
+        "certificates": lambda: unit(certificate_source(text, sections), certificate_entries),
+    }
+    with metrics.stage(field):
+        return extractors[field](), units
+
+def parse_sections(text: str, base_units: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Parse resume text, reusing results from base_units for every section whose text is unchanged"""
+    text = clip_text(text)
+    started = time.perf_counter()
+    deadline = time.monotonic() + PARSE_TIME_BUDGET_SECONDS
+
+    # Segment once; section-based extractors each read only their own slice
+    sections = segment_text(text)
+    parsed, units = {}, {}
+    for field, empty in EXTRACTION_STAGES:
+        if time.monotonic() > deadline:
+            logger.warning(f"Parse time budget exhausted, skipping {field}")
+            parsed[field] = empty()
+            continue
+        parsed[field], stage_units = extract_stage(field, text, sections, base_units)
+        units.update(stage_units)
+    slow_parse_log.record(time.perf_counter() - started, text, metrics.current_timings())
+    return parsed, units
+
+def document_kind(filename: str) -> str:
+    return "pdf" if filename.lower().endswith('.pdf') else "docx"
+
+def extract_document_text(filename: str, content: DocumentSource) -> str:
+    with metrics.stage("extract_text"):
+        if document_kind(filename) == "pdf":
+            return extract_text_from_pdf(content)
+        return extract_text_from_docx(content)
+
+def parse_document(filename: str, content: DocumentSource) -> Dict[str, Any]:
+    """Extract text from an uploaded document and parse it"""
+    return parse_text(extract_document_text(filename, content))
+
+def read_document(filename: str, content: DocumentSource) -> Tuple[str, Optional[DocumentSignature]]:
+    """Extract text from an uploaded document and MinHash it for near-duplicate detection"""
+    text = extract_document_text(filename, content)
+    return text, signature(text)
+
+def read_text(text: str) -> Tuple[str, Optional[DocumentSignature]]:
+    return text, signature(text)
+
+def is_supported_document(filename: Optional[str]) -> bool:
+    return bool(filename) and filename.lower().endswith(('.pdf', '.docx', '.doc'))
+
+def parser_version() -> str:
+    """Fingerprint of the taxonomy and extractor code; cached results from other versions are ignored"""
+    digest = hashlib.sha256()
+    digest.update(taxonomy_store.current.version.encode())
+    # Settings that change what text is extracted also change the result
+    digest.update(
+        f"{PARSE_MAX_TEXT_CHARS}:{pdf_text.PDF_MAX_PAGES}:{pdf_text.PDF_EARLY_EXIT}:{docx_text.DOCX_MAX_PART_BYTES}".encode()
+    )
+    for path in (
+        __file__, patterns.__file__, pdf_text.__file__, docx_text.__file__, inspect.getsourcefile(SkillScanner), inspect.getsourcefile(segment),
+        inspect.getsourcefile(Taxonomy),
+    ):
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:16]
+
+parse_cache = ParseCache(namespace=parser_version())
+parse_flights = SingleFlight()
+
+async def cached_parse(key: str, fn, *args) -> Tuple[Dict[str, Any], str]:
+    """Run fn(*args) on the parse pool unless a result for this cache key is cached"""
+    parsed, tier = await parse_cache.fetch(key)
+    if parsed is not None:
+        metrics.PARSE_CACHE_REQUESTS.labels(result=f"hit-{tier}").inc()
+        return parsed, f"hit-{tier}"
+
+    metrics.PARSE_CACHE_REQUESTS.labels(result="miss").inc()
+
+    async def parse() -> Dict[str, Any]:
+        with metrics.PARSE_IN_FLIGHT.track_inprogress():
+            if inspect.iscoroutinefunction(fn):
+                parsed = await fn(*args)
+            else:
+                parsed = await run_parse_task(fn, *args)
+        # Validated once, before it is cached or served; responses then serialize it as is
+        ParsedResume.model_validate(parsed_content(parsed))
+        await parse_cache.store(key, parsed)
+        return parsed
+
+    # Repeated clicks and components loading the same resume at once share one parse
+    parsed, shared = await parse_flights.run(key, parse)
+    if shared is None:
+        return parsed, "miss"
+    if shared == "host":
+        await parse_cache.store(key, parsed)
+    return parsed, "coalesced"
+
+async def run_parse_task(fn, *args) -> Any:
+    """Run fn(*args) on the parse pool and record the stage timings it measured there"""
+    result, timings, counts = await parse_executor.run(metrics.run_timed, fn, *args)
+    metrics.record(timings, counts)
+    return result
+
+async def text_document_id(digest: str, base_hash: Optional[str]) -> str:
+    """Export id of a text: each autosaved edit of a document keeps the id of the version it was edited from"""
+    document_id = digest
+    if base_hash:
+        base, _ = await parse_cache.fetch(parse_cache.digest_key("document", base_hash))
+        document_id = base["document_id"] if base is not None else base_hash
+    await parse_cache.store(parse_cache.digest_key("document", digest), {"document_id": document_id})
+    return document_id
+
+async def parse_edited_text(text: str, digest: str, base_hash: Optional[str]) -> Dict[str, Any]:
+    """Parse text on the pool, re-extracting only the sections that differ from the base document"""
+    # Keyed before parsing, so units parsed while the taxonomy is reloaded stay with the old version
+    units_key = parse_cache.digest_key("units", digest)
+    base_units = None
+    if base_hash:
+        base_units, _ = await parse_cache.fetch(parse_cache.digest_key("units", base_hash))
+    parsed, units = await parse_text_on_pool(text, base_units or {})
+    await parse_cache.store(units_key, units)
+    return parsed
+
+async def parse_text_on_pool(text: str, base_units: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Parse text on the pool; long texts run each extraction stage on its own idle worker, with its own timeout"""
+    idle_workers = parse_executor.max_workers - parse_executor.pending
+    if (
+        # The extractors are pure-Python regex work that holds the GIL, so only processes run them at once
+        parse_executor.backend != "process"
+        or len(text) < PARSE_PARALLEL_MIN_CHARS
+        # Fanned-out stages would only queue behind other documents, or be turned away with 503
+        or idle_workers < 2
+        or parse_executor.pending + len(EXTRACTION_STAGES) > parse_executor.max_pending
+    ):
+        return await run_parse_task(parse_sections, text, base_units)
+
+    started = time.perf_counter()
+    text = clip_text(text)
+    sections = await run_parse_task(segment_text, text)
+    # The same string as sections.text, so each stage task pickles the text once
+    text = sections.text
+
+    async def run_stage(field: str, empty) -> Tuple[Any, Dict[str, Any]]:
+        # A worker only needs the base document's units of its own stage
+        stage_units = {key: value for key, value in base_units.items() if key.startswith(f"{field}:")}
+        try:
+            return await asyncio.wait_for(
+                run_parse_task(extract_stage, field, text, sections, stage_units), PARSE_STAGE_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            # The worker finishes the stage in the background; the parse goes on without it
+            logger.warning(f"Extracting {field} exceeded {PARSE_STAGE_TIMEOUT_SECONDS}s, returning it empty")
+            metrics.PARSE_STAGE_TIMEOUTS.labels(stage=field).inc()
+            return empty(), {}
+
+    results = await asyncio.gather(*(run_stage(field, empty) for field, empty in EXTRACTION_STAGES))
+    parsed, units = {}, {}
+    for (field, _), (result, stage_units) in zip(EXTRACTION_STAGES, results):
+        parsed[field] = result
+        units.update(stage_units)
+    slow_parse_log.record(time.perf_counter() - started, text, metrics.current_timings())
+    return parsed, units
+
+def count_pdf_pages(content: DocumentSource) -> int:
+    try:
+        return pdf_text.count_pages(content)
+    except Exception as e:
+        logger.error(f"Error reading PDF: {e}")
+        raise UnreadableDocumentError("Failed to extract text from PDF")
+
+def extract_pdf_pages(content: DocumentSource, start: int, stop: int) -> str:
+    try:
+        with metrics.stage("extract_text"):
+            return pdf_text.extract_pages(content, start, stop, PARSE_MAX_TEXT_CHARS)
+    except Exception as e:
+        logger.error(f"Error extracting PDF text: {e}")
+        raise UnreadableDocumentError("Failed to extract text from PDF")
+
+async def read_pdf_document(content: DocumentSource) -> Tuple[str, Optional[DocumentSignature]]:
+    """Extract and MinHash a PDF on the parse pool; long documents are split into page ranges across workers"""
+    if pdf_text.PDF_EARLY_EXIT or parse_executor.backend == "inline" or parse_executor.max_workers == 1:
+        return await run_parse_task(read_document, "resume.pdf", content)
+
+    page_count = await run_parse_task(count_pdf_pages, content)
+    if page_count < pdf_text.PDF_PARALLEL_MIN_PAGES:
+        return await run_parse_task(read_document, "resume.pdf", content)
+
+    ranges = pdf_text.page_ranges(min(page_count, pdf_text.PDF_MAX_PAGES), parse_executor.max_workers)
+    texts = await asyncio.gather(*(run_parse_task(extract_pdf_pages, content, start, stop) for start, stop in ranges))
+    return await run_parse_task(read_text, "".join(texts))
+
+# Clusters of copied and templated resumes, keyed by the MinHash of their extracted text
+near_duplicate_index = NearDuplicateIndex()
+
+async def parse_upload(filename: str, content: DocumentSource) -> Dict[str, Any]:
+    """Parse an uploaded document, reusing the cached parse of an earlier upload of the same text"""
+    if document_kind(filename) == "pdf":
+        text, document = await read_pdf_document(content)
+    else:
+        text, document = await run_parse_task(read_document, filename, content)
+
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    cluster, original = None, None
+    if document is not None:
+        cluster, original = await asyncio.get_running_loop().run_in_executor(
+            None, near_duplicate_index.assign, digest, document
+        )
+
+    # Keyed like /parse-resume-text, so the same text uploaded in another format is a cache hit
+    key = parse_cache.digest_key("text", digest)
+    parsed, _ = await parse_cache.fetch(key)
+    if parsed is None:
+        # A near-copy is someone else's resume as often as not, so it is parsed in full;
+        # only sections identical to the original's, word for word, reuse their results
+        base_units = None
+        if original is not None and original.similarity >= NEAR_DUPLICATE_REUSE_THRESHOLD:
+            base_units, _ = await parse_cache.fetch(parse_cache.digest_key("units", original.text_digest))
+        metrics.NEAR_DUPLICATES.labels(
+            result="unique" if original is None else "reused" if base_units is not None else "near"
+        ).inc()
+        parsed, units = await parse_text_on_pool(text, base_units or {})
+        await parse_cache.store(key, parsed)
+        if document is not None:
+            await parse_cache.store(parse_cache.digest_key("units", digest), units)
+    return {**parsed, "duplicate_cluster": cluster}
+
+def init_parse_worker(taxonomy_version: Optional[str] = None) -> None:
+    """Prepare a pool worker so its first task does not pay for warm-up"""
+    # Taxonomy reloads are signalled to the service process; workers are replaced instead
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    # Workers fork from a server that imported this module at the first pool's start,
+    # so workers of a later pool load the taxonomy the service has since switched to
+    if taxonomy_version and taxonomy_store.current.version != taxonomy_version:
+        taxonomy_store.reload()
+        slow_parse_log.keep = slow_log_vocabulary()
+    taxonomy_store.current.scanner.scan("warm up")
+    parse_text("")
+
+parse_executor = ParseExecutor(initializer=init_parse_worker)
+
+def canonical_skill(skill: str) -> str:
+    return taxonomy_store.current.canonicalizer.canonical(skill)
+
+candidate_index = CandidateIndex(normalize=canonical_skill)
+
+async def index_parsed_skills(candidate_id: Optional[str], parsed: Dict[str, Any]) -> None:
+    """Feed a parse result into the candidate index when the caller identified the candidate"""
+    if candidate_id:
+        # Upserts take the index file lock and may compact, so they run off the event loop
+        skills = [skill["name"] for skill in parsed["skills"]]
+        await asyncio.get_running_loop().run_in_executor(None, candidate_index.upsert, candidate_id, skills)
+
+# Parse results accumulated for the analytics datasets (RESUME_EXPORT_DIR)
+resume_export = ResumeExport()
+
+def export_resumes() -> Dict[str, int]:
+    try:
+        return resume_export.export()
+    except Exception as e:
+        logger.error(f"Error exporting parsed resumes: {e}")
+        raise
+
+async def record_parsed(
+    document_id: str, source: str, parsed: Dict[str, Any], cache_status: str, candidate_id: Optional[str] = None
+) -> None:
+    """Stage a fresh parse result for export off the event loop; a full batch is exported in the background"""
+    # Cached and shared results were staged by the request that parsed them
+    if not resume_export.enabled or cache_status != "miss":
+        return
+    loop = asyncio.get_running_loop()
+    if await loop.run_in_executor(None, resume_export.record, document_id, source, parsed, candidate_id):
+        loop.run_in_executor(None, export_resumes)
+
+job_queue = JobQueue()
+
+async def run_parse_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse a queued upload through the same cache and pool as /parse-resume-file"""
+    key = parse_cache.digest_key(job["kind"], job["sha256"])
+    path = job_queue.file_path(job["id"])
+    try:
+        parsed, cache_status = await cached_parse(key, parse_upload, job["filename"], path)
+    except UnreadableDocumentError as e:
+        raise PermanentJobError(str(e))
+    await index_parsed_skills(job["candidate_id"], parsed)
+    await record_parsed(job["sha256"], "job", parsed, cache_status, job["candidate_id"])
+    return parsed_content(parsed)
+
+def job_response(job: Dict[str, Any], deduplicated: bool = False) -> ParseJobResponse:
+    return ParseJobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        attempts=job["attempts"],
+        priority=job["priority"],
+        deduplicated=deduplicated,
+        error=job["error"],
+        created_at=datetime.fromtimestamp(job["created_at"]),
+        updated_at=datetime.fromtimestamp(job["updated_at"]),
+    )
+
+async def reload_taxonomy() -> Tuple[Taxonomy, bool]:
+    """Load the taxonomy file again and, when it changed, start using it for new requests"""
+    taxonomy, changed = await asyncio.get_running_loop().run_in_executor(None, taxonomy_store.reload)
+    if changed:
+        parse_cache.set_namespace(parser_version())
+        slow_parse_log.keep = slow_log_vocabulary()
+        # New workers load the new taxonomy; parses already on the old workers finish there
+        parse_executor.restart(taxonomy.version)
+    return taxonomy, changed
+
+async def reload_taxonomy_on_signal() -> None:
+    try:
+        await reload_taxonomy()
+    except TaxonomyError as e:
+        logger.error(f"Keeping the current skills taxonomy: {e}")
+
+def install_reload_signal() -> None:
+    """Reload the taxonomy on SIGHUP, where the event loop is able to receive signals"""
+    if not hasattr(signal, "SIGHUP"):
+        return
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGHUP, lambda: asyncio.ensure_future(reload_taxonomy_on_signal())
+        )
+    except RuntimeError as e:
+        logger.warning(f"SIGHUP taxonomy reload unavailable: {e}")
+
+startup_seconds: Optional[float] = None
+
+@app.on_event("startup")
+async def start_parse_executor():
+    global startup_seconds
+    parse_executor.start()
+    job_queue.start(run_parse_job)
+    install_reload_signal()
+    # Warm-up runs beside request handling, so it never delays readiness
+    model_registry.warm_up(model_names(MODEL_WARMUP))
+    startup_seconds = round(process_uptime(), 3)
+    loaded = [name for name, model in model_registry.stats().items() if model["loaded"]]
+    logger.info(f"AI service started in {startup_seconds}s (models loaded: {', '.join(loaded) or 'none'})")
+
+@app.on_event("shutdown")
+async def stop_parse_executor():
+    await job_queue.stop()
+    parse_executor.shutdown()
+    parse_flights.close()
+    if resume_export.enabled:
+        resume_export.seal()
+
+async def spool_upload(source, filename: str, max_bytes: int = UPLOAD_MAX_BYTES, copy: bool = False) -> SpooledUpload:
+    """Hash and check an upload off the event loop, rejecting oversize or mislabelled files"""
+    upload = await asyncio.get_running_loop().run_in_executor(None, spool_file, source, filename, max_bytes, copy)
+    metrics.DOCUMENT_BYTES.labels(kind=document_kind(filename)).observe(upload.size)
+    return upload
+
+# Room for the multipart boundaries and form fields around the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+@app.middleware("http")
+async def reject_oversized_uploads(request, call_next):
+    """Refuse single-file uploads that declare an oversize body before it is received"""
+    if request.url.path == "/parse-resume-file":
+        length = request.headers.get("content-length", "")
+        if length.isdigit() and int(length) > UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD_BYTES:
+            return JSONResponse(status_code=413, content={"detail": f"File too large (limit {UPLOAD_MAX_BYTES} bytes)"})
+    return await call_next(request)
+
+def route_label(request) -> str:
+    """Route template of a request, so metrics are not labelled with ids from the path"""
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+@app.middleware("http")
+async def observe_requests(request, call_next):
+    """Request latency histogram, plus a Server-Timing breakdown when X-Parse-Timing is sent"""
+    started = time.perf_counter()
+    timer = metrics.start_request_timer()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - started
+    metrics.REQUEST_SECONDS.labels(
+        method=request.method, route=route_label(request), status=str(response.status_code)
+    ).observe(elapsed)
+    if request.headers.get("x-parse-timing"):
+        timer.timings["total"] = elapsed
+        response.headers["Server-Timing"] = timer.server_timing()
+    return response
+
+def require_admin(token: Optional[str]) -> None:
+    """Admin endpoints exist only when ADMIN_TOKEN is set, and need it in X-Admin-Token"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics for this worker, or all workers with PROMETHEUS_MULTIPROC_DIR"""
+    job_counts = await asyncio.get_running_loop().run_in_executor(None, job_queue.stats)
+    for status, jobs in job_counts.items():
+        metrics.PARSE_JOBS.labels(status=status).set(jobs)
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
+
 @app.get("/")
 async def root():
     return {"message": "ResuChain AI Service is running"}
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "startup_seconds": startup_seconds,
+        "models": model_registry.stats(),
+    }
 
 @app.post("/parse-resume-file", response_model=ParsedResume)
-async def parse_resume_file(file: UploadFile = File(...)):
+async def parse_resume_file(file: UploadFile = File(...), candidate_id: Optional[str] = Form(None)):
     """Parse resume from uploaded file"""
+    if not is_supported_document(file.filename):
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+
+    upload: Optional[SpooledUpload] = None
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Extract text based on file type
-        if file.filename.lower().endswith('.pdf'):
-            text = extract_text_from_pdf(content)
-        elif file.filename.lower().endswith(('.docx', '.doc')):
-            text = extract_text_from_docx(content)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format")
-        
-        # Parse resume
-        parsed_resume = ParsedResume(
-            personal_info=extract_personal_info(text),
-            experience=extract_experience(text),
-            education=extract_education(text),
-            skills=extract_skills(text),
-            certificates=extract_certificates(text)
-        )
-        
-        return parsed_resume
-        
+        # Workers read the file Starlette spooled the upload to rather than a copy of it
+        upload = await spool_upload(file.file, file.filename)
+
+        # Text extraction and parsing run on the parse pool, off the event loop
+        kind = document_kind(file.filename)
+        key = parse_cache.digest_key(kind, upload.sha256)
+        parsed, cache_status = await cached_parse(key, parse_upload, file.filename, upload.source)
+        await index_parsed_skills(candidate_id, parsed)
+        await record_parsed(upload.sha256, "file", parsed, cache_status, candidate_id)
+        return parsed_response(parsed, {"X-Parse-Cache": cache_status})
+
+    except HTTPException:
+        raise
+    except UnreadableDocumentError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error parsing resume: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to parse resume: {str(e)}")
+    finally:
+        if upload is not None:
+            release(upload)
 
 @app.post("/parse-resume-text", response_model=ParsedResume)
 async def parse_resume_text(request: ResumeParseRequest):
     """Parse resume from text"""
     try:
-        parsed_resume = ParsedResume(
-            personal_info=extract_personal_info(request.text),
-            experience=extract_experience(request.text),
-            education=extract_education(request.text),
-            skills=extract_skills(request.text),
-            certificates=extract_certificates(request.text)
-        )
-        
-        return parsed_resume
-        
+        digest = hashlib.sha256(request.text.encode()).hexdigest()
+        key = parse_cache.digest_key("text", digest)
+        parsed, cache_status = await cached_parse(key, parse_edited_text, request.text, digest, request.base_hash)
+        await index_parsed_skills(request.candidate_id, parsed)
+        if resume_export.enabled:
+            document_id = await text_document_id(digest, request.base_hash)
+            await record_parsed(document_id, "text", parsed, cache_status, request.candidate_id)
+        # Clients send X-Document-Hash back as base_hash with the next edit of the document
+        return parsed_response(parsed, {"X-Parse-Cache": cache_status, "X-Document-Hash": digest})
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error parsing resume text: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to parse resume: {str(e)}")
 
+@app.post("/admin/profile")
+async def profile_parse(
+    file: Optional[UploadFile] = File(None),
+    text: Optional[str] = Form(None),
+    output: Literal["collapsed", "pstats"] = Form("collapsed"),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """Parse one resume (file or text) under a profiler, bypassing the cache, and return the profile"""
+    require_admin(x_admin_token)
+    if (file is None) == (text is None):
+        raise HTTPException(status_code=400, detail="Send exactly one of file or text")
+
+    upload: Optional[SpooledUpload] = None
+    try:
+        if file is not None:
+            if not is_supported_document(file.filename):
+                raise HTTPException(status_code=400, detail="Unsupported file format")
+            upload = await spool_upload(file.file, file.filename)
+            # One task for the whole document, so text extraction is in the profile too
+            _, profile, seconds = await parse_executor.run(
+                profile_call, parse_document, (file.filename, upload.source), output
+            )
+        else:
+            _, profile, seconds = await parse_executor.run(profile_call, parse_text, (text,), output)
+    except HTTPException:
+        raise
+    except UnreadableDocumentError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error profiling resume: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to profile resume: {str(e)}")
+    finally:
+        if upload is not None:
+            release(upload)
+
+    headers = {"X-Profile-Seconds": f"{seconds:.6f}"}
+    if output == "pstats":
+        headers["Content-Disposition"] = 'attachment; filename="parse.pstats"'
+        return Response(content=profile, media_type="application/octet-stream", headers=headers)
+    return Response(content=profile, media_type="text/plain", headers=headers)
+
+@app.get("/admin/slow-parses")
+async def slow_parses(x_admin_token: Optional[str] = Header(None)):
+    """The slowest parses recorded in SLOW_PARSE_LOG_DIR, anonymized, slowest first"""
+    require_admin(x_admin_token)
+    entries = await asyncio.get_running_loop().run_in_executor(None, slow_parse_log.entries)
+    return {"enabled": slow_parse_log.enabled, "entries": entries}
+
+@app.post("/admin/exports")
+async def export_parsed_resumes(x_admin_token: Optional[str] = Header(None)):
+    """Export the parse results staged so far to the Arrow/Parquet datasets"""
+    require_admin(x_admin_token)
+    if not resume_export.enabled:
+        raise HTTPException(status_code=404, detail="Resume export is disabled (RESUME_EXPORT_DIR is not set)")
+    rows = await asyncio.get_running_loop().run_in_executor(None, export_resumes)
+    return {"rows": rows}
+
+@app.get("/analytics/aggregates")
+async def resume_aggregates(since: Optional[date] = None, until: Optional[date] = None, top: int = 20):
+    """Skill frequency by category, certificate issuers and education years of exported resumes"""
+    if not resume_export.enabled:
+        raise HTTPException(status_code=404, detail="Resume export is disabled (RESUME_EXPORT_DIR is not set)")
+    if top < 1:
+        raise HTTPException(status_code=400, detail="top must be at least 1")
+    return await asyncio.get_running_loop().run_in_executor(None, resume_export.aggregates, since, until, top)
+
+@app.post("/jobs/parse-resume-file", response_model=ParseJobResponse, status_code=202)
+async def submit_parse_job(
+    file: UploadFile = File(...),
+    candidate_id: Optional[str] = Form(None),
+    priority: int = Form(0),
+    webhook_url: Optional[str] = Form(None),
+):
+    """Queue a resume upload for parsing and return its job id immediately"""
+    if not is_supported_document(file.filename):
+        raise HTTPException(status_code=400, detail="Unsupported file format")
+    if webhook_url:
+        check_webhook_url(webhook_url)
+
+    # The job outlives the request and its spooled upload, so it gets a copy of its own
+    upload = await spool_upload(file.file, file.filename, copy=True)
+    try:
+        job, deduplicated = await asyncio.get_running_loop().run_in_executor(
+            None, job_queue.submit,
+            upload.source, upload.sha256, document_kind(file.filename), file.filename, candidate_id, priority, webhook_url,
+        )
+    finally:
+        release(upload)
+    return job_response(job, deduplicated)
+
+@app.get("/jobs/{job_id}", response_model=ParseJobResponse)
+async def get_parse_job(job_id: str):
+    """Status of a parse job"""
+    job = await asyncio.get_running_loop().run_in_executor(None, job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_response(job)
+
+@app.get("/jobs/{job_id}/result", response_model=ParsedResume)
+async def get_parse_job_result(job_id: str):
+    """Parsed resume of a finished job; 409 while it is still queued or running"""
+    job = await asyncio.get_running_loop().run_in_executor(None, job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=422, detail=job["error"] or "Job failed")
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}", headers={"Retry-After": "1"})
+    return parsed_response(job["result"])
+
+async def iter_batch_documents(files: List[UploadFile]) -> AsyncIterator[Tuple[str, Optional[SpooledUpload], Optional[str]]]:
+    """Yield (filename, spooled upload, error) for each upload, expanding zip archives one member at a time"""
+    for upload in files:
+        filename = upload.filename or "upload"
+        if filename.lower().endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile:
+                yield filename, None, "Invalid zip archive"
+                continue
+            with archive:
+                for info in archive.infolist():
+                    if info.is_dir():
+                        continue
+                    member_name = f"{filename}/{info.filename}"
+                    if not is_supported_document(info.filename):
+                        yield member_name, None, "Unsupported file format"
+                    elif info.file_size > PARSE_BATCH_MAX_MEMBER_BYTES:
+                        yield member_name, None, "File too large"
+                    else:
+                        with archive.open(info) as member:
+                            spooled = await spool_batch_document(member, member_name, PARSE_BATCH_MAX_MEMBER_BYTES)
+                        yield spooled
+        elif is_supported_document(filename):
+            yield await spool_batch_document(upload.file, filename, UPLOAD_MAX_BYTES)
+        else:
+            yield filename, None, "Unsupported file format"
+
+async def spool_batch_document(source, filename: str, max_bytes: int) -> Tuple[str, Optional[SpooledUpload], Optional[str]]:
+    try:
+        return filename, await spool_upload(source, filename, max_bytes), None
+    except HTTPException as e:
+        return filename, None, e.detail
+
+async def parse_batch_item(index: int, filename: str, upload: Optional[SpooledUpload], error: Optional[str]) -> Dict[str, Any]:
+    """Parse one batch member, reporting failures inline instead of raising"""
+    item = {"index": index, "filename": filename}
+    if error is not None:
+        item["error"] = error
+        item["status"] = 400
+        return item
+
+    try:
+        key = parse_cache.digest_key(document_kind(filename), upload.sha256)
+        parsed, cache_status = await cached_parse(key, parse_upload, filename, upload.source)
+        item["result"] = parsed_content(parsed)
+        item["cache"] = cache_status
+        await record_parsed(upload.sha256, "batch", parsed, cache_status)
+        item["status"] = 200
+    except HTTPException as e:
+        item["error"] = e.detail
+        item["status"] = e.status_code
+    except UnreadableDocumentError as e:
+        item["error"] = str(e)
+        item["status"] = 400
+    except Exception as e:
+        logger.error(f"Error parsing batch item {filename}: {e}")
+        item["error"] = f"Failed to parse resume: {str(e)}"
+        item["status"] = 500
+    finally:
+        release(upload)
+    return item
+
+async def stream_batch_results(files: List[UploadFile]) -> AsyncIterator[bytes]:
+    """Parse batch members concurrently and yield NDJSON lines in completion order"""
+    in_flight = set()
+    index = 0
+
+    async for filename, upload, error in iter_batch_documents(files):
+        # Only a bounded window of documents is spooled at once
+        if len(in_flight) >= PARSE_BATCH_CONCURRENCY:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield orjson.dumps(task.result()) + b"\n"
+        in_flight.add(asyncio.ensure_future(parse_batch_item(index, filename, upload, error)))
+        index += 1
+
+    while in_flight:
+        done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield orjson.dumps(task.result()) + b"\n"
+
+@app.post("/parse-resume-batch")
+async def parse_resume_batch(files: List[UploadFile] = File(...)):
+    """Parse many resumes (or zip archives of resumes), streaming NDJSON results as they finish"""
+    return StreamingResponse(stream_batch_results(files), media_type="application/x-ndjson")
+
 @app.post("/match-skills", response_model=SkillsMatchResponse)
 async def match_skills(request: SkillsMatchRequest):
     """Calculate skill match percentage between resume and job requirements"""
     try:
-        resume_skills_lower = [skill.lower() for skill in request.resume_skills]
-        job_skills_lower = [skill.lower() for skill in request.job_skills]
+        # Skills are compared by canonical id, so "K8s", "kubernetes" and "Kubernetes " are one skill
+        canonicalizer = taxonomy_store.current.canonicalizer
+        resume_ids = set()
+        resume_words: Dict[int, FrozenSet[str]] = {}
+        skills_by_word: Dict[str, Set[int]] = {}
+        for skill in request.resume_skills:
+            skill_id = canonicalizer.skill_id(skill)
+            resume_ids.add(skill_id)
+            resume_words[skill_id] = canonicalizer.words(skill)
+            for word in resume_words[skill_id]:
+                skills_by_word.setdefault(word, set()).add(skill_id)
+
+        semantic_scores = None
+        if request.mode == "semantic":
+            vectors = await encode_skills(request.job_skills + request.resume_skills)
+            semantic_scores = dict(zip(request.job_skills, best_similarities(
+                skill_vectors(vectors, request.job_skills), skill_vectors(vectors, request.resume_skills)
+            )))
         
         # Find matched skills
         matched_skills = []
@@ -657,25 +1358,24 @@ async def match_skills(request: SkillsMatchRequest):
         skill_scores = {}
         
         for job_skill in request.job_skills:
-            job_skill_lower = job_skill.lower()
-            
             # Exact match
-            if job_skill_lower in resume_skills_lower:
+            if canonicalizer.skill_id(job_skill) in resume_ids:
                 matched_skills.append(job_skill)
                 skill_scores[job_skill] = 1.0
             else:
-                # Partial match (simple similarity)
+                # Partial match (word Jaccard); only resume skills sharing a word can score
                 best_match_score = 0
-                for resume_skill in request.resume_skills:
-                    # Simple similarity based on common words
-                    job_words = set(job_skill_lower.split())
-                    resume_words = set(resume_skill.lower().split())
-                    
-                    if job_words and resume_words:
-                        similarity = len(job_words.intersection(resume_words)) / len(job_words.union(resume_words))
-                        best_match_score = max(best_match_score, similarity)
-                
-                if best_match_score > 0.5:  # Threshold for partial match
+                job_words = canonicalizer.words(job_skill)
+                for skill_id in set().union(*(skills_by_word.get(word, ()) for word in job_words)):
+                    words = resume_words[skill_id]
+                    best_match_score = max(best_match_score, len(job_words & words) / len(job_words | words))
+
+                if best_match_score <= 0.5:  # Threshold for partial match
+                    best_match_score = 0
+                if semantic_scores is not None and semantic_scores[job_skill] >= SEMANTIC_MATCH_THRESHOLD:
+                    best_match_score = max(best_match_score, float(semantic_scores[job_skill]))
+
+                if best_match_score > 0:
                     matched_skills.append(job_skill)
                     skill_scores[job_skill] = best_match_score
                 else:
@@ -695,14 +1395,128 @@ async def match_skills(request: SkillsMatchRequest):
             skill_scores=skill_scores
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error matching skills: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to match skills: {str(e)}")
 
+def _encode_with_taxonomy(skills: List[str]) -> Dict[str, np.ndarray]:
+    # The first semantic request after a (re)load indexes the taxonomy so later lookups skip the model
+    taxonomy = taxonomy_store.current
+    if skill_embedder.taxonomy_version != taxonomy.version:
+        skill_embedder.index_taxonomy(taxonomy.names, version=taxonomy.version)
+    return skill_embedder.encode(skills)
+
+async def encode_skills(skills: List[str]) -> Dict[str, np.ndarray]:
+    """Encode skills off the event loop; model inference releases the GIL"""
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, _encode_with_taxonomy, skills)
+    except SemanticUnavailableError as e:
+        raise HTTPException(status_code=503, detail=f"Semantic matching unavailable: {str(e)}")
+
+def skill_vectors(vectors: Dict[str, np.ndarray], skills: List[str]) -> np.ndarray:
+    return np.stack([vectors[normalize_skill(skill)] for skill in skills]) if skills else np.zeros((0, 0))
+
+@app.get("/skills/nearest")
+async def nearest_skills(skill: str, k: int = 5):
+    """Closest taxonomy skills to a free-text skill, by embedding similarity"""
+    await encode_skills([skill])
+    neighbours = skill_embedder.nearest_taxonomy([skill], k=min(max(k, 1), 50))[skill]
+    return {"skill": skill, "nearest": [{"name": name, "similarity": similarity} for name, similarity in neighbours]}
+
+@app.post("/match-skills-bulk", response_model=BulkSkillsMatchResponse)
+async def match_skills_bulk(request: BulkSkillsMatchRequest):
+    """Score every resume against every job and return the top matches per row"""
+    try:
+        by_job = request.rank == "resumes"
+        resumes = [profile.skills for profile in request.resumes]
+        jobs = [profile.skills for profile in request.jobs]
+
+        # The model lives in this process; the pool only receives the vectors
+        semantic_vectors = None
+        if request.mode == "semantic":
+            semantic_vectors = await encode_skills([skill for skills in resumes + jobs for skill in skills])
+
+        # Canonical spellings are resolved here, where the taxonomy and its memo cache live
+        canonical = {skill: canonical_skill(skill) for skills in resumes + jobs for skill in skills}
+        rankings = await parse_executor.run(
+            rank_matches, resumes, jobs, request.top_k, by_job, semantic_vectors, canonical
+        )
+
+        rows, candidates = (request.jobs, request.resumes) if by_job else (request.resumes, request.jobs)
+        return BulkSkillsMatchResponse(rankings=[
+            BulkMatchRanking(
+                id=row.id,
+                matches=[RankedMatch(id=candidates[index].id, match=SkillsMatchResponse(**match)) for index, match in best],
+            )
+            for row, best in zip(rows, rankings)
+        ])
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error matching skills in bulk: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to match skills: {str(e)}")
+
+@app.post("/candidates/index")
+async def index_candidates(request: CandidateIndexRequest):
+    """Add or replace candidates' skills in the candidate index"""
+    def upsert() -> Dict[str, Any]:
+        for candidate in request.candidates:
+            candidate_index.upsert(candidate.id, candidate.skills)
+        return candidate_index.stats()
+
+    # Index calls wait on the index lock and file lock, so they run off the event loop
+    stats = await asyncio.get_running_loop().run_in_executor(None, upsert)
+    return {"indexed": len(request.candidates), **stats}
+
+@app.delete("/candidates/index/{candidate_id}")
+async def remove_candidate(candidate_id: str):
+    """Remove a candidate from the candidate index"""
+    def delete() -> Dict[str, Any]:
+        candidate_index.delete(candidate_id)
+        return candidate_index.stats()
+
+    return {"removed": candidate_id, **await asyncio.get_running_loop().run_in_executor(None, delete)}
+
+@app.post("/candidates/index/snapshot")
+async def snapshot_candidate_index():
+    """Fold pending index changes into a new memory-mapped snapshot"""
+    def snapshot() -> Dict[str, Any]:
+        return {"generation": candidate_index.snapshot(), **candidate_index.stats()}
+
+    return await asyncio.get_running_loop().run_in_executor(None, snapshot)
+
+@app.post("/candidates/search", response_model=CandidateSearchResponse)
+async def search_candidates(request: CandidateSearchRequest):
+    """Return the top-k indexed candidates for a job's skills"""
+    candidates = await asyncio.get_running_loop().run_in_executor(
+        None, candidate_index.search, request.job_skills, request.top_k
+    )
+    return CandidateSearchResponse(candidates=candidates)
+
 @app.get("/skills-database")
-async def get_skills_database():
+async def get_skills_database(if_none_match: Optional[str] = Header(None)):
     """Get the skills database"""
-    return SKILLS_DATABASE
+    taxonomy = taxonomy_store.current
+    # Clients revalidate with If-None-Match and get 304 until the taxonomy is reloaded with changes
+    headers = {"ETag": f'"{taxonomy.version}"', "Cache-Control": "no-cache"}
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or headers["ETag"] in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=taxonomy.categories_json, media_type="application/json", headers=headers)
+
+@app.post("/admin/taxonomy/reload")
+async def reload_taxonomy_endpoint(x_admin_token: Optional[str] = Header(None)):
+    """Reload the skills taxonomy file in this worker"""
+    require_admin(x_admin_token)
+    try:
+        taxonomy, changed = await reload_taxonomy()
+    except TaxonomyError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"changed": changed, **taxonomy.stats()}
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,136 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import REGISTRY, multiprocess
+
+# With several uvicorn/gunicorn workers, point PROMETHEUS_MULTIPROC_DIR at an empty
+# directory shared by them so /metrics reports the whole service, not one worker
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REQUEST_SECONDS = Histogram(
+    "resuchain_http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "resuchain_parse_stage_duration_seconds", "Time spent in each parsing stage", ["stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+DOCUMENT_BYTES = Histogram(
+    "resuchain_document_bytes", "Size of uploaded documents", ["kind"],
+    buckets=(10e3, 50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6, 10e6, 25e6),
+)
+DOCUMENT_PAGES = Histogram(
+    "resuchain_document_pages", "Pages in uploaded PDFs", buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+)
+PARSE_CACHE_REQUESTS = Counter("resuchain_parse_cache_requests", "Parse cache lookups by outcome", ["result"])
+SECTION_RESULTS = Counter(
+    "resuchain_parse_section_results", "Section results of text parses, reused from the base document or parsed",
+    ["result"],
+)
+COALESCED_REQUESTS = Counter(
+    "resuchain_parse_coalesced_requests", "Parse requests that shared a concurrent identical request's parse",
+    ["scope"],
+)
+NEAR_DUPLICATES = Counter(
+    "resuchain_near_duplicate_documents",
+    "Parsed uploads by near-duplicate outcome (reused: unchanged sections taken from the original's parse)",
+    ["result"],
+)
+PARSE_STAGE_TIMEOUTS = Counter(
+    "resuchain_parse_stage_timeouts", "Extraction stages given up on after the per-stage timeout", ["stage"],
+)
+PARSE_IN_FLIGHT = Gauge("resuchain_parse_in_flight", "Parses running or waiting for the pool", multiprocess_mode="livesum")
+PARSE_JOBS = Gauge("resuchain_parse_jobs", "Parse jobs by status", ["status"], multiprocess_mode="livemostrecent")
+
+
+class StageTimer:
+    """Per-document stage durations (seconds) and counters, mergeable across pool tasks"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def merge(self, timings: Dict[str, float], counts: Dict[str, int]) -> None:
+        for name, seconds in timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for name, value in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def server_timing(self) -> str:
+        """Render as a Server-Timing header value, in milliseconds"""
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.timings.items())
+
+
+# The timer of the document being parsed in this task or pool worker, if any
+_current_timer: ContextVar[Optional[StageTimer]] = ContextVar("current_timer", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as a named stage of the current document"""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.merge({name: time.perf_counter() - started}, {})
+
+
+def count(name: str, value: int) -> None:
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.merge({}, {name: value})
+
+
+def current_timings() -> Dict[str, float]:
+    """Stage durations recorded so far for the current document"""
+    timer = _current_timer.get()
+    return dict(timer.timings) if timer is not None else {}
+
+
+def run_timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, float], Dict[str, int]]:
+    """Run fn(*args) with a fresh stage timer; used on the parse pool, so timings travel back with the result"""
+    timer = StageTimer()
+    token = _current_timer.set(timer)
+    try:
+        result = fn(*args)
+    finally:
+        _current_timer.reset(token)
+    return result, timer.timings, timer.counts
+
+
+def record(timings: Dict[str, float], counts: Dict[str, int]) -> None:
+    """Export stage timings from a pool task and add them to the current request's timer"""
+    for name, seconds in timings.items():
+        STAGE_SECONDS.labels(stage=name).observe(seconds)
+    if "pdf_pages" in counts:
+        DOCUMENT_PAGES.observe(counts["pdf_pages"])
+    for result in ("reused", "parsed"):
+        if f"sections_{result}" in counts:
+            SECTION_RESULTS.labels(result=result).inc(counts[f"sections_{result}"])
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.merge(timings, counts)
+
+
+def start_request_timer() -> StageTimer:
+    timer = StageTimer()
+    _current_timer.set(timer)
+    return timer
+
+
+def render() -> Tuple[bytes, str]:
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,109 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_IMPORTED_AT = time.monotonic()
+
+# Model loading settings, overridable per deployment. Names are comma-separated.
+MODEL_PRELOAD = os.getenv("MODEL_PRELOAD", "")  # loaded at import, so forked workers share the pages
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "")  # loaded in a background thread once the app has started
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+
+def model_names(setting: str) -> List[str]:
+    return [name.strip() for name in setting.split(",") if name.strip()]
+
+
+def process_uptime() -> float:
+    """Seconds since this process started; falls back to the time since this module was imported"""
+    try:
+        with open("/proc/self/stat") as stat, open("/proc/uptime") as uptime:
+            # The command name may contain spaces, so fields are counted after its closing ")"
+            started_ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+            return float(uptime.read().split()[0]) - started_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return time.monotonic() - _IMPORTED_AT
+
+
+class ModelRegistry:
+    """Named model loaders, each run at most once on first use"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str) -> Any:
+        """Return the model, loading it on first use; concurrent callers wait for one load"""
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._locks[name]:
+            if name not in self._models:
+                started = time.perf_counter()
+                try:
+                    model = self._loaders[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._load_seconds[name] = round(time.perf_counter() - started, 3)
+                self._errors.pop(name, None)
+                self._models[name] = model
+                logger.info(f"Loaded model {name} in {self._load_seconds[name]}s")
+        return self._models[name]
+
+    def preload(self, names: Iterable[str]) -> None:
+        """Load models now, in the calling thread"""
+        for name in names:
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"Failed to load model {name}: {e}")
+
+    def warm_up(self, names: Iterable[str]) -> Optional[threading.Thread]:
+        """Load models in a daemon thread so requests are served while they load"""
+        pending = [name for name in names if not self.is_loaded(name)]
+        if not pending:
+            return None
+        thread = threading.Thread(target=self.preload, args=(pending,), name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "loaded": name in self._models,
+                "load_seconds": self._load_seconds.get(name),
+                "error": self._errors.get(name),
+            }
+            for name in self._loaders
+        }
+
+
+def load_spacy() -> Any:
+    """spaCy pipeline, or None when the model package is not installed"""
+    import spacy
+
+    try:
+        return spacy.load(SPACY_MODEL)
+    except OSError:
+        logger.warning(f"spaCy model not found. Install with: python -m spacy download {SPACY_MODEL}")
+        return None
+
+
+model_registry = ModelRegistry()
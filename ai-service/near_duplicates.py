@@ -0,0 +1,184 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Near-duplicate detection settings, overridable per deployment
+NEAR_DUPLICATE_INDEX_PATH = os.getenv("NEAR_DUPLICATE_INDEX_PATH", "")  # SQLite file; empty keeps the index in memory only
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))  # estimated Jaccard to join a cluster
+NEAR_DUPLICATE_REUSE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_REUSE_THRESHOLD", "0.95"))  # ... to reuse its unchanged sections
+NEAR_DUPLICATE_MAX_DOCUMENTS = int(os.getenv("NEAR_DUPLICATE_MAX_DOCUMENTS", "100000"))
+
+# Word 3-gram shingles and 128 MinHash permutations split into 16 LSH bands of 8 rows:
+# documents 80% alike share a band 95% of the time, documents 50% alike 6% of the time
+SHINGLE_WORDS = 3
+PERMUTATIONS = 128
+BANDS = 16
+
+_ROWS = PERMUTATIONS // BANDS
+# Permutations are a*x + b mod the largest prime below 2**32: with x, a and b all below
+# the prime, a*x + b stays under 2**64 and the uint64 arithmetic is exact
+_PRIME = np.uint64(4294967291)
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, int(_PRIME), size=PERMUTATIONS, dtype=np.uint64)
+_B = _rng.randint(0, int(_PRIME), size=PERMUTATIONS, dtype=np.uint64)
+
+_WORD = re.compile(r"\w+")
+# Most band-sharing documents compared exactly per lookup, so a popular template costs the same as a rare one
+_MAX_CANDIDATES = 64
+# How many inserts between evictions of the oldest documents
+_PRUNE_INTERVAL = 256
+
+
+class DocumentSignature(NamedTuple):
+    # SHA-256 of the document's words, equal for copies that only differ in layout or case
+    fingerprint: str
+    minhash: np.ndarray
+
+
+class DuplicateMatch(NamedTuple):
+    # SHA-256 of the earlier document's extracted text, which keys its cached parse
+    text_digest: str
+    similarity: float
+
+
+def signature(text: str) -> Optional[DocumentSignature]:
+    """MinHash of a document's word shingles; None when it has no words"""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return None
+    with metrics.stage("minhash"):
+        hashes = np.array([zlib.crc32(word.encode()) for word in words], dtype=np.uint64)
+        if len(hashes) >= SHINGLE_WORDS:
+            # Rolling combination of each run of SHINGLE_WORDS word hashes, kept to 32 bits
+            shingles = hashes[:len(hashes) - SHINGLE_WORDS + 1].copy()
+            for offset in range(1, SHINGLE_WORDS):
+                shingles = shingles * np.uint64(1000003) + hashes[offset:len(hashes) - SHINGLE_WORDS + 1 + offset]
+            hashes = shingles & np.uint64(0xFFFFFFFF)
+        hashes = np.unique(hashes % _PRIME)
+        minhash = ((hashes[:, None] * _A + _B) % _PRIME).min(axis=0).astype(np.uint32)
+    return DocumentSignature(hashlib.sha256(" ".join(words).encode()).hexdigest(), minhash)
+
+
+def band_buckets(minhash: np.ndarray) -> List[int]:
+    """LSH bucket of each band, as signed 64-bit SQLite integers"""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(bytes([band]) + minhash[band * _ROWS:(band + 1) * _ROWS].tobytes(), digest_size=8).digest(),
+            "big", signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+class NearDuplicateIndex:
+    """LSH index of document MinHashes that groups copied and templated resumes into clusters.
+
+    Only documents sharing at least one band bucket with a new document are compared,
+    so a lookup costs the same with a thousand documents indexed as with a million.
+    With a path the index is a SQLite file shared by every worker.
+    """
+
+    def __init__(
+        self,
+        path: str = NEAR_DUPLICATE_INDEX_PATH,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        max_documents: int = NEAR_DUPLICATE_MAX_DOCUMENTS,
+    ):
+        self.threshold = threshold
+        self.max_documents = max_documents
+        self._lock = threading.Lock()
+        self._db = self._open(path) if path else None
+        if self._db is None:
+            self._db = self._open(":memory:")
+
+    def _open(self, path: str) -> Optional[sqlite3.Connection]:
+        try:
+            db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+            if path != ":memory:":
+                # WAL lets every uvicorn worker read while one of them writes
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, fingerprint TEXT NOT NULL, text_digest TEXT NOT NULL, "
+                "cluster TEXT NOT NULL, minhash BLOB NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS documents_fingerprint ON documents (fingerprint)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS bands ("
+                "bucket INTEGER NOT NULL, document INTEGER NOT NULL, PRIMARY KEY (bucket, document)) WITHOUT ROWID"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS bands_document ON bands (document)")
+            return db
+        except sqlite3.Error as e:
+            logger.error(f"Keeping the near-duplicate index at {path} in memory: {e}")
+            return None
+
+    def assign(self, text_digest: str, document: DocumentSignature) -> Tuple[str, Optional[DuplicateMatch]]:
+        """Add a document to the index; returns its cluster id and the closest earlier document in that cluster"""
+        buckets = band_buckets(document.minhash)
+        with self._lock:
+            # One write transaction, so two workers indexing copies of a new document agree on its cluster
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                cluster, match = self._closest(document, buckets)
+                if match is not None and match.similarity == 1.0:
+                    # Exact copies (and copies with an identical signature) are not indexed again
+                    self._db.execute("COMMIT")
+                    return cluster, match
+                if cluster is None:
+                    cluster = document.fingerprint[:16]
+                row = self._db.execute(
+                    "INSERT INTO documents (fingerprint, text_digest, cluster, minhash) VALUES (?, ?, ?, ?)",
+                    (document.fingerprint, text_digest, cluster, document.minhash.tobytes()),
+                )
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO bands (bucket, document) VALUES (?, ?)",
+                    [(bucket, row.lastrowid) for bucket in buckets],
+                )
+                if row.lastrowid % _PRUNE_INTERVAL == 0:
+                    self._prune(row.lastrowid)
+                self._db.execute("COMMIT")
+            except sqlite3.Error:
+                self._db.execute("ROLLBACK")
+                raise
+        return cluster, match
+
+    def _closest(self, document: DocumentSignature, buckets: List[int]) -> Tuple[Optional[str], Optional[DuplicateMatch]]:
+        row = self._db.execute(
+            "SELECT cluster, text_digest FROM documents WHERE fingerprint = ? ORDER BY id LIMIT 1", (document.fingerprint,)
+        ).fetchone()
+        if row is not None:
+            return row[0], DuplicateMatch(row[1], 1.0)
+
+        placeholders = ",".join("?" * len(buckets))
+        rows = self._db.execute(
+            f"SELECT d.cluster, d.text_digest, d.minhash FROM documents d JOIN ("
+            f"SELECT document, COUNT(*) AS shared FROM bands WHERE bucket IN ({placeholders}) "
+            f"GROUP BY document ORDER BY shared DESC, document LIMIT ?) c ON c.document = d.id ORDER BY d.id",
+            [*buckets, _MAX_CANDIDATES],
+        ).fetchall()
+        best: Optional[Tuple[str, DuplicateMatch]] = None
+        for cluster, text_digest, blob in rows:
+            similarity = float(np.mean(np.frombuffer(blob, dtype=np.uint32) == document.minhash))
+            if similarity >= self.threshold and (best is None or similarity > best[1].similarity):
+                best = cluster, DuplicateMatch(text_digest, round(similarity, 4))
+        return best if best is not None else (None, None)
+
+    def _prune(self, last_id: int) -> None:
+        """Forget the oldest documents beyond max_documents"""
+        cutoff = last_id - self.max_documents
+        if cutoff > 0:
+            self._db.execute("DELETE FROM bands WHERE document <= ?", (cutoff,))
+            self._db.execute("DELETE FROM documents WHERE id <= ?", (cutoff,))
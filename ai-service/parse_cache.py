@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Cache settings, overridable per deployment
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "1024"))
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PARSE_CACHE_TTL_SECONDS = float(os.getenv("PARSE_CACHE_TTL_SECONDS", "86400"))
+PARSE_CACHE_PATH = os.getenv("PARSE_CACHE_PATH", "")  # SQLite file; empty disables the disk tier
+
+# How many writes between sweeps of expired rows in the disk tier
+_DISK_PRUNE_INTERVAL = 256
+
+
+class ParseCache:
+    """Content-addressed cache of parse results: in-memory LRU plus optional SQLite tier"""
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = PARSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = PARSE_CACHE_MAX_BYTES,
+        ttl: float = PARSE_CACHE_TTL_SECONDS,
+        path: str = PARSE_CACHE_PATH,
+    ):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # SQLite waits up to 5s on other workers' writes, so the disk tier has a lock of its
+        # own and memory lookups never queue behind it
+        self._disk_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+        if path:
+            self._open_disk_tier()
+
+    def _open_disk_tier(self) -> None:
+        try:
+            # WAL lets every uvicorn worker read while one of them writes
+            self._db = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._prune_disk()
+        except sqlite3.Error as e:
+            logger.error(f"Disabling on-disk parse cache at {self.path}: {e}")
+            self._db = None
+
+    def _prune_disk(self) -> None:
+        """Drop rows from older extractor/taxonomy versions and rows past their TTL"""
+        self._db.execute(
+            "DELETE FROM parse_cache WHERE namespace != ? OR expires_at < ?",
+            (self.namespace, time.time()),
+        )
+
+    def set_namespace(self, namespace: str) -> None:
+        """Switch to a new extractor/taxonomy version; older entries become unreachable.
+
+        Their rows in the disk tier are deleted by the next periodic prune, so the switch
+        itself never waits on SQLite.
+        """
+        with self._lock:
+            if namespace == self.namespace:
+                return
+            self.namespace = namespace
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def key(self, kind: str, payload: bytes) -> str:
+        return self.digest_key(kind, hashlib.sha256(payload).hexdigest())
+
+    def digest_key(self, kind: str, digest: str) -> str:
+        """Key for content whose SHA-256 hex digest is already known"""
+        return f"{self.namespace}:{kind}:{digest}"
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Return (value, tier) where tier is "memory", "disk" or None on a miss"""
+        value = self._get_memory(key)
+        if value is not None:
+            return value, "memory"
+        return self._get_disk(key)
+
+    async def fetch(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """get() for the event loop: memory hits return at once, disk reads run in the default executor"""
+        value = self._get_memory(key)
+        if value is not None:
+            return value, "memory"
+        if self._db is None:
+            return self._get_disk(key)
+        return await asyncio.get_running_loop().run_in_executor(None, self._get_disk, key)
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                self._evict(key)
+                return None
+            self._memory.move_to_end(key)
+            self.hits += 1
+        return orjson.loads(value)
+
+    def _get_disk(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        row = None
+        if self._db is not None:
+            try:
+                with self._disk_lock:
+                    row = self._db.execute("SELECT value, expires_at FROM parse_cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Parse cache read failed: {e}")
+        with self._lock:
+            if row is None or row[1] < time.time():
+                self.misses += 1
+                return None, None
+            self._remember(key, row[0], row[1])
+            self.hits += 1
+        return orjson.loads(row[0]), "disk"
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        serialized, expires_at = self._put_memory(key, value)
+        self._put_disk(key, serialized, expires_at)
+
+    async def store(self, key: str, value: Dict[str, Any]) -> None:
+        """put() for the event loop: the disk write runs in the default executor"""
+        serialized, expires_at = self._put_memory(key, value)
+        if self._db is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._put_disk, key, serialized, expires_at)
+
+    def _put_memory(self, key: str, value: Dict[str, Any]) -> Tuple[bytes, float]:
+        # orjson also serializes the slotted entries of fresh parse results
+        serialized = orjson.dumps(value)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, serialized, expires_at)
+        return serialized, expires_at
+
+    def _put_disk(self, key: str, serialized: bytes, expires_at: float) -> None:
+        if self._db is None:
+            return
+        try:
+            with self._disk_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO parse_cache (key, namespace, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, key.split(":", 1)[0], serialized, expires_at),
+                )
+                self._writes += 1
+                if self._writes % _DISK_PRUNE_INTERVAL == 0:
+                    self._prune_disk()
+        except sqlite3.Error as e:
+            logger.warning(f"Parse cache write failed: {e}")
+
+    def _remember(self, key: str, serialized: bytes, expires_at: float) -> None:
+        size = len(serialized)
+        if size > self.max_bytes:
+            return
+        self._evict(key)
+        self._memory[key] = (expires_at, serialized)
+        self._memory_bytes += size
+        while self._memory and (len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes):
+            oldest = next(iter(self._memory))
+            self._evict(oldest)
+
+    def _evict(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[1])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._memory),
+            "bytes": self._memory_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk": self._db is not None,
+        }
@@ -0,0 +1,41 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+
+class Entry(Mapping):
+    """Read-only mapping view of a slotted result entry, so code written for the old dicts keeps working"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__dataclass_fields__)
+
+    def __len__(self) -> int:
+        return len(self.__dataclass_fields__)
+
+
+# Slotted dataclasses: no per-entry __dict__, and orjson serializes them without building one.
+# eq=False keeps Mapping equality, so entries compare equal to the dicts they replace.
+
+@dataclass(eq=False)
+class Skill(Entry):
+    __slots__ = ("name", "category", "level")
+    name: str
+    category: str
+    level: int
+
+
+@dataclass(eq=False)
+class Certificate(Entry):
+    __slots__ = ("name", "issuer", "certificateId", "date")
+    name: str
+    issuer: str
+    certificateId: str
+    date: str
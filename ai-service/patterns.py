@@ -0,0 +1,121 @@
+import re
+
+# Compiled once at import and shared by every extractor. Quantifiers that used to be
+# unbounded are capped, and character-run patterns only start at the beginning of a
+# run, so every pattern here runs in time linear in the text it scans.
+
+# Personal info
+EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Za-z]{2,24}\b')
+PHONE = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4,5}')
+PHONE_JUNK = re.compile(r'[^\d+\-\s\(\)]')
+LINKEDIN_PROFILE = re.compile(
+    r'(?:linkedin\.com/in/|linkedin\.com/profile/view\?id=|linkedin\.com/pub/)([a-zA-Z0-9_-]+)', re.IGNORECASE
+)
+LINKEDIN_URL = re.compile(r'linkedin\.com/[^\s\n]+', re.IGNORECASE)
+GITHUB_PROFILE = re.compile(r'(?:github\.com/)([a-zA-Z0-9_-]+)', re.IGNORECASE)
+GITHUB_URL = re.compile(r'github\.com/[^\s\n]+', re.IGNORECASE)
+NAME_REJECT = re.compile(r'[@\d]')
+NAME_LINE = re.compile(r'^[A-Za-z\s\-\.\']+$')
+LOCATION = re.compile(r'([A-Z][a-z]+,\s*[A-Z][a-z]+)|([A-Z][a-z]+\s*,\s*[A-Z]{2})')
+
+# Experience
+JOB_TITLE = re.compile(
+    r'(software engineer|developer|manager|analyst|consultant|architect|specialist|lead|senior|junior|intern)',
+    re.IGNORECASE,
+)
+EXPERIENCE_ENTRY_SPLIT = re.compile(
+    r'\n\s*\n|\n(?=\d{1,2}/\d{4}|\d{4}\s*[-–]\s*\d{4}|\d{4}\s*[-–]\s*present|\d{4}\s*[-–]\s*current)'
+)
+POSITION = re.compile(
+    r'(software engineer|senior developer|full stack developer|frontend developer|backend developer|'
+    r'devops engineer|data scientist|product manager|project manager|team lead|technical lead|'
+    r'engineering manager|software architect|system analyst|business analyst|qa engineer|'
+    r'automation engineer|database administrator|cloud engineer|security engineer)',
+    re.IGNORECASE,
+)
+COMPANY = re.compile(
+    r'(.{2,30}?)\s{0,20}(?:(pvt\.?\s*ltd\.?|ltd\.?|inc\.?|corp\.?|corporation|llc|technologies|systems|'
+    r'solutions|software|services|consulting|labs)|•|\|)',
+    re.IGNORECASE,
+)
+# Company names and the whitespace around them are capped so a long run without a
+# terminator cannot make every "at"/"for" in the entry scan to the end of the text
+COMPANY_FALLBACKS = [
+    re.compile(r'\bat\s{1,20}([A-Za-z\s&]{1,40}?)(?:\s{0,20}\(|\s{0,20}\d|\s{0,20}$)', re.IGNORECASE),
+    re.compile(r'\(([A-Za-z\s&]{1,40}?)\)', re.IGNORECASE),
+    re.compile(r'\bfor\s{1,20}([A-Za-z\s&]{1,40}?)(?:\s{0,20}\(|\s{0,20}\d|\s{0,20}$)', re.IGNORECASE),
+]
+DURATIONS = [
+    re.compile(r'(\d{1,2}/\d{4})\s*[-–]\s*(\d{1,2}/\d{4}|present|current)', re.IGNORECASE),
+    re.compile(r'(\d{4})\s*[-–]\s*(\d{4}|present|current)', re.IGNORECASE),
+    re.compile(
+        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{4})\s*[-–]\s*'
+        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|\d{4}|present|current)',
+        re.IGNORECASE,
+    ),
+]
+WHITESPACE = re.compile(r'\s+')
+
+# Education
+DEGREES = [
+    re.compile(r'(bachelor|master|phd|doctorate|b\.?tech|m\.?tech|b\.?sc|m\.?sc|mba|bba)', re.IGNORECASE),
+    re.compile(r'(b\.?e\.?|m\.?e\.?|b\.?com|m\.?com)', re.IGNORECASE),
+]
+YEAR = re.compile(r'20\d{2}|19\d{2}')
+
+# Certificates. ID patterns start only where a letter run starts; otherwise a long
+# run of letters is re-scanned from every position inside it.
+CERTIFICATES = [
+    # AWS certifications
+    re.compile(
+        r'(aws certified (cloud architect|developer|sysops administrator|solutions architect|devops engineer|'
+        r'data analytics|machine learning|security))',
+        re.IGNORECASE,
+    ),
+    re.compile(r'(aws-[a-zA-Z0-9-]+)', re.IGNORECASE),
+
+    # Microsoft certifications
+    re.compile(r'(microsoft certified:? (azure|office|windows|sql|visual studio|dynamics))', re.IGNORECASE),
+    re.compile(r'(mcsa|mcsd|mcse|mcp|mos)-?[a-zA-Z0-9-]*', re.IGNORECASE),
+
+    # Google Cloud certifications
+    re.compile(
+        r'(google cloud (professional cloud architect|professional data engineer|professional cloud developer|'
+        r'associate cloud engineer))',
+        re.IGNORECASE,
+    ),
+    re.compile(r'(gcp-[a-zA-Z0-9-]+)', re.IGNORECASE),
+
+    # Cisco certifications
+    re.compile(
+        r'(cisco certified (network associate|network professional|design associate|security professional))',
+        re.IGNORECASE,
+    ),
+    re.compile(r'(ccna|ccnp|ccie|ccda|ccdp)-?[a-zA-Z0-9-]*', re.IGNORECASE),
+
+    # Other common certifications
+    re.compile(
+        r'(pmp|scrum master|csm|cspo|safe|itil|cissp|cisa|cism|ceh|comp tia|oracle certified)', re.IGNORECASE
+    ),
+    re.compile(r'(certified (kubernetes administrator|docker|jenkins|terraform|ansible))', re.IGNORECASE),
+
+    # Generic certificate with ID pattern
+    re.compile(r'(?<![A-Za-z])([A-Z]{2,}-[A-Z0-9-]+|[A-Z]{3,}\d+|[A-Z]{2,}\s*\d{4,})', re.IGNORECASE),
+]
+CERTIFICATE_IDS_IN_CONTEXT = [
+    re.compile(r'(?<![A-Za-z])([A-Z]{2,}-[A-Z0-9-]+)', re.IGNORECASE),
+    re.compile(r'(?<![A-Za-z])([A-Z]{3,}\d+)', re.IGNORECASE),
+    re.compile(r'(ID|Certificate|Cert|License):\s*([A-Z0-9-]+)', re.IGNORECASE),
+    re.compile(r'#([A-Z0-9-]+)', re.IGNORECASE),
+]
+CERTIFICATE_IDS_IN_LINE = [
+    re.compile(r'(?<![A-Za-z])([A-Z]{2,}-[A-Z0-9-]+)', re.IGNORECASE),
+    re.compile(r'(?<![A-Za-z])([A-Z]{3,}\d+)', re.IGNORECASE),
+    re.compile(r'#([A-Z0-9-]+)', re.IGNORECASE),
+    re.compile(r'(ID|Certificate|Cert):\s*([A-Z0-9-]+)', re.IGNORECASE),
+]
+DATES = [
+    re.compile(r'20\d{2}', re.IGNORECASE),
+    re.compile(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+20\d{2}', re.IGNORECASE),
+    re.compile(r'\d{1,2}/\d{4}', re.IGNORECASE),
+]
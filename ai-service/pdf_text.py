@@ -0,0 +1,92 @@
+import logging
+import os
+from typing import Iterator, List, Tuple
+
+import PyPDF2
+
+import metrics
+import patterns
+from sections import segment
+from uploads import DocumentSource, open_document
+
+logger = logging.getLogger(__name__)
+
+# PDF extraction settings, overridable per deployment
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "10"))
+PDF_EARLY_EXIT = os.getenv("PDF_EARLY_EXIT", "false").lower() in ("1", "true", "yes")
+
+
+def count_pages(source: DocumentSource) -> int:
+    with open_document(source) as stream:
+        return len(PyPDF2.PdfReader(stream).pages)
+
+
+def iter_page_text(source: DocumentSource, start: int = 0, stop: int = PDF_MAX_PAGES) -> Iterator[str]:
+    """Yield the text of pages [start, stop), one page at a time"""
+    with open_document(source) as stream:
+        reader = PyPDF2.PdfReader(stream)
+        total = len(reader.pages)
+        if start == 0:
+            metrics.count("pdf_pages", total)
+        if stop == PDF_MAX_PAGES and stop < total:
+            logger.warning(f"PDF has {total} pages, extracting only the first {stop}")
+        for number in range(start, min(stop, total)):
+            yield (reader.pages[number].extract_text() or "") + "\n"
+
+
+def extract_pages(source: DocumentSource, start: int, stop: int, max_chars: int) -> str:
+    """Text of pages [start, stop), stopping early once max_chars have been read"""
+    pages, size = [], 0
+    for page in iter_page_text(source, start, stop):
+        pages.append(page)
+        size += len(page)
+        if size >= max_chars:
+            break
+    return "".join(pages)
+
+
+class _ProfileProgress:
+    """Tracks whether the contact details and the whole skills section have been seen"""
+
+    def __init__(self):
+        self.contact = False
+        self.in_skills = False
+        self.skills_done = False
+
+    def update(self, page: str) -> bool:
+        if not self.contact:
+            self.contact = bool(patterns.EMAIL.search(page) or patterns.PHONE.search(page))
+        for section in segment(page).sections:
+            if section.name == "skills":
+                self.in_skills = True
+            elif self.in_skills:
+                # The next heading closes the skills section
+                self.skills_done = True
+        return self.contact and self.skills_done
+
+
+def extract_text(source: DocumentSource, max_pages: int, max_chars: int, early_exit: bool = PDF_EARLY_EXIT) -> str:
+    """Text of the first max_pages pages; early_exit stops once contact details and skills are complete"""
+    if not early_exit:
+        return extract_pages(source, 0, max_pages, max_chars)
+
+    pages, size, progress = [], 0, _ProfileProgress()
+    for page in iter_page_text(source, 0, max_pages):
+        pages.append(page)
+        size += len(page)
+        if size >= max_chars or progress.update(page):
+            break
+    return "".join(pages)
+
+
+def page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split pages into at most `parts` contiguous, near-equal ranges"""
+    parts = max(1, min(parts, page_count))
+    step, extra = divmod(page_count, parts)
+    ranges, start = [], 0
+    for part in range(parts):
+        stop = start + step + (1 if part < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
@@ -0,0 +1,226 @@
+import cProfile
+import hashlib
+import json
+import logging
+import marshal
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import patterns
+
+logger = logging.getLogger(__name__)
+
+# Shared secret for the /admin endpoints; empty disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Slow-document log: the SLOW_PARSE_LOG_SIZE slowest parses (at least
+# SLOW_PARSE_LOG_MIN_SECONDS each) are kept, anonymized, in SLOW_PARSE_LOG_DIR
+SLOW_PARSE_LOG_DIR = os.getenv("SLOW_PARSE_LOG_DIR", "")  # empty disables the log
+SLOW_PARSE_LOG_SIZE = int(os.getenv("SLOW_PARSE_LOG_SIZE", "20"))
+SLOW_PARSE_LOG_MIN_SECONDS = float(os.getenv("SLOW_PARSE_LOG_MIN_SECONDS", "0.05"))
+
+_WORD = re.compile(r"[^\W\d_]+")
+_ESCAPE = re.compile(r"\\.")
+
+# Set while profile_call runs, so profiled (and therefore slowed) parses stay out of the slow log
+_profiling: ContextVar[bool] = ContextVar("profiling", default=False)
+
+
+def compiled_patterns() -> Iterable[Tuple[str, "re.Pattern[str]"]]:
+    """(name, pattern) for every compiled regex in patterns.py, including those in lists"""
+    for name, value in vars(patterns).items():
+        if isinstance(value, re.Pattern):
+            yield name, value
+        elif isinstance(value, (list, tuple)):
+            for i, item in enumerate(value):
+                if isinstance(item, re.Pattern):
+                    yield f"{name}[{i}]", item
+
+
+def regex_labels() -> Dict[int, str]:
+    """Names of the compiled patterns in patterns.py, keyed by object id"""
+    return {id(pattern): name for name, pattern in compiled_patterns()}
+
+
+class StackProfiler:
+    """Deterministic profiler that sums self time per call stack, naming each regex a stack executes"""
+
+    def __init__(self, labels: Optional[Dict[int, str]] = None):
+        self.labels = regex_labels() if labels is None else labels
+        self.stacks: Dict[str, float] = defaultdict(float)
+        self._stack: List[str] = []
+        self._last = 0.0
+
+    def _c_frame(self, fn: Any) -> str:
+        owner = getattr(fn, "__self__", None)
+        if isinstance(owner, re.Pattern):
+            label = self.labels.get(id(owner)) or f"re:{owner.pattern[:60]}"
+            return f"regex {label}.{fn.__name__}"
+        return f"{getattr(fn, '__qualname__', repr(fn))} (builtin)"
+
+    def _callback(self, frame, event: str, arg: Any) -> None:
+        now = time.perf_counter()
+        if self._stack:
+            self.stacks[";".join(self._stack)] += now - self._last
+        if event == "call":
+            code = frame.f_code
+            self._stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        elif event == "c_call":
+            self._stack.append(self._c_frame(arg))
+        elif self._stack:
+            self._stack.pop()
+        # The profiler's own time is not charged to the stack
+        self._last = time.perf_counter()
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        self._last = time.perf_counter()
+        sys.setprofile(self._callback)
+        try:
+            return fn(*args)
+        finally:
+            sys.setprofile(None)
+
+    def collapsed(self) -> str:
+        """One "frame;frame;frame microseconds" line per stack, as flamegraph.pl and speedscope read"""
+        lines = []
+        for stack, seconds in sorted(self.stacks.items()):
+            micros = int(seconds * 1_000_000)
+            if micros:
+                lines.append(f"{stack.replace(chr(10), ' ')} {micros}")
+        return "\n".join(lines) + "\n"
+
+
+def profile_call(fn: Callable[..., Any], args: Tuple[Any, ...], output: str) -> Tuple[Any, bytes, float]:
+    """Run fn(*args) under a profiler; returns the result, the profile and the wall time"""
+    token = _profiling.set(True)
+    try:
+        return _profile(fn, args, output)
+    finally:
+        _profiling.reset(token)
+
+
+def _profile(fn: Callable[..., Any], args: Tuple[Any, ...], output: str) -> Tuple[Any, bytes, float]:
+    started = time.perf_counter()
+    if output == "pstats":
+        profiler = cProfile.Profile()
+        result = profiler.runcall(fn, *args)
+        elapsed = time.perf_counter() - started
+        profiler.create_stats()
+        # Same marshal layout as pstats.Stats.dump_stats, so pstats/snakeviz load it directly
+        return result, marshal.dumps(profiler.stats), elapsed
+
+    profiler = StackProfiler()
+    result = profiler.run(fn, *args)
+    return result, profiler.collapsed().encode(), time.perf_counter() - started
+
+
+def anonymize(text: str, keep: Set[str]) -> str:
+    """Mask personal data but keep the document's shape: letters become x/X and digits 9,
+    except for words in `keep` (section headings, skills) that steer the extractors"""
+
+    def mask(match: "re.Match[str]") -> str:
+        word = match.group(0)
+        if word.lower() in keep:
+            return word
+        return "".join("X" if c.isupper() else "x" for c in word)
+
+    return re.sub(r"\d", "9", _WORD.sub(mask, text))
+
+
+def vocabulary(phrases: Iterable[str]) -> Set[str]:
+    """Lower-cased words of the given phrases"""
+    return {word.lower() for phrase in phrases for word in _WORD.findall(phrase)}
+
+
+def pattern_vocabulary() -> Set[str]:
+    """Literal words the extractor regexes look for ("present", "university", month names, ...)"""
+    # Escapes such as \b and \d would otherwise glue onto the words beside them
+    literals = (_ESCAPE.sub(" ", pattern.pattern) for _, pattern in compiled_patterns())
+    return {word for word in vocabulary(literals) if len(word) > 1}
+
+
+class SlowParseLog:
+    """Keeps the N slowest parses as anonymized JSON files, shared by every process writing to the directory"""
+
+    def __init__(
+        self,
+        directory: str = SLOW_PARSE_LOG_DIR,
+        size: int = SLOW_PARSE_LOG_SIZE,
+        min_seconds: float = SLOW_PARSE_LOG_MIN_SECONDS,
+        keep: Optional[Set[str]] = None,
+    ):
+        self.directory = directory
+        self.size = size
+        self.min_seconds = min_seconds
+        self.keep = keep or set()
+        # Fastest duration still in the log once it is full; cheaper than listing the directory per parse
+        self._threshold = min_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.size > 0
+
+    def record(self, seconds: float, text: str, stages: Optional[Dict[str, float]] = None) -> None:
+        if not self.enabled or seconds < self._threshold or _profiling.get():
+            return
+        try:
+            with self._lock:
+                self._write(seconds, text, stages or {})
+        except OSError as e:
+            logger.error(f"Error writing slow parse log: {e}")
+
+    def _write(self, seconds: float, text: str, stages: Dict[str, float]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        digest = hashlib.sha256(text.encode()).hexdigest()[:16]
+        # Zero-padded microseconds first, so file names sort by duration
+        name = f"{int(seconds * 1_000_000):012d}-{digest}.json"
+        # A document parsed again is logged once, with its slowest time
+        for existing in os.listdir(self.directory):
+            if existing.endswith(f"-{digest}.json"):
+                if existing >= name:
+                    return
+                os.remove(os.path.join(self.directory, existing))
+        entry = {
+            "seconds": round(seconds, 6),
+            "stages": {stage: round(value, 6) for stage, value in stages.items()},
+            "chars": len(text),
+            "lines": text.count("\n") + 1,
+            "recorded_at": time.time(),
+            "text": anonymize(text, self.keep),
+        }
+        tmp_path = os.path.join(self.directory, f".{name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as out:
+            json.dump(entry, out)
+        os.replace(tmp_path, os.path.join(self.directory, name))
+
+        entries = sorted(name for name in os.listdir(self.directory) if name.endswith(".json"))
+        for stale in entries[:-self.size]:
+            try:
+                os.remove(os.path.join(self.directory, stale))
+            except FileNotFoundError:
+                pass  # another worker evicted it first
+        kept = entries[-self.size:]
+        if len(kept) >= self.size:
+            self._threshold = max(self.min_seconds, int(kept[0].split("-", 1)[0]) / 1_000_000)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Logged parses, slowest first"""
+        if not self.enabled or not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as source:
+                    entries.append({"id": name[:-len(".json")], **json.load(source)})
+            except (OSError, ValueError):
+                continue  # evicted while listing
+        return entries
@@ -0,0 +1,292 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+logger = logging.getLogger(__name__)
+
+# Export settings, overridable per deployment
+RESUME_EXPORT_DIR = os.getenv("RESUME_EXPORT_DIR", "")  # empty disables recording and export
+RESUME_EXPORT_FORMAT = os.getenv("RESUME_EXPORT_FORMAT", "parquet")  # "parquet" or "arrow" (Arrow IPC files)
+RESUME_EXPORT_BATCH_ROWS = int(os.getenv("RESUME_EXPORT_BATCH_ROWS", "5000"))  # staged resumes that trigger an export
+
+# Low-cardinality strings are dictionary-encoded, so a skill or issuer is stored once per file
+_DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+
+# One dataset per table, joined on document_id; personal details other than location are not exported
+SCHEMAS = {
+    "resumes": pa.schema([
+        ("document_id", pa.string()),
+        ("candidate_id", pa.string()),
+        ("source", _DICTIONARY),
+        ("duplicate_cluster", pa.string()),
+        ("ingested_at", pa.timestamp("ms", tz="UTC")),
+        ("location", _DICTIONARY),
+        ("skills", pa.int16()),
+        ("experience", pa.int16()),
+        ("education", pa.int16()),
+        ("certificates", pa.int16()),
+    ]),
+    "skills": pa.schema([
+        ("document_id", pa.string()),
+        ("skill", _DICTIONARY),
+        ("category", _DICTIONARY),
+        ("level", pa.int8()),
+    ]),
+    "experience": pa.schema([
+        ("document_id", pa.string()),
+        ("position", pa.string()),
+        ("company", _DICTIONARY),
+        ("duration", pa.string()),
+    ]),
+    "education": pa.schema([
+        ("document_id", pa.string()),
+        ("degree", _DICTIONARY),
+        ("institution", pa.string()),
+        ("year", pa.int16()),
+    ]),
+    "certificates": pa.schema([
+        ("document_id", pa.string()),
+        ("name", pa.string()),
+        ("issuer", _DICTIONARY),
+        ("certificate_id", pa.string()),
+        ("date", pa.string()),
+    ]),
+}
+
+# Entry fields of each list table, in schema order after document_id
+_ENTRY_FIELDS = {
+    "skills": ("name", "category", "level"),
+    "experience": ("position", "company", "duration"),
+    "education": ("degree", "institution", "year"),
+    "certificates": ("name", "issuer", "certificateId", "date"),
+}
+
+_PARTITIONING = ds.partitioning(pa.schema([("ingest_date", pa.date32())]), flavor="hive")
+
+_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _year(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ResumeExport:
+    """Parse results staged as NDJSON and exported in batches to date-partitioned Arrow/Parquet datasets.
+
+    Each process appends to its own staging file. When the file holds batch_rows resumes,
+    or on export(), it is sealed by renaming it; an export claims sealed files one at a
+    time, writes one part file per table and ingest date, and deletes them. Staging files
+    left by processes that died are sealed by the next export.
+    """
+
+    def __init__(self, directory: str = RESUME_EXPORT_DIR, fmt: str = RESUME_EXPORT_FORMAT, batch_rows: int = RESUME_EXPORT_BATCH_ROWS):
+        if fmt not in _EXTENSIONS:
+            raise ValueError(f"Unknown resume export format {fmt!r}")
+        self.directory = directory
+        self.format = fmt
+        self.batch_rows = batch_rows
+        self._path: Optional[str] = None
+        self._rows = 0
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        if directory:
+            os.makedirs(self.staging_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    @property
+    def staging_dir(self) -> str:
+        return os.path.join(self.directory, "staging")
+
+    def dataset_dir(self, table: str) -> str:
+        return os.path.join(self.directory, table)
+
+    def record(self, document_id: str, source: str, parsed: Dict[str, Any], candidate_id: Optional[str] = None) -> bool:
+        """Stage one parse result; returns True when a batch is full and export() should run"""
+        line = orjson.dumps({
+            "document_id": document_id,
+            "candidate_id": candidate_id,
+            "source": source,
+            "ingested_at": time.time(),
+            "duplicate_cluster": parsed.get("duplicate_cluster"),
+            "location": (parsed.get("personal_info") or {}).get("location"),
+            **{table: parsed.get(table) or [] for table in _ENTRY_FIELDS},
+        }) + b"\n"
+        with self._lock:
+            if self._path is None:
+                self._path = os.path.join(self.staging_dir, f"{os.getpid()}-{uuid.uuid4().hex}.ndjson")
+            with open(self._path, "ab") as out:
+                out.write(line)
+            self._rows += 1
+            if self._rows < self.batch_rows:
+                return False
+            self._seal()
+            return True
+
+    def seal(self) -> None:
+        """Close this process's staging file so the next export picks it up"""
+        with self._lock:
+            if self._path is not None:
+                self._seal()
+
+    def _seal(self) -> None:
+        name = os.path.basename(self._path).split("-", 1)[1]
+        os.replace(self._path, os.path.join(self.staging_dir, name[:-len(".ndjson")] + ".sealed"))
+        self._path = None
+        self._rows = 0
+
+    def _seal_orphans(self) -> None:
+        for name in os.listdir(self.staging_dir):
+            if not name.endswith((".ndjson", ".claimed")):
+                continue
+            pid, rest = name.split("-", 1)
+            path = os.path.join(self.staging_dir, name)
+            # Under the export lock nothing of this process is claimed, and its open file is self._path
+            if _pid_alive(int(pid)) and (int(pid) != os.getpid() or path == self._path):
+                continue
+            try:
+                os.replace(path, os.path.join(self.staging_dir, rest.rsplit(".", 1)[0] + ".sealed"))
+            except FileNotFoundError:
+                pass  # another process sealed it first
+
+    def export(self) -> Dict[str, int]:
+        """Seal this process's staging file and export every sealed file; returns rows written per table"""
+        written = {table: 0 for table in SCHEMAS}
+        if not self.enabled:
+            return written
+        self.seal()
+        with self._export_lock:
+            with self._lock:
+                self._seal_orphans()
+            for name in sorted(os.listdir(self.staging_dir)):
+                if not name.endswith(".sealed"):
+                    continue
+                claimed = os.path.join(self.staging_dir, f"{os.getpid()}-{name[:-len('.sealed')]}.claimed")
+                try:
+                    os.replace(os.path.join(self.staging_dir, name), claimed)
+                except FileNotFoundError:
+                    continue  # claimed by another process
+                for table, rows in self._export_file(claimed).items():
+                    written[table] += rows
+                os.remove(claimed)
+        return written
+
+    def _export_file(self, path: str) -> Dict[str, int]:
+        columns: Dict[str, Dict[str, List[Any]]] = {
+            table: {name: [] for name in schema.names + ["ingest_date"]} for table, schema in SCHEMAS.items()
+        }
+        with open(path) as source:
+            for number, line in enumerate(source, 1):
+                try:
+                    record = orjson.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping malformed line {number} of {path}")
+                    continue
+                ingested_at = datetime.fromtimestamp(record["ingested_at"], tz=timezone.utc)
+                resumes = columns["resumes"]
+                for name in ("document_id", "candidate_id", "source", "duplicate_cluster", "location"):
+                    resumes[name].append(record.get(name))
+                resumes["ingested_at"].append(ingested_at)
+                resumes["ingest_date"].append(ingested_at.date())
+                for table, fields in _ENTRY_FIELDS.items():
+                    entries = record.get(table) or []
+                    resumes[table].append(len(entries))
+                    target = columns[table]
+                    for entry in entries:
+                        target["document_id"].append(record["document_id"])
+                        target["ingest_date"].append(ingested_at.date())
+                        for column, field in zip(SCHEMAS[table].names[1:], fields):
+                            value = entry.get(field)
+                            target[column].append(_year(value) if column == "year" else value)
+
+        written = {}
+        batch = uuid.uuid4().hex
+        for table, schema in SCHEMAS.items():
+            data = pa.Table.from_pydict(columns[table], schema=schema.append(pa.field("ingest_date", pa.date32())))
+            written[table] = data.num_rows
+            if not data.num_rows:
+                continue
+            ds.write_dataset(
+                data,
+                self.dataset_dir(table),
+                format="parquet" if self.format == "parquet" else "ipc",
+                partitioning=_PARTITIONING,
+                basename_template=f"part-{batch}-{{i}}.{_EXTENSIONS[self.format]}",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+        return written
+
+    def load(self, table: str, columns: List[str], since: Optional[date] = None, until: Optional[date] = None) -> pa.Table:
+        """Exported rows of a table, limited to ingest dates in [since, until]"""
+        directory = self.dataset_dir(table)
+        schema = SCHEMAS[table].append(pa.field("ingest_date", pa.date32()))
+        if not os.path.isdir(directory):
+            return schema.empty_table().select(columns)
+        dataset = ds.dataset(
+            directory, schema=schema, format="parquet" if self.format == "parquet" else "ipc", partitioning=_PARTITIONING
+        )
+        condition = None
+        if since is not None:
+            condition = ds.field("ingest_date") >= pa.scalar(since, pa.date32())
+        if until is not None:
+            upper = ds.field("ingest_date") <= pa.scalar(until, pa.date32())
+            condition = upper if condition is None else condition & upper
+        # Each part file has its own dictionaries; grouping needs one per column
+        return dataset.to_table(columns=columns, filter=condition).unify_dictionaries()
+
+    def aggregates(self, since: Optional[date] = None, until: Optional[date] = None, top: int = 20) -> Dict[str, Any]:
+        """Skill frequency by category, certificate issuer counts and education-year histogram of exported resumes"""
+        resumes = self.load("resumes", ["document_id"], since, until)
+
+        skills = self.load("skills", ["document_id", "skill", "category"], since, until)
+        skill_counts = skills.group_by(["category", "skill"]).aggregate([("document_id", "count_distinct")])
+        # Grouped results are small, and Arrow cannot sort dictionary columns, so they are ranked in Python
+        by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for row in sorted(skill_counts.to_pylist(), key=lambda row: (row["category"] or "", -row["document_id_count_distinct"])):
+            ranked = by_category.setdefault(row["category"], [])
+            if len(ranked) < top:
+                ranked.append({"skill": row["skill"], "resumes": row["document_id_count_distinct"]})
+
+        # Every count is of distinct documents, so a resume exported more than once counts once
+        certificates = self.load("certificates", ["document_id", "issuer"], since, until)
+        issuers = certificates.group_by("issuer").aggregate([("document_id", "count_distinct")])
+        issuers = sorted(issuers.to_pylist(), key=lambda row: -row["document_id_count_distinct"])[:top]
+
+        education = self.load("education", ["document_id", "year"], since, until)
+        years = education.filter(pc.is_valid(education["year"]))
+        years = years.group_by("year").aggregate([("document_id", "count_distinct")]).sort_by("year")
+
+        return {
+            "resumes": pc.count_distinct(resumes["document_id"]).as_py(),
+            "skills_by_category": by_category,
+            "certificate_issuers": [
+                {"issuer": row["issuer"], "resumes": row["document_id_count_distinct"]} for row in issuers
+            ],
+            "education_years": [
+                {"year": row["year"], "resumes": row["document_id_count_distinct"]} for row in years.to_pylist()
+            ],
+        }
@@ -0,0 +1,77 @@
+import re
+from typing import Dict, List, NamedTuple
+
+# Heading wording for each canonical section. Sections the extractors never read
+# (summary, awards, ...) are still listed so they terminate the section above them.
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "experience": [
+        "experience", "work experience", "professional experience", "work history", "employment",
+        "employment history", "career history", "professional background", "work background",
+        "internships", "internship experience",
+    ],
+    "education": [
+        "education", "academic", "academics", "academic background", "academic qualifications",
+        "qualification", "qualifications", "educational qualifications",
+    ],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "technologies"],
+    "projects": ["projects", "academic projects", "personal projects"],
+    "certifications": [
+        "certifications", "certification", "certificates", "certificate", "credentials", "licenses",
+        "licenses & certifications", "professional certifications", "technical certifications",
+    ],
+    "summary": ["summary", "professional summary", "profile", "objective", "career objective", "about me"],
+    "achievements": ["awards", "achievements", "awards & achievements", "honors", "honors & awards"],
+    "other": [
+        "interests", "hobbies", "languages", "references", "publications", "activities",
+        "extracurricular activities", "volunteer experience", "volunteering",
+    ],
+}
+
+_HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+# A heading is a whole line (optionally behind a bullet or symbol), or a heading
+# word followed by ":" / "-" / "|" with the section body on the same line.
+# Longest wordings come first so "work experience" wins over "experience".
+HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?:[^\w\s]+[ \t]*)?(?P<heading>'
+    + '|'.join(re.escape(h) for h in sorted(_HEADING_TO_SECTION, key=len, reverse=True))
+    + r')[ \t]*(?:[:|\-–][ \t]*|$)',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+class Section(NamedTuple):
+    name: str
+    heading: str
+    start: int
+    end: int
+
+
+class SectionIndex:
+    """Offset index of the sections in a resume, built in one pass over the text"""
+
+    def __init__(self, text: str, sections: List[Section]):
+        self.text = text
+        self.sections = sections
+
+    def has(self, name: str) -> bool:
+        return any(section.name == name for section in self.sections)
+
+    def get(self, name: str) -> str:
+        """Return the body of every section with this name, joined in document order"""
+        return "\n\n".join(
+            self.text[section.start:section.end] for section in self.sections if section.name == name
+        )
+
+
+def segment(text: str) -> SectionIndex:
+    """Find section headings in a single scan and slice the text between them"""
+    headings = list(HEADING_PATTERN.finditer(text))
+    sections = []
+    for i, match in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+        heading = match.group('heading')
+        sections.append(Section(_HEADING_TO_SECTION[heading.lower()], heading, match.end(), end))
+    return SectionIndex(text, sections)
@@ -0,0 +1,224 @@
+import logging
+import math
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from canonical import normalize_skill
+
+logger = logging.getLogger(__name__)
+
+# Semantic matching settings, overridable per deployment
+SEMANTIC_MODEL = os.getenv("SEMANTIC_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SEMANTIC_MATCH_THRESHOLD = float(os.getenv("SEMANTIC_MATCH_THRESHOLD", "0.75"))
+SEMANTIC_CACHE_ENTRIES = int(os.getenv("SEMANTIC_CACHE_ENTRIES", "50000"))
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH", "")  # SQLite file; empty keeps vectors in memory only
+SEMANTIC_BATCH_SIZE = int(os.getenv("SEMANTIC_BATCH_SIZE", "64"))
+
+# Below this many vectors an exact scan is cheaper than hashing
+_ANN_EXACT_LIMIT = 2048
+
+
+class SemanticUnavailableError(RuntimeError):
+    """Raised when semantic matching is requested but the model cannot be loaded"""
+
+
+class EmbeddingStore:
+    """Skill vectors memoized in an LRU, backed by an optional SQLite file shared by workers"""
+
+    def __init__(self, model_name: str, max_entries: int = SEMANTIC_CACHE_ENTRIES, path: str = SEMANTIC_CACHE_PATH):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            try:
+                self._db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS skill_vectors ("
+                    "model TEXT NOT NULL, skill TEXT NOT NULL, vector BLOB NOT NULL, PRIMARY KEY (model, skill))"
+                )
+            except sqlite3.Error as e:
+                logger.error(f"Disabling on-disk embedding store at {path}: {e}")
+                self._db = None
+
+    def get_many(self, skills: Sequence[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            missing = []
+            for skill in skills:
+                vector = self._memory.get(skill)
+                if vector is not None:
+                    self._memory.move_to_end(skill)
+                    found[skill] = vector
+                else:
+                    missing.append(skill)
+
+            if missing and self._db is not None:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT skill, vector FROM skill_vectors WHERE model = ? AND skill IN ({placeholders})",
+                        [self.model_name, *chunk],
+                    ).fetchall()
+                    for skill, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        found[skill] = vector
+                        self._remember(skill, vector)
+        return found
+
+    def put_many(self, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for skill, vector in vectors.items():
+                self._remember(skill, vector)
+            if self._db is not None:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO skill_vectors (model, skill, vector) VALUES (?, ?, ?)",
+                        [(self.model_name, skill, vector.astype(np.float32).tobytes()) for skill, vector in vectors.items()],
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding store write failed: {e}")
+
+    def _remember(self, skill: str, vector: np.ndarray) -> None:
+        self._memory[skill] = vector
+        self._memory.move_to_end(skill)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+class AnnIndex:
+    """Random-hyperplane LSH over unit vectors; candidates are re-ranked by exact cosine"""
+
+    def __init__(self, vectors: np.ndarray, tables: int = 8, seed: int = 0):
+        self.vectors = vectors
+        self._exact = len(vectors) <= _ANN_EXACT_LIMIT
+        if self._exact:
+            return
+
+        # About 8 vectors per bucket, so each probe re-ranks a handful per table
+        bits = min(16, max(1, int(math.log2(len(vectors))) - 3))
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((tables, vectors.shape[1], bits)).astype(np.float32)
+        self._weights = 1 << np.arange(bits)
+        self._buckets: List[Dict[int, np.ndarray]] = []
+        for table_codes in self._codes(vectors).T:
+            order = np.argsort(table_codes, kind="stable")
+            codes, starts = np.unique(table_codes[order], return_index=True)
+            ends = np.append(starts[1:], len(order))
+            self._buckets.append({int(code): order[s:e] for code, s, e in zip(codes, starts, ends)})
+
+    def _codes(self, vectors: np.ndarray) -> np.ndarray:
+        """Bucket code of each vector in each table: shape (n, tables)"""
+        signs = np.einsum("nd,tdb->ntb", vectors, self._planes) > 0
+        return signs @ self._weights
+
+    def query_many(self, queries: np.ndarray, k: int, min_similarity: float) -> List[List[Tuple[int, float]]]:
+        """Up to k neighbours per query with cosine similarity >= min_similarity, best first"""
+        if len(self.vectors) == 0 or len(queries) == 0:
+            return [[] for _ in range(len(queries))]
+
+        if self._exact:
+            candidate_sets = [None] * len(queries)
+        else:
+            candidate_sets = []
+            for query_codes in self._codes(queries):
+                found = [self._buckets[table].get(int(code)) for table, code in enumerate(query_codes)]
+                found = [ids for ids in found if ids is not None]
+                candidate_sets.append(np.unique(np.concatenate(found)) if found else np.zeros(0, dtype=np.int64))
+
+        results = []
+        for query, candidates in zip(queries, candidate_sets):
+            pool = self.vectors if candidates is None else self.vectors[candidates]
+            similarities = pool @ query
+            order = np.argsort(-similarities)[:k]
+            ids = order if candidates is None else candidates[order]
+            results.append([
+                (int(i), float(similarities[o])) for i, o in zip(ids, order) if similarities[o] >= min_similarity
+            ])
+        return results
+
+
+def load_sentence_model(model_name: str = SEMANTIC_MODEL) -> Any:
+    """sentence-transformers model on CPU; raises SemanticUnavailableError when it cannot be loaded"""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError as e:
+        raise SemanticUnavailableError("sentence-transformers is not installed") from e
+    try:
+        return SentenceTransformer(model_name, device="cpu")
+    except Exception as e:
+        raise SemanticUnavailableError(f"Failed to load {model_name}: {e}") from e
+
+
+class SkillEmbedder:
+    """Lazily loaded sentence-transformers model with memoized, batched skill encoding"""
+
+    def __init__(self, model_name: str = SEMANTIC_MODEL, loader: Optional[Callable[[], Any]] = None):
+        self.model_name = model_name
+        self.store = EmbeddingStore(model_name)
+        self._loader = loader or (lambda: load_sentence_model(model_name))
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._taxonomy: List[str] = []
+        self._taxonomy_index: Optional[AnnIndex] = None
+        self.taxonomy_version: Optional[str] = None
+
+    def load_model(self) -> Any:
+        """Load the model once; safe to call from several threads"""
+        with self._load_lock:
+            if self._model is None:
+                self._model = self._loader()
+        return self._model
+
+    def encode(self, skills: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Unit vectors keyed by normalized skill; only cache misses reach the model, in batches"""
+        keys = list(dict.fromkeys(normalize_skill(skill) for skill in skills))
+        vectors = self.store.get_many(keys)
+        missing = [key for key in keys if key not in vectors]
+        if missing:
+            encoded = self.load_model().encode(
+                missing, batch_size=SEMANTIC_BATCH_SIZE, normalize_embeddings=True, convert_to_numpy=True
+            ).astype(np.float32)
+            fresh = dict(zip(missing, encoded))
+            self.store.put_many(fresh)
+            vectors.update(fresh)
+        return vectors
+
+    @property
+    def taxonomy_size(self) -> int:
+        return len(self._taxonomy)
+
+    def index_taxonomy(self, skills: Sequence[str], version: Optional[str] = None) -> None:
+        """Encode the taxonomy once and keep its vectors in an ANN index"""
+        taxonomy = list(dict.fromkeys(normalize_skill(skill) for skill in skills))
+        vectors = self.encode(taxonomy)
+        self._taxonomy = taxonomy
+        self._taxonomy_index = AnnIndex(np.stack([vectors[skill] for skill in taxonomy]))
+        self.taxonomy_version = version
+
+    def nearest_taxonomy(self, skills: Sequence[str], k: int = 5, min_similarity: float = 0.0) -> Dict[str, List[Tuple[str, float]]]:
+        """Closest taxonomy skills for each input skill"""
+        if self._taxonomy_index is None:
+            return {skill: [] for skill in skills}
+        vectors = self.encode(skills)
+        queries = np.stack([vectors[normalize_skill(skill)] for skill in skills])
+        neighbours = self._taxonomy_index.query_many(queries, k, min_similarity)
+        return {
+            skill: [(self._taxonomy[i], round(similarity, 4)) for i, similarity in found]
+            for skill, found in zip(skills, neighbours)
+        }
+
+
+def best_similarities(job_vectors: np.ndarray, resume_vectors: np.ndarray) -> np.ndarray:
+    """Best cosine similarity of each job skill against any resume skill, rounded to 2 places"""
+    if len(job_vectors) == 0 or len(resume_vectors) == 0:
+        return np.zeros(len(job_vectors))
+    return np.round((job_vectors @ resume_vectors.T).max(axis=1).astype(np.float64), 2)
@@ -0,0 +1,203 @@
+import asyncio
+import hashlib
+import logging
+import os
+import stat
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: single worker, no cross-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Request coalescing settings, overridable per deployment
+# Opt-in: the hand-off files are parsed resumes, so the directory is kept private to the service user
+SINGLE_FLIGHT_DIR = os.getenv("SINGLE_FLIGHT_DIR", "")  # shared by the workers on a host; empty coalesces within each worker only
+SINGLE_FLIGHT_WAIT_SECONDS = float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "30"))  # then parse anyway
+
+# How long a finished result stays readable; the workers that waited for it are polling the lock and read it at once
+_RESULT_SECONDS = 10
+# Lock polling backoff while another worker computes
+_POLL_SECONDS = (0.005, 0.1)
+# Keys are locked at an offset in one shared file, so lock files never pile up
+_LOCK_RANGE = 1 << 31
+
+
+class SingleFlight:
+    """Coalesces concurrent computations of the same key into one.
+
+    Within a worker, callers of a key that is already being computed await the same
+    future. Across the workers on a host, the one computing a key holds a record lock
+    on a shared file at an offset derived from the key, and leaves the result in a file
+    for the workers that waited on the lock; a worker that finds no result computes it.
+    Result files are deleted by the worker that wrote them shortly after, or on close().
+    """
+
+    def __init__(self, directory: str = SINGLE_FLIGHT_DIR, wait: float = SINGLE_FLIGHT_WAIT_SECONDS):
+        self.directory = directory
+        self.wait = wait
+        self._flights: Dict[str, "asyncio.Future[Any]"] = {}
+        self._fd: Optional[int] = None
+        self._expiring: Dict[str, asyncio.TimerHandle] = {}
+        if directory and fcntl is not None:
+            self._open()
+
+    def _open(self) -> None:
+        try:
+            for path in (self.directory, self.results_dir):
+                os.makedirs(path, mode=0o700, exist_ok=True)
+                _make_private(path)
+            # One descriptor per process: closing any descriptor of the file drops all of its record locks
+            self._fd = os.open(
+                os.path.join(self.directory, "flights.lock"), os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600
+            )
+            # Left behind by workers that exited before deleting them
+            self._sweep()
+        except OSError as e:
+            logger.error(f"Coalescing requests within each worker only, {self.directory} is unusable: {e}")
+            self._fd = None
+
+    @property
+    def results_dir(self) -> str:
+        return os.path.join(self.directory, "results")
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, Optional[str]]:
+        """Return (fn() or the result of a concurrent call for key, how it was shared: None, "worker" or "host")"""
+        while key in self._flights:
+            flight = self._flights[key]
+            try:
+                # Shielded, so a caller that goes away does not cancel the others' result
+                result = await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if flight.cancelled():
+                    continue  # the computing request was cancelled; the next caller takes over
+                raise
+            metrics.COALESCED_REQUESTS.labels(scope="worker").inc()
+            return result, "worker"
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            result, shared = await self._run_locked(key, fn)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            # Marks the exception retrieved, for when nobody else was waiting
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result, shared
+        finally:
+            del self._flights[key]
+
+    async def _run_locked(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, Optional[str]]:
+        if self._fd is None:
+            return await fn(), None
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        offset = int(digest[:8], 16) % _LOCK_RANGE
+        started = time.time_ns()
+        if not await self._lock(offset):
+            logger.warning(f"Waited {self.wait}s for another worker to compute {key}, computing it here")
+            return await fn(), None
+        try:
+            result = self._read_result(digest, started)
+            if result is not None:
+                metrics.COALESCED_REQUESTS.labels(scope="host").inc()
+                return result, "host"
+            result = await fn()
+            self._write_result(digest, result)
+            return result, None
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, offset)
+
+    async def _lock(self, offset: int) -> bool:
+        deadline = time.monotonic() + self.wait
+        delay = _POLL_SECONDS[0]
+        while True:
+            try:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset)
+                return True
+            except OSError:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _POLL_SECONDS[1])
+
+    def _result_path(self, digest: str) -> str:
+        return os.path.join(self.results_dir, f"{digest}.json")
+
+    def _read_result(self, digest: str, since: int) -> Optional[Any]:
+        # Only a result finished after this request arrived was computed concurrently with it
+        path = self._result_path(digest)
+        try:
+            if os.stat(path).st_mtime_ns < since:
+                return None
+            with open(path, "rb") as source:
+                return orjson.loads(source.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_result(self, digest: str, result: Any) -> None:
+        path = self._result_path(digest)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            content = orjson.dumps(result)
+            fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW, 0o600)
+            with os.fdopen(fd, "wb") as out:
+                out.write(content)
+            os.replace(temporary, path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not share a result with other workers: {e}")
+            _remove(temporary)
+            return
+        expiring = self._expiring.pop(path, None)
+        if expiring is not None:
+            expiring.cancel()
+        self._expiring[path] = asyncio.get_running_loop().call_later(_RESULT_SECONDS, self._expire, path)
+
+    def _expire(self, path: str) -> None:
+        del self._expiring[path]
+        _remove(path)
+
+    def _sweep(self) -> None:
+        cutoff = time.time() - _RESULT_SECONDS
+        for entry in os.scandir(self.results_dir):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass  # swept by another worker
+
+    def close(self) -> None:
+        """Delete the results this worker still has on offer, before it exits"""
+        for path, expiring in self._expiring.items():
+            expiring.cancel()
+            _remove(path)
+        self._expiring.clear()
+
+
+def _make_private(path: str) -> None:
+    # An existing directory must be ours, or another user could read or plant results
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise OSError(f"{path} is not a directory owned by this user")
+    if stat.S_IMODE(info.st_mode) != 0o700:
+        os.chmod(path, 0o700)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
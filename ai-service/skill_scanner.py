@@ -0,0 +1,116 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class SkillMatch(NamedTuple):
+    start: int
+    end: int
+    skill: str
+    category: str
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class SkillScanner:
+    """Aho-Corasick automaton that finds every taxonomy skill (or alias of one) in a single pass"""
+
+    def __init__(self, taxonomy: Dict[str, List[str]], aliases: Optional[Dict[str, str]] = None):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self.skills: List[Tuple[str, str]] = []
+        # Spellings in the automaton, each with the index of the skill it reports
+        self._patterns: List[Tuple[str, int]] = []
+
+        seen = {}
+        for category, skill_list in taxonomy.items():
+            for skill in skill_list:
+                key = skill.lower()
+                # First category wins, same as the old per-skill dedup
+                if not key or key in seen:
+                    continue
+                seen[key] = len(self.skills)
+                self._add(key, len(self.skills))
+                self.skills.append((key, category))
+
+        for alias, skill in (aliases or {}).items():
+            key = alias.lower()
+            if key and key not in seen and skill.lower() in seen:
+                self._add(key, seen[skill.lower()])
+
+        self._build()
+
+    def _add(self, pattern: str, index: int) -> None:
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] = self._out[state] + (len(self._patterns),)
+        self._patterns.append((pattern, index))
+
+    def _build(self) -> None:
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def scan(self, text_lower: str) -> List[SkillMatch]:
+        """Return every word-bounded skill mention in lowercased text, in text order"""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self._patterns
+        skills = self.skills
+        text_len = len(text_lower)
+        matches = []
+
+        state = 0
+        for i, ch in enumerate(text_lower):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+
+            end = i + 1
+            for pattern_id in out[state]:
+                pattern, index = patterns[pattern_id]
+                start = end - len(pattern)
+                # Only enforce a boundary where the skill itself starts/ends on a word
+                # character, so "c++" and "node.js" behave like regex \b would
+                if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text_lower[start - 1]):
+                    continue
+                if _is_word_char(pattern[-1]) and end < text_len and _is_word_char(text_lower[end]):
+                    continue
+                skill, category = skills[index]
+                matches.append(SkillMatch(start, end, skill, category))
+
+        matches.sort(key=lambda m: (m.start, m.end))
+        return matches
+
+
+def context_window(text: str, start: int, end: int, width: int = 50) -> str:
+    """Return up to `width` characters either side of a match, without crossing lines"""
+    line_start = text.rfind('\n', max(0, start - width), start) + 1
+    line_start = max(line_start, start - width)
+    line_end = text.find('\n', end, end + width)
+    if line_end == -1:
+        line_end = min(len(text), end + width)
+    return text[line_start:line_end]
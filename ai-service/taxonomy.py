@@ -0,0 +1,116 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from canonical import SkillCanonicalizer, normalize_skill
+from skill_scanner import SkillScanner
+
+logger = logging.getLogger(__name__)
+
+# JSON taxonomy: {"categories": {category: [skill or {"name": skill, "label": ..., "aliases": [...]}, ...]}}.
+# Reloaded on SIGHUP or POST /admin/taxonomy/reload.
+SKILLS_TAXONOMY_PATH = os.getenv(
+    "SKILLS_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json")
+)
+
+
+class TaxonomyError(ValueError):
+    """Raised when a taxonomy file is missing or malformed"""
+
+
+class Taxonomy:
+    """One version of the skills taxonomy, compiled for per-request lookups"""
+
+    def __init__(self, categories: Dict[str, List[str]], aliases: Dict[str, str], labels: Optional[Dict[str, str]] = None):
+        self.categories = categories
+        self.aliases = aliases
+        self.scanner = SkillScanner(categories, aliases)
+        self.names = [name for name, _ in self.scanner.skills]
+        labels = {normalize_skill(name): label for name, label in (labels or {}).items()}
+        # Display spellings of each skill and its category, interned so every parse result shares them
+        self.labels = [sys.intern(labels.get(name, name.title())) for name in self.names]
+        self.category_labels = [sys.intern(category.replace('_', ' ').title()) for _, category in self.scanner.skills]
+        self.canonicalizer = SkillCanonicalizer(self.names, aliases)
+        # Position of each skill in the taxonomy, so results can be ordered without walking it
+        self.order = {name: i for i, name in enumerate(self.names)}
+
+        content = json.dumps({"categories": categories, "aliases": aliases, "labels": labels}, sort_keys=True)
+        self.version = hashlib.sha256(content.encode()).hexdigest()[:16]
+        # /skills-database body, serialized once per version
+        self.categories_json = json.dumps(categories).encode()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "categories": len(self.categories),
+            "skills": len(self.names),
+            "aliases": len(self.aliases),
+            "canonical_cache": self.canonicalizer.cache_stats(),
+        }
+
+
+def parse_taxonomy(document: Any) -> Taxonomy:
+    """Validate a decoded taxonomy file and compile it"""
+    if not isinstance(document, dict) or not isinstance(document.get("categories"), dict):
+        raise TaxonomyError('Taxonomy must be an object with a "categories" object')
+
+    categories: Dict[str, List[str]] = {}
+    aliases: Dict[str, str] = {}
+    labels: Dict[str, str] = {}
+    for category, entries in document["categories"].items():
+        if not isinstance(entries, list):
+            raise TaxonomyError(f"Category {category!r} must be a list of skills")
+        names = []
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"name": entry}
+            name = entry.get("name") if isinstance(entry, dict) else None
+            if not isinstance(name, str) or not name.strip():
+                raise TaxonomyError(f"Category {category!r} has a skill without a name: {entry!r}")
+            names.append(name)
+            label = entry.get("label")
+            if label is not None:
+                if not isinstance(label, str) or not label.strip():
+                    raise TaxonomyError(f"Skill {name!r} has an invalid label: {label!r}")
+                labels.setdefault(name, label)
+            for alias in entry.get("aliases", []):
+                if not isinstance(alias, str) or not alias.strip():
+                    raise TaxonomyError(f"Skill {name!r} has an invalid alias: {alias!r}")
+                previous = aliases.setdefault(alias, name)
+                if normalize_skill(previous) != normalize_skill(name):
+                    raise TaxonomyError(f"Alias {alias!r} is used by both {previous!r} and {name!r}")
+        categories[category] = names
+    return Taxonomy(categories, aliases, labels)
+
+
+def load_taxonomy(path: str = SKILLS_TAXONOMY_PATH) -> Taxonomy:
+    try:
+        with open(path) as source:
+            document = json.load(source)
+    except (OSError, ValueError) as e:
+        raise TaxonomyError(f"Cannot read taxonomy {path}: {e}")
+    return parse_taxonomy(document)
+
+
+class TaxonomyStore:
+    """Holds the current taxonomy; a reload compiles the new one first and swaps it in with one assignment"""
+
+    def __init__(self, path: str = SKILLS_TAXONOMY_PATH):
+        self.path = path
+        self.current = load_taxonomy(path)
+        self._lock = threading.Lock()
+
+    def reload(self) -> Tuple[Taxonomy, bool]:
+        """Load the file again; returns the current taxonomy and whether it changed"""
+        with self._lock:
+            taxonomy = load_taxonomy(self.path)
+            if taxonomy.version == self.current.version:
+                return self.current, False
+            # Requests that already read .current keep the version they started with
+            self.current = taxonomy
+            logger.info(f"Loaded skills taxonomy {taxonomy.version} ({len(taxonomy.names)} skills)")
+            return taxonomy, True
@@ -0,0 +1,101 @@
+import io
+import random
+import zipfile
+
+import orjson
+import pytest
+from docx import Document
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks import corpus
+
+
+def docx(text: str) -> bytes:
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def archive(members) -> bytes:
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as zipped:
+        for name, content in members:
+            zipped.writestr(name, content)
+    return out.getvalue()
+
+
+def post_batch(client, files):
+    response = client.post("/parse-resume-batch", files=[("files", file) for file in files])
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [orjson.loads(line) for line in response.content.splitlines()]
+    return sorted(lines, key=lambda item: item["index"])
+
+
+def without_cluster(parsed):
+    return {field: value for field, value in parsed.items() if field != "duplicate_cluster"}
+
+
+def expected(filename: str, content: bytes):
+    return without_cluster(main.parsed_content(main.parse_text(main.extract_document_text(filename, content))))
+
+
+@pytest.fixture
+def resumes():
+    rng = random.Random(5)
+    skills = corpus.taxonomy_skills()
+    return [docx(corpus.resume_text(rng, 2, corpus.SECTIONS, skills)) for _ in range(3)]
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_uploads_and_zip_members_stream_one_line_each(resumes, monkeypatch, concurrency):
+    monkeypatch.setattr(main, "PARSE_BATCH_CONCURRENCY", concurrency)
+    zipped = archive([("a.docx", resumes[1]), ("scans/", b""), ("scans/b.docx", resumes[2]), ("notes.txt", b"hi")])
+    with TestClient(main.app) as client:
+        items = post_batch(client, [("one.docx", resumes[0]), ("more.zip", zipped), ("cover.txt", b"hello")])
+
+    assert [(item["index"], item["filename"], item["status"]) for item in items] == [
+        (0, "one.docx", 200),
+        (1, "more.zip/a.docx", 200),
+        (2, "more.zip/scans/b.docx", 200),
+        (3, "more.zip/notes.txt", 400),
+        (4, "cover.txt", 400),
+    ]
+    for item, content in zip(items, resumes):
+        assert without_cluster(item["result"]) == expected("resume.docx", content)
+    assert items[3]["error"] == items[4]["error"] == "Unsupported file format"
+
+
+def test_failures_are_reported_per_item(resumes):
+    with TestClient(main.app) as client:
+        items = post_batch(
+            client, [("broken.zip", b"not a zip"), ("fake.pdf", b"not a pdf"), ("good.docx", resumes[0])]
+        )
+
+    assert [(item["status"], item.get("error")) for item in items] == [
+        (400, "Invalid zip archive"),
+        (400, "File content does not match its format"),
+        (200, None),
+    ]
+    assert without_cluster(items[2]["result"]) == expected("good.docx", resumes[0])
+
+
+def test_size_limits_apply_to_uploads_and_to_each_zip_member(resumes, monkeypatch):
+    limit = len(resumes[0]) - 1
+    monkeypatch.setattr(main, "UPLOAD_MAX_BYTES", limit)
+    monkeypatch.setattr(main, "PARSE_BATCH_MAX_MEMBER_BYTES", limit)
+    zipped = archive([("big.docx", resumes[0]), ("small.docx", docx("Jane Doe"))])
+    with TestClient(main.app) as client:
+        items = post_batch(client, [("big.docx", resumes[0]), ("all.zip", zipped)])
+
+    assert [(item["filename"], item["status"]) for item in items] == [
+        ("big.docx", 400),
+        ("all.zip/big.docx", 400),
+        ("all.zip/small.docx", 200),
+    ]
+    assert items[0]["error"] == f"File too large (limit {limit} bytes)"
+    assert items[1]["error"] == "File too large"
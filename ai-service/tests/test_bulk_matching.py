@@ -0,0 +1,50 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks import corpus
+
+VARIANTS = ["K8s", "ReactJS", "python3", "Node JS", "Golang", "Python scripting", "data analysis", "cloud ops", "Rust"]
+
+
+def profiles(rng, prefix: str, count: int):
+    skills = corpus.taxonomy_skills()[:40] + VARIANTS
+    return [
+        {"id": f"{prefix}{i}", "skills": rng.sample(skills, rng.randint(0 if i == 0 else 1, 12))} for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("rank, top_k", [("resumes", 3), ("jobs", 2), ("resumes", 50)])
+def test_bulk_rankings_agree_with_match_skills(rank, top_k):
+    rng = random.Random(top_k)
+    resumes, jobs = profiles(rng, "r", 8), profiles(rng, "j", 5)
+    # Repeated job skills count once per occurrence in both endpoints
+    jobs[1]["skills"] += jobs[1]["skills"][:2]
+    with TestClient(main.app) as client:
+        response = client.post(
+            "/match-skills-bulk", json={"resumes": resumes, "jobs": jobs, "rank": rank, "top_k": top_k}
+        )
+        assert response.status_code == 200
+        rows, candidates = (jobs, resumes) if rank == "resumes" else (resumes, jobs)
+
+        for row, ranking in zip(rows, response.json()["rankings"]):
+            assert ranking["id"] == row["id"]
+            single = {}
+            for candidate in candidates:
+                resume, job = (candidate, row) if rank == "resumes" else (row, candidate)
+                request = {"resume_skills": resume["skills"], "job_skills": job["skills"]}
+                single[candidate["id"]] = client.post("/match-skills", json=request).json()
+
+            matches = ranking["matches"]
+            assert len(matches) == min(top_k, len(candidates))
+            for match in matches:
+                expected = single[match["id"]]
+                assert {**match["match"], "skill_scores": None} == {**expected, "skill_scores": None}
+                assert match["match"]["skill_scores"] == pytest.approx(expected["skill_scores"])
+            # The best candidates by match percentage, best first
+            percentages = [match["match"]["match_percentage"] for match in matches]
+            assert percentages == sorted(percentages, reverse=True)
+            left_out = set(single) - {match["id"] for match in matches}
+            assert all(single[other]["match_percentage"] <= percentages[-1] for other in left_out)
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from taxonomy import TaxonomyError, TaxonomyStore, load_taxonomy
+
+TAXONOMY = load_taxonomy()
+
+
+@pytest.mark.parametrize(
+    "spelling, name",
+    [
+        ("K8s", "kubernetes"),
+        ("k8s ", "kubernetes"),
+        ("Kubernetes", "kubernetes"),
+        ("python3", "python"),
+        ("Python 3.11", "python"),
+        ("python-3", "python"),
+        ("React.js", "react"),
+        ("ReactJS", "react"),
+        ("react js", "react"),
+        ("Node JS", "node.js"),
+        ("nodejs", "node.js"),
+        ("Golang", "go"),
+        ("Java 8", "java"),
+        ("angular v12", "angular"),
+        ("• C#,", "c#"),
+        ("(c++)", "c++"),
+    ],
+)
+def test_spellings_resolve_to_the_taxonomy_id(spelling, name):
+    canonicalizer = TAXONOMY.canonicalizer
+    assert canonicalizer.skill_id(spelling) == TAXONOMY.names.index(name)
+    assert canonicalizer.canonical(spelling) == name
+
+
+@pytest.mark.parametrize("spelling", ["r2", "Totally Unknown", ".NET 6"])
+def test_other_skills_get_stable_negative_ids(spelling):
+    first = TAXONOMY.canonicalizer.skill_id(spelling)
+    assert first < 0
+    # The same in a canonicalizer built separately, as in another worker
+    assert load_taxonomy().canonicalizer.skill_id(spelling) == first
+    assert TAXONOMY.canonicalizer.skill_id(spelling.upper()) == first
+
+
+def write_taxonomy(path, categories):
+    path.write_text(json.dumps({"categories": categories}))
+
+
+@pytest.fixture
+def taxonomy_file(tmp_path):
+    path = tmp_path / "skills.json"
+    write_taxonomy(path, {"cloud": [{"name": "kubernetes", "aliases": ["k8s"]}, "docker"]})
+    return path
+
+
+def test_reload_swaps_in_new_ids_and_aliases(taxonomy_file):
+    store = TaxonomyStore(str(taxonomy_file))
+    before = store.current
+    assert before.canonicalizer.skill_id("K8s") == 0
+    assert before.canonicalizer.skill_id("kube") < 0
+
+    # A new skill ahead of kubernetes moves its id; a new alias starts resolving
+    write_taxonomy(
+        taxonomy_file, {"cloud": ["terraform", {"name": "kubernetes", "aliases": ["k8s", "kube"]}, "docker"]}
+    )
+    after, changed = store.reload()
+    assert changed and store.current is after
+    assert after.version != before.version
+    assert after.canonicalizer.skill_id("K8s") == after.canonicalizer.skill_id("kube") == 1
+    assert after.canonicalizer.canonical("Kube") == "kubernetes"
+    # A request that started on the old version keeps resolving with it
+    assert before.canonicalizer.skill_id("K8s") == 0
+    assert before.canonicalizer.skill_id("kube") < 0
+
+
+def test_reload_of_an_unchanged_or_broken_file_keeps_the_current_taxonomy(taxonomy_file):
+    store = TaxonomyStore(str(taxonomy_file))
+    current = store.current
+    assert store.reload() == (current, False)
+
+    taxonomy_file.write_text('{"categories": {"cloud": [{"name": "kubernetes", "aliases": [""]}]}}')
+    with pytest.raises(TaxonomyError):
+        store.reload()
+    assert store.current is current
+
+
+def test_matching_uses_the_reloaded_taxonomy(taxonomy_file, monkeypatch):
+    monkeypatch.setattr(main, "taxonomy_store", TaxonomyStore(str(taxonomy_file)))
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    # The reload moves the parse cache to the new version's namespace; the workers it
+    # restarts are shut down with the client
+    monkeypatch.setattr(main.parse_cache, "namespace", main.parse_cache.namespace)
+    request = {"resume_skills": ["Kubernetes", "Docker"], "job_skills": ["K8s", "kube"]}
+    with TestClient(main.app) as client:
+        assert client.post("/match-skills", json=request).json()["matched_skills"] == ["K8s"]
+
+        write_taxonomy(taxonomy_file, {"cloud": [{"name": "kubernetes", "aliases": ["k8s", "kube"]}, "docker"]})
+        response = client.post("/admin/taxonomy/reload", headers={"X-Admin-Token": "secret"})
+        assert response.json()["changed"] is True
+
+        assert client.post("/match-skills", json=request).json()["matched_skills"] == ["K8s", "kube"]
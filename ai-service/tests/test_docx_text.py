@@ -0,0 +1,81 @@
+import io
+import random
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+import docx_text
+from benchmarks import corpus
+
+
+def save(document) -> bytes:
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def python_docx_text(content: bytes) -> str:
+    """Headers, body paragraphs and table cells, then footers, as python-docx reads them"""
+    document = Document(io.BytesIO(content))
+    lines = [paragraph.text for paragraph in document.sections[0].header.paragraphs]
+    for child in document.element.body.iterchildren():
+        if child.tag == docx_text._PARAGRAPH:
+            lines.append(Paragraph(child, document).text)
+        elif child.tag == docx_text._TABLE:
+            for row in Table(child, document).rows:
+                for cell in row.cells:
+                    lines.extend(paragraph.text for paragraph in cell.paragraphs)
+    lines.extend(paragraph.text for paragraph in document.sections[0].footer.paragraphs)
+    return "".join(line + "\n" for line in lines)
+
+
+@pytest.fixture(scope="module")
+def resume() -> bytes:
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = "Jane Doe | jane@example.com"
+    document.sections[0].footer.paragraphs[0].text = "Page 1"
+    text = corpus.resume_text(random.Random(4), 4, corpus.SECTIONS, corpus.taxonomy_skills())
+    for line in text.split("\n"):
+        paragraph = document.add_paragraph()
+        # Split into runs of mixed formatting, as editors write them
+        for i, word in enumerate(line.split(" ")):
+            paragraph.add_run(("" if i == 0 else " ") + word).bold = i % 2 == 1
+    paragraph = document.add_paragraph("Python\tSQL")
+    paragraph.add_run().add_break(WD_BREAK.LINE)
+    paragraph.add_run("Kubernetes")
+    table = document.add_table(rows=2, cols=2)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"cell {r}{c}"
+    cell = table.cell(1, 1)
+    cell.add_paragraph("second line")
+    document.add_paragraph("")
+    document.add_paragraph("References available on request")
+    return save(document)
+
+
+def test_text_matches_python_docx(resume):
+    assert docx_text.extract_text(resume, 10 ** 9) == python_docx_text(resume)
+
+
+def test_text_stops_at_max_chars(resume):
+    text = docx_text.extract_text(resume, 200)
+    assert python_docx_text(resume).startswith(text)
+    # Reading stops with the paragraph that reaches the limit
+    lines = text.splitlines(keepends=True)
+    assert len("".join(lines[:-1])) < 200 <= len(text)
+
+
+def test_an_oversize_part_yields_the_paragraphs_read_before_the_cap(resume):
+    text = docx_text.extract_text(resume, 10 ** 9, max_bytes=4096)
+    lines = text.split("\n")
+    expected = python_docx_text(resume).split("\n")
+    # The header, the body paragraphs that ended before the cap, then the footer
+    assert lines[0] == expected[0]
+    assert lines[-2:] == expected[-2:]
+    body = lines[1:-2]
+    assert 1 <= len(body) < len(expected) - 3
+    assert body == expected[1:len(body) + 1]
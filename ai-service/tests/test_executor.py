@@ -0,0 +1,68 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from executor import ParseExecutor
+
+worker_tag = None
+
+
+def tag_worker(tag: str) -> None:
+    global worker_tag
+    worker_tag = tag
+
+
+def worker_info(delay: float = 0):
+    time.sleep(delay)
+    return os.getpid(), worker_tag
+
+
+def test_a_full_queue_is_turned_away_with_503():
+    executor = ParseExecutor(backend="thread", max_workers=1, max_pending=2)
+    release = threading.Event()
+
+    async def main():
+        held = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as error:
+            await executor.run(time.time)
+        release.set()
+        await asyncio.gather(*held)
+        # The slots are free again once the held tasks finish
+        return error.value, await executor.run(lambda: "parsed")
+
+    try:
+        rejected, result = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert rejected.status_code == 503
+    assert rejected.headers == {"Retry-After": "1"}
+    assert result == "parsed"
+    assert executor.pending == 0
+
+
+def test_restart_replaces_the_workers_and_lets_running_tasks_finish():
+    executor = ParseExecutor(backend="process", max_workers=1, max_pending=4, initializer=tag_worker)
+    executor.initargs = ("first",)
+
+    async def main():
+        executor.start()
+        before = await executor.run(worker_info)
+        running = asyncio.ensure_future(executor.run(worker_info, 0.5))
+        await asyncio.sleep(0.1)
+        executor.restart("second")
+        after = await executor.run(worker_info)
+        return before, await running, after
+
+    try:
+        before, running, after = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert before[1] == running[1] == "first"
+    assert running[0] == before[0]
+    assert after[1] == "second"
+    assert after[0] != before[0]
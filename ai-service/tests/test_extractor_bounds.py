@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+import main
+
+N = main.PARSE_MAX_TEXT_CHARS
+
+# Worst cases for each extractor, all at the text size cap
+ADVERSARIAL = {
+    "certified-lines": "Certifications\n" + "".join(f"Certified Thing Number {i} Professional\n" for i in range(6000)),
+    "aws-certified-run": "Certifications\n" + "AWS Certified Solutions Architect " * 6000,
+    "bachelor-run": "Education\n" + "bachelor " * 20000,
+    "degree-lines": "Education\n" + "Bachelor of Science, State University 2019\n" * 5000,
+    "experience-entries": "Experience\n" + "Senior Software Engineer at Acme Corp 2019 - 2023 building things\n\n" * 3000,
+    "at-run": "Experience\n" + "engineer at " * 16000,
+    "one-long-entry": "python developer at company " * 8000,
+    "long-line": "x" * N,
+    "letter-run": "a" * N,
+    "digit-run": "1" * N,
+    "punctuation-run": ".@+|•" * (N // 5),
+    "emails": " ".join(f"user{i}@example.com" for i in range(10000)),
+    "phones": " ".join("+1 555 010 %04d" % i for i in range(12000)),
+    "headings": "Skills\nExperience\nEducation\nCertifications\n" * 5000,
+}
+
+# Generous, so the test catches super-linear blowups rather than machine speed
+STAGE_SECONDS = 0.5
+
+
+@pytest.mark.parametrize("name", ADVERSARIAL)
+def test_each_stage_is_bounded(name):
+    text = ADVERSARIAL[name][:N]
+    sections = main.segment(text)
+    for field, _ in main.EXTRACTION_STAGES:
+        started = time.perf_counter()
+        result, _ = main.extract_stage(field, text, sections, {})
+        elapsed = time.perf_counter() - started
+        assert elapsed < STAGE_SECONDS, f"{field} took {elapsed:.2f}s on {name}"
+        if field == "experience":
+            assert len(result) <= main.MAX_EXPERIENCE_ENTRIES
+        elif field == "education":
+            assert len(result) <= main.MAX_EDUCATION_ENTRIES
+        elif field == "certificates":
+            assert len(result) <= main.MAX_CERTIFICATES
+
+
+def test_certificates_stop_at_the_cap():
+    assert len(main.parse_text(ADVERSARIAL["certified-lines"])["certificates"]) == main.MAX_CERTIFICATES
+
+
+def test_education_stops_at_the_cap():
+    assert len(main.parse_text(ADVERSARIAL["bachelor-run"])["education"]) == main.MAX_EDUCATION_ENTRIES
+
+
+def test_text_beyond_the_cap_is_ignored():
+    text = "Skills\nPython\n" + "x" * N + "\nRust"
+    names = {skill["name"] for skill in main.parse_text(text)["skills"]}
+    assert "Python" in names
+    assert "Rust" not in names
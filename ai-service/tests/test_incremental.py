@@ -0,0 +1,87 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import metrics
+from benchmarks import corpus
+
+RESUMES = {
+    f"{seed}-{name}": text
+    for seed in range(3)
+    for name, text in corpus.profiles(seed).items()
+    if not name.startswith("adversarial")
+}
+
+
+def edit(text: str, rng: random.Random) -> str:
+    """One edit of the kind a resume builder autosaves"""
+    lines = text.split("\n")
+    at = rng.randrange(len(lines))
+    kind = rng.choice(("insert", "delete", "change", "skill", "duplicate", "move"))
+    if kind == "insert":
+        lines.insert(at, rng.choice(["- Led a team of 5 engineers", "Data Engineer at Initech", "", "2018 - 2020"]))
+    elif kind == "delete":
+        del lines[at]
+    elif kind == "change":
+        lines[at] = lines[at].replace(rng.choice("aeiou"), rng.choice("aeiou"), 1) + rng.choice(["", " 2024", " Ltd"])
+    elif kind == "skill":
+        lines.insert(at, ", ".join(rng.sample(corpus.taxonomy_skills(), 3)))
+    elif kind == "duplicate":
+        lines.insert(at, lines[rng.randrange(len(lines))])
+    else:
+        lines.insert(rng.randrange(len(lines)), lines.pop(at))
+    return "\n".join(lines)
+
+
+def incremental_parse(text: str, base_units):
+    (parsed, units), _, counts = metrics.run_timed(main.parse_sections, text, base_units)
+    return parsed, units, counts
+
+
+@pytest.mark.parametrize("name", RESUMES)
+def test_incremental_parse_equals_fresh_parse(name):
+    rng = random.Random(name)
+    text = RESUMES[name]
+    _, units, _ = incremental_parse(text, {})
+    reused = 0
+    # A chain of edits, each parsed on the units of the version before it
+    for _ in range(25):
+        text = edit(text, rng)
+        parsed, units, counts = incremental_parse(text, units)
+        fresh, fresh_units = main.parse_sections(text, {})
+        assert parsed == fresh
+        assert units == fresh_units
+        reused += counts.get("sections_reused", 0)
+    assert reused > 0
+
+
+def test_units_of_another_document_change_nothing():
+    first, second = RESUMES["0-long"], RESUMES["1-long"]
+    _, units, _ = incremental_parse(first, {})
+    parsed, _, _ = incremental_parse(second, units)
+    assert parsed == main.parse_text(second)
+
+
+def test_unchanged_text_reuses_every_section():
+    text = RESUMES["0-long"]
+    _, units, _ = incremental_parse(text, {})
+    parsed, _, counts = incremental_parse(text, units)
+    assert parsed == main.parse_text(text)
+    assert counts.get("sections_parsed", 0) == 0
+
+
+def test_base_hash_over_the_api_equals_a_fresh_parse():
+    rng = random.Random(7)
+    text = RESUMES["2-medium"]
+    with TestClient(main.app) as client:
+        response = client.post("/parse-resume-text", json={"text": text})
+        for _ in range(5):
+            text = edit(text, rng)
+            response = client.post(
+                "/parse-resume-text", json={"text": text, "base_hash": response.headers["X-Document-Hash"]}
+            )
+            assert response.status_code == 200
+            assert response.headers["X-Parse-Cache"] == "miss"
+            assert response.json() == main.parsed_content(main.parse_text(text))
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+import jobs
+from executor import ParseExecutor
+from jobs import JobQueue
+
+
+def test_jobs_wait_out_a_full_parse_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "_BUSY_RETRY_SECONDS", 0.05)
+    monkeypatch.setattr(jobs, "_POLL_SECONDS", 0.02)
+    # One attempt: a deferral that counted as an attempt would fail the job for good
+    queue = JobQueue(directory=str(tmp_path / "jobs"), max_attempts=1)
+    executor = ParseExecutor(backend="thread", max_workers=1, max_pending=1)
+    upload = tmp_path / "upload"
+    upload.write_bytes(b"%PDF-1.4 resume")
+    attempts = []
+
+    async def handler(job):
+        attempts.append(job["attempts"])
+        return await executor.run(lambda: {"skills": []})
+
+    async def main():
+        release = threading.Event()
+        busy = asyncio.ensure_future(executor.run(release.wait))
+        job, _ = queue.submit(str(upload), "sha", "pdf", "resume.pdf")
+        worker = asyncio.ensure_future(queue.run(handler))
+        while len(attempts) < 3:
+            await asyncio.sleep(0.01)
+        deferred = queue.get(job["id"])
+
+        release.set()
+        await busy
+        while queue.get(job["id"])["status"] != "succeeded":
+            await asyncio.sleep(0.01)
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        return deferred, queue.get(job["id"])
+
+    try:
+        deferred, finished = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert deferred["status"] in ("queued", "running") and deferred["error"] is None
+    assert set(attempts) == {1}
+    assert (finished["attempts"], finished["result"]) == (1, {"skills": []})
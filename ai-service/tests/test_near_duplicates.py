@@ -0,0 +1,68 @@
+import io
+import random
+import zlib
+
+import numpy as np
+from docx import Document
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+import main
+import near_duplicates
+from benchmarks import corpus
+
+
+def docx(text: str) -> bytes:
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def reused() -> float:
+    return REGISTRY.get_sample_value("resuchain_near_duplicate_documents_total", {"result": "reused"}) or 0
+
+
+def test_near_copy_of_another_resume_gets_its_own_parse(monkeypatch):
+    # Only the contact lines differ, so the copy is well within the reuse threshold
+    monkeypatch.setattr(main, "NEAR_DUPLICATE_REUSE_THRESHOLD", 0.85)
+    original = corpus.resume_text(random.Random(3), 8, corpus.SECTIONS, corpus.taxonomy_skills())
+    copy = "\n".join(
+        ["Priya Menon", "priya.menon@example.org | +91 9000000001 | Pune, Maharashtra"] + original.split("\n")[2:]
+    )
+    with TestClient(main.app) as client:
+        first = client.post("/parse-resume-file", files={"file": ("a.docx", docx(original))}).json()
+        reused_before = reused()
+        second = client.post("/parse-resume-file", files={"file": ("b.docx", docx(copy))}).json()
+
+    assert second["duplicate_cluster"] == first["duplicate_cluster"]
+    assert reused() == reused_before + 1
+    assert second["personal_info"]["name"] == "Priya Menon"
+    assert second["personal_info"]["email"] == "priya.menon@example.org"
+    fresh = main.parse_text(main.extract_document_text("b.docx", docx(copy)))
+    assert {**second, "duplicate_cluster": None} == main.parsed_content(fresh)
+
+
+def test_minhash_permutations_are_exact_and_estimate_jaccard():
+    words = [f"w{i}" for i in range(400)]
+    document = near_duplicates.signature(" ".join(words))
+    # The same permutations in unbounded Python integers, which cannot overflow
+    shingles = set()
+    for start in range(len(words) - 2):
+        value = 0
+        for word in words[start:start + 3]:
+            value = (value * 1000003 + zlib.crc32(word.encode())) % (1 << 64)
+        shingles.add(value & 0xFFFFFFFF)
+    prime = int(near_duplicates._PRIME)
+    expected = [
+        min((a * (x % prime) + b) % prime for x in shingles)
+        for a, b in zip(near_duplicates._A.tolist(), near_duplicates._B.tolist())
+    ]
+    assert document.minhash.tolist() == expected
+
+    # 198 shingles shared of 598 in the union
+    other = near_duplicates.signature(" ".join(words[200:] + [f"v{i}" for i in range(200)]))
+    estimate = float(np.mean(document.minhash == other.minhash))
+    assert abs(estimate - 198 / 598) < 0.1
@@ -0,0 +1,110 @@
+import asyncio
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+import main
+from parse_cache import ParseCache
+from taxonomy import TaxonomyStore
+
+PARSED = {"skills": [{"name": "Python", "category": "Programming", "level": 3}]}
+
+
+def test_memory_tier_hits_and_misses():
+    cache = ParseCache("v1", path="")
+    key = cache.digest_key("text", "abc")
+    assert cache.get(key) == (None, None)
+    cache.put(key, PARSED)
+    assert cache.get(key) == (PARSED, "memory")
+    assert cache.get(cache.digest_key("text", "other")) == (None, None)
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["disk"]) == (1, 1, 2, False)
+
+
+def test_disk_tier_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "cache.db")
+    writer, reader = ParseCache("v1", path=path), ParseCache("v1", path=path)
+    key = writer.digest_key("text", "abc")
+    assert reader.get(key) == (None, None)
+    writer.put(key, PARSED)
+    # The first read comes from SQLite and is then kept in memory
+    assert reader.get(key) == (PARSED, "disk")
+    assert reader.get(key) == (PARSED, "memory")
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ParseCache("v1", ttl=-1, path=str(tmp_path / "cache.db"))
+    key = cache.digest_key("text", "abc")
+    cache.put(key, PARSED)
+    assert cache.get(key) == (None, None)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ParseCache("v1", max_entries=2, path="")
+    a, b, c = (cache.digest_key("text", name) for name in "abc")
+    cache.put(a, PARSED)
+    cache.put(b, PARSED)
+    cache.get(a)
+    cache.put(c, PARSED)
+    assert [cache.get(key)[1] for key in (a, b, c)] == ["memory", None, "memory"]
+
+    # And by size: an entry larger than the whole budget is never kept
+    small = ParseCache("v1", max_bytes=100, path="")
+    small.put(a, {"text": "x" * 60})
+    small.put(b, {"text": "y" * 60})
+    small.put(c, {"text": "z" * 200})
+    assert [small.get(key)[1] for key in (a, b, c)] == [None, "memory", None]
+
+
+def test_a_new_namespace_leaves_older_entries_behind(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = ParseCache("v1", path=path)
+    old_key = cache.digest_key("text", "abc")
+    cache.put(old_key, PARSED)
+    cache.set_namespace("v2")
+    assert cache.stats()["entries"] == 0
+    assert cache.digest_key("text", "abc") != old_key
+    assert cache.get(cache.digest_key("text", "abc")) == (None, None)
+    # A worker that opens the cache at the new version prunes the old rows
+    assert ParseCache("v2", path=path).get(old_key) == (None, None)
+
+
+def test_disk_reads_and_writes_run_off_the_event_loop(tmp_path):
+    cache = ParseCache("v1", path=str(tmp_path / "cache.db"))
+    other = ParseCache("v1", path=cache.path)
+    key = cache.digest_key("text", "abc")
+    threads = []
+
+    def spy(method):
+        return lambda *args: threads.append(threading.current_thread()) or method(*args)
+
+    for instance in (cache, other):
+        for name in ("_get_disk", "_put_disk"):
+            setattr(instance, name, spy(getattr(instance, name)))
+
+    async def main():
+        await cache.store(key, PARSED)
+        return await other.fetch(key), await other.fetch(key)
+
+    loop_thread = threading.current_thread()
+    assert asyncio.run(main()) == ((PARSED, "disk"), (PARSED, "memory"))
+    # One write and one read reached SQLite; the memory hit did not
+    assert len(threads) == 2 and loop_thread not in threads
+
+
+def test_endpoint_hits_until_the_taxonomy_changes(tmp_path, monkeypatch):
+    taxonomy_file = tmp_path / "skills.json"
+    taxonomy_file.write_text(json.dumps({"categories": {"cloud": ["kubernetes", "docker"]}}))
+    monkeypatch.setattr(main, "taxonomy_store", TaxonomyStore(str(taxonomy_file)))
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(main.parse_cache, "namespace", main.parse_cache.namespace)
+    text = "Jane Doe\nSkills\nDocker, Kubernetes, cache test"
+    with TestClient(main.app) as client:
+        def status():
+            return client.post("/parse-resume-text", json={"text": text}).headers["X-Parse-Cache"]
+
+        assert [status(), status()] == ["miss", "hit-memory"]
+        taxonomy_file.write_text(json.dumps({"categories": {"cloud": ["kubernetes", "docker", "terraform"]}}))
+        assert client.post("/admin/taxonomy/reload", headers={"X-Admin-Token": "secret"}).json()["changed"] is True
+        assert [status(), status()] == ["miss", "hit-memory"]
@@ -0,0 +1,26 @@
+import hashlib
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def test_results_that_do_not_match_parsed_resume_are_neither_served_nor_cached(monkeypatch):
+    async def broken_parse(text, digest, base_hash):
+        return {**main.parse_text(text), "skills": None}
+
+    monkeypatch.setattr(main, "parse_edited_text", broken_parse)
+    text = "Jane Doe\nSkills\nPython, validation test"
+    with TestClient(main.app) as client:
+        response = client.post("/parse-resume-text", json={"text": text})
+    assert response.status_code == 500
+    key = main.parse_cache.digest_key("text", hashlib.sha256(text.encode()).hexdigest())
+    assert main.parse_cache.get(key) == (None, None)
+
+
+def test_valid_results_are_served_as_parsed():
+    text = "Jane Doe\njane@example.com\nSkills\nPython, Kubernetes"
+    with TestClient(main.app) as client:
+        response = client.post("/parse-resume-text", json={"text": text})
+    assert response.status_code == 200
+    assert response.json() == main.ParsedResume.model_validate(main.parsed_content(main.parse_text(text))).model_dump()
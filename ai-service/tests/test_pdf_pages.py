@@ -0,0 +1,54 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import pdf_text
+from benchmarks import corpus
+from executor import ParseExecutor
+
+
+@pytest.fixture(scope="module")
+def long_pdf() -> bytes:
+    text = corpus.resume_text(random.Random(8), 12, corpus.SECTIONS, corpus.taxonomy_skills())
+    return corpus.to_pdf(text, lines_per_page=6)
+
+
+@pytest.mark.parametrize("page_count, parts", [(1, 4), (10, 3), (12, 4), (50, 7)])
+def test_page_ranges_cover_every_page_once(page_count, parts):
+    ranges = pdf_text.page_ranges(page_count, parts)
+    assert len(ranges) == min(page_count, parts)
+    assert [page for start, stop in ranges for page in range(start, stop)] == list(range(page_count))
+    sizes = [stop - start for start, stop in ranges]
+    assert max(sizes) - min(sizes) <= 1
+
+
+def test_page_ranges_join_into_the_sequential_text(long_pdf):
+    page_count = pdf_text.count_pages(long_pdf)
+    assert page_count >= pdf_text.PDF_PARALLEL_MIN_PAGES
+    sequential = pdf_text.extract_text(long_pdf, page_count, 10 ** 9, early_exit=False)
+    joined = "".join(
+        pdf_text.extract_pages(long_pdf, start, stop, 10 ** 9) for start, stop in pdf_text.page_ranges(page_count, 3)
+    )
+    assert joined == sequential
+
+
+@pytest.mark.parametrize("max_pages", [pdf_text.PDF_MAX_PAGES, 11])
+def test_page_parallel_upload_parses_like_a_sequential_one(long_pdf, monkeypatch, max_pages):
+    monkeypatch.setattr(pdf_text, "PDF_MAX_PAGES", max_pages)
+    executor = ParseExecutor(backend="process", max_workers=3, initializer=main.init_parse_worker)
+    monkeypatch.setattr(main, "parse_executor", executor)
+    split = []
+    page_ranges = pdf_text.page_ranges
+    monkeypatch.setattr(pdf_text, "page_ranges", lambda *args: split.append(args) or page_ranges(*args))
+    # A cache hit from another test would skip extraction
+    monkeypatch.setattr(main.parse_cache, "namespace", f"pdf-pages-{max_pages}")
+
+    with TestClient(main.app) as client:
+        response = client.post("/parse-resume-file", files={"file": ("long.pdf", long_pdf)})
+    assert response.status_code == 200
+    assert split == [(min(pdf_text.count_pages(long_pdf), max_pages), 3)]
+
+    sequential = main.parse_text(main.extract_document_text("long.pdf", long_pdf))
+    assert {**response.json(), "duplicate_cluster": None} == main.parsed_content(sequential)
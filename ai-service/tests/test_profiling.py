@@ -0,0 +1,43 @@
+import io
+
+import pytest
+from docx import Document
+from fastapi.testclient import TestClient
+
+import main
+
+
+def docx(text: str) -> bytes:
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "secret")
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("request_body, root", [
+    ({"files": {"file": ("resume.docx", docx("Jane Doe\nSkills\nPython, Docker"))}}, "parse_document"),
+    ({"data": {"text": "Jane Doe\nSkills\nPython, Docker"}}, "parse_text"),
+])
+def test_files_and_text_are_profiled(client, request_body, root):
+    response = client.post("/admin/profile", headers={"X-Admin-Token": "secret"}, **request_body)
+    assert response.status_code == 200
+    assert float(response.headers["X-Profile-Seconds"]) > 0
+    # Collapsed stacks, one "frame;frame;... count" line each, all under the parse entry point
+    lines = response.text.splitlines()
+    assert lines and all(line.startswith(root) and line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_admin_endpoints_need_the_token(client, monkeypatch):
+    response = client.post("/admin/profile", headers={"X-Admin-Token": "wrong"}, data={"text": "Jane Doe"})
+    assert response.status_code == 403
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "")
+    assert client.get("/admin/slow-parses").status_code == 404
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from benchmarks import corpus
+from resume_export import ResumeExport
+
+PARSED = {
+    "personal_info": {"location": "Pune, Maharashtra"},
+    "skills": [{"name": "Python", "category": "Programming", "level": 3}],
+    "experience": [],
+    "education": [
+        {"degree": "Bachelor of Technology", "institution": "IIT Bombay", "year": "2019"},
+        {"degree": "Master of Science", "institution": "IIT Bombay", "year": "2019"},
+    ],
+    "certificates": [
+        {"name": "AWS Certified Developer", "issuer": "Amazon Web Services", "certificateId": "", "date": ""},
+        {"name": "AWS Certified Architect", "issuer": "Amazon Web Services", "certificateId": "", "date": ""},
+    ],
+}
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_aggregates_count_distinct_resumes(tmp_path, fmt):
+    export = ResumeExport(str(tmp_path), fmt)
+    # The same document twice, and another one
+    export.record("a", "text", PARSED)
+    export.record("a", "text", PARSED)
+    export.record("b", "text", PARSED)
+    export.export()
+
+    aggregates = export.aggregates()
+    assert aggregates["resumes"] == 2
+    assert aggregates["certificate_issuers"] == [{"issuer": "Amazon Web Services", "resumes": 2}]
+    assert aggregates["education_years"] == [{"year": 2019, "resumes": 2}]
+    assert aggregates["skills_by_category"] == {"Programming": [{"skill": "Python", "resumes": 2}]}
+
+
+def test_only_fresh_parses_are_recorded_and_edits_keep_their_document_id(tmp_path, monkeypatch):
+    export = ResumeExport(str(tmp_path))
+    monkeypatch.setattr(main, "resume_export", export)
+    rng = random.Random(11)
+    text = corpus.resume_text(rng, 3, corpus.SECTIONS, corpus.taxonomy_skills())
+    with TestClient(main.app) as client:
+        first = client.post("/parse-resume-text", json={"text": text})
+        # A repeat of the same text is a cache hit
+        client.post("/parse-resume-text", json={"text": text})
+        base_hash = first.headers["X-Document-Hash"]
+        for edit in (" Ltd", " 2024"):
+            text += edit
+            base_hash = client.post("/parse-resume-text", json={"text": text, "base_hash": base_hash}).headers[
+                "X-Document-Hash"
+            ]
+    export.export()
+
+    resumes = export.load("resumes", ["document_id"]).to_pylist()
+    assert resumes == [{"document_id": first.headers["X-Document-Hash"]}] * 3
+    assert export.aggregates()["resumes"] == 1
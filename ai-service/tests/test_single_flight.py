@@ -0,0 +1,79 @@
+import asyncio
+import os
+import stat
+import time
+
+import pytest
+
+import single_flight
+from single_flight import SingleFlight
+
+pytestmark = pytest.mark.skipif(single_flight.fcntl is None, reason="needs fcntl")
+
+
+def mode(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_coalescing_within_a_worker_needs_no_directory():
+    flights = SingleFlight(directory="")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"skills": []}
+
+    async def main():
+        return await asyncio.gather(*(flights.run("key", compute) for _ in range(4)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [shared for _, shared in results].count("worker") == 3
+    assert flights._fd is None
+
+
+def test_results_are_private_and_deleted_soon_after(tmp_path, monkeypatch):
+    monkeypatch.setattr(single_flight, "_RESULT_SECONDS", 0.05)
+    directory = tmp_path / "flights"
+    flights = SingleFlight(directory=str(directory))
+
+    async def compute():
+        return {"personal_info": {"name": "Jane Doe"}}
+
+    async def main():
+        await flights.run("key", compute)
+        written = list((directory / "results").iterdir())
+        modes = [mode(path) for path in written]
+        await asyncio.sleep(0.2)
+        return written, modes
+
+    written, modes = asyncio.run(main())
+    assert mode(directory) == mode(directory / "results") == 0o700
+    assert mode(directory / "flights.lock") == 0o600
+    assert modes == [0o600]
+    assert not written[0].exists()
+
+
+def test_close_deletes_results_on_offer(tmp_path):
+    flights = SingleFlight(directory=str(tmp_path))
+
+    async def main():
+        await flights.run("key", lambda: asyncio.sleep(0, {"skills": []}))
+        flights.close()
+
+    asyncio.run(main())
+    assert list((tmp_path / "results").iterdir()) == []
+
+
+def test_existing_directory_is_made_private_and_swept(tmp_path):
+    results = tmp_path / "results"
+    results.mkdir(mode=0o755)
+    os.chmod(tmp_path, 0o755)
+    stale = results / "stale.json"
+    stale.write_text("{}")
+    os.utime(stale, (time.time() - 3600, time.time() - 3600))
+
+    SingleFlight(directory=str(tmp_path))
+    assert mode(tmp_path) == mode(results) == 0o700
+    assert not stale.exists()
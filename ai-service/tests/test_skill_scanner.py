@@ -0,0 +1,75 @@
+import random
+import re
+
+import pytest
+
+from skill_scanner import SkillScanner
+from taxonomy import load_taxonomy
+
+TAXONOMY = load_taxonomy()
+
+
+def regex_mentions(names, aliases, text_lower):
+    """Reference extractor: one regex per spelling, bounded like \\b wherever the spelling starts or ends on a word character"""
+    found = set()
+    spellings = {name: name for name in names}
+    for alias, name in aliases.items():
+        spellings.setdefault(alias.lower(), name.lower())
+    for spelling, name in spellings.items():
+        pattern = re.escape(spelling)
+        if re.match(r"\w", spelling[0]):
+            pattern = r"(?<!\w)" + pattern
+        if re.match(r"\w", spelling[-1]):
+            pattern = pattern + r"(?!\w)"
+        for match in re.finditer(f"(?=({pattern}))", text_lower):
+            found.add((match.start(1), match.start(1) + len(spelling), name))
+    return found
+
+
+def scanner_mentions(scanner, text_lower):
+    return {(match.start, match.end, match.skill) for match in scanner.scan(text_lower)}
+
+
+def skills(text):
+    return {match.skill for match in TAXONOMY.scanner.scan(text.lower())}
+
+
+@pytest.mark.parametrize("text, expected, absent", [
+    ("C, C++ and C# developer", {"c++", "c#"}, set()),
+    ("Wrote C++ daily", {"c++"}, {"c#"}),
+    ("JavaScript and TypeScript", {"javascript", "typescript"}, {"java"}),
+    ("Java, then JavaScript", {"java", "javascript"}, set()),
+    ("Built APIs in Node.js and React.js", {"node.js", "react"}, set()),
+    ("nodejs services", {"node.js"}, set()),
+    ("Go(lang) and golang", {"go"}, set()),
+    ("Gopher, Rusty, Swiftly", set(), {"go", "rust", "swift"}),
+    ("R and Rust", {"r", "rust"}, set()),
+    ("Ruby on Rails", {"ruby", "rails"}, set()),
+    ("postgres_admin", set(), {"postgresql"}),
+])
+def test_word_boundaries(text, expected, absent):
+    found = skills(text)
+    assert expected <= found
+    assert not absent & found
+
+
+def test_parity_with_regex_on_taxonomy_spellings():
+    rng = random.Random(7)
+    spellings = list(TAXONOMY.names) + [alias.lower() for alias in TAXONOMY.aliases]
+    glue = [" ", "  ", ", ", ".", "/", "-", "_", "(", ")", "\n", "a", "x1", "+", "#", ""]
+    for _ in range(300):
+        text = "".join(rng.choice(spellings) + rng.choice(glue) for _ in range(rng.randint(1, 25)))
+        assert scanner_mentions(TAXONOMY.scanner, text) == regex_mentions(TAXONOMY.names, TAXONOMY.aliases, text), text
+
+
+def test_parity_with_punctuated_names():
+    categories = {"tools": ["c", "c++", "c#", ".net", "asp.net", "node.js", "ci/cd", "a+"], "other": ["net"]}
+    scanner = SkillScanner(categories)
+    names = [name for name, _ in scanner.skills]
+    for text in (
+        "c c++ c# .net asp.net node.js ci/cd a+",
+        "objective-c, c++11, c#.net, vb.net, asp.netcore",
+        "node.jsx ci/cdk a++ cc c",
+        "x.net (c) [c++] c#-8",
+    ):
+        assert scanner_mentions(scanner, text) == regex_mentions(names, {}, text), text
@@ -0,0 +1,102 @@
+import hashlib
+import io
+import os
+import random
+import tempfile
+import zipfile
+
+import pytest
+from docx import Document
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+import uploads
+from benchmarks import corpus
+from uploads import release, spool_file
+
+
+def spooled(content: bytes) -> tempfile.SpooledTemporaryFile:
+    # As Starlette spools a multipart file
+    source = tempfile.SpooledTemporaryFile(max_size=uploads._MEMORY_SPOOL_BYTES)
+    source.write(content)
+    source.seek(0)
+    return source
+
+
+def resume_docx(padding: int = 0) -> bytes:
+    document = Document()
+    for line in corpus.resume_text(random.Random(2), 3, corpus.SECTIONS, corpus.taxonomy_skills()).split("\n"):
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    if padding:
+        # An embedded image is never read as text, but makes the upload large
+        with zipfile.ZipFile(out, "a", zipfile.ZIP_STORED) as package:
+            package.writestr("word/media/image1.png", random.Random(0).randbytes(padding))
+    return out.getvalue()
+
+
+SMALL = b"%PDF-1.4 small"
+LARGE = b"%PDF-1.4 " + b"x" * (2 * uploads._MEMORY_SPOOL_BYTES)
+
+
+def test_a_small_spooled_upload_is_read_into_memory():
+    upload = spool_file(spooled(SMALL), "resume.pdf")
+    assert upload == (SMALL, len(SMALL), hashlib.sha256(SMALL).hexdigest(), False)
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_a_large_spooled_upload_is_read_from_its_open_file():
+    source = spooled(LARGE)
+    upload = spool_file(source, "resume.pdf")
+    assert upload.source == f"/proc/{os.getpid()}/fd/{source.fileno()}"
+    assert (upload.size, upload.sha256, upload.copied) == (len(LARGE), hashlib.sha256(LARGE).hexdigest(), False)
+    with open(upload.source, "rb") as reopened:
+        assert reopened.read() == LARGE
+    release(upload)
+    assert os.path.exists(upload.source)
+
+
+def test_without_proc_a_large_upload_is_copied(monkeypatch):
+    monkeypatch.setattr(uploads, "_open_file_path", lambda source: None)
+    upload = spool_file(spooled(LARGE), "resume.pdf")
+    assert upload.copied
+    with open(upload.source, "rb") as copy:
+        assert copy.read() == LARGE
+    release(upload)
+    assert not os.path.exists(upload.source)
+
+
+@pytest.mark.parametrize("source, copy", [(io.BytesIO(SMALL), False), (spooled(SMALL), True)])
+def test_other_streams_and_uploads_for_jobs_are_copied(source, copy):
+    upload = spool_file(source, "resume.pdf", copy=copy)
+    assert upload.copied and upload.size == len(SMALL)
+    release(upload)
+    assert not os.path.exists(upload.source)
+
+
+@pytest.mark.parametrize("content", [SMALL, LARGE])
+def test_oversize_and_mislabelled_uploads_are_rejected(content):
+    with pytest.raises(HTTPException) as error:
+        spool_file(spooled(content), "resume.pdf", max_bytes=len(content) - 1)
+    assert error.value.status_code == 413
+    with pytest.raises(HTTPException) as error:
+        spool_file(spooled(content), "resume.docx")
+    assert error.value.status_code == 400
+
+
+def test_small_and_large_uploads_parse_alike(monkeypatch):
+    paths = []
+    open_file_path = uploads._open_file_path
+    monkeypatch.setattr(uploads, "_open_file_path", lambda source: paths.append(open_file_path(source)) or paths[-1])
+    small, large = resume_docx(), resume_docx(padding=2 * uploads._MEMORY_SPOOL_BYTES)
+    with TestClient(main.app) as client:
+        parsed = [
+            client.post("/parse-resume-file", files={"file": (name, content)}).json()
+            for name, content in (("small.docx", small), ("large.docx", large))
+        ]
+    expected = main.parsed_content(main.parse_text(main.extract_document_text("small.docx", small)))
+    assert [{**result, "duplicate_cluster": None} for result in parsed] == [expected, expected]
+    # Only the large upload was handed to the parse worker as a path
+    assert len(paths) == 1
@@ -0,0 +1,140 @@
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple, Union
+
+from fastapi import HTTPException
+
+# Upload settings, overridable per deployment
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR") or None  # defaults to the system temp directory
+
+_CHUNK_BYTES = 256 * 1024
+# Starlette keeps multipart files up to this size in memory and spools larger ones to disk
+_MEMORY_SPOOL_BYTES = 1024 * 1024
+
+# Leading bytes of each accepted format. A PDF header may follow up to 1 KB of junk.
+_PDF_MAGIC = b"%PDF-"
+_ZIP_MAGIC = b"PK\x03\x04"
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# A document is either in memory (bytes) or spooled to disk (path)
+DocumentSource = Union[bytes, str]
+
+
+class SpooledUpload(NamedTuple):
+    source: DocumentSource
+    size: int
+    sha256: str
+    copied: bool  # source is a temp file of our own, removed by release()
+
+
+def has_expected_magic(filename: str, head: bytes) -> bool:
+    name = filename.lower()
+    if name.endswith('.pdf'):
+        return _PDF_MAGIC in head[:1024]
+    if name.endswith('.docx'):
+        return head.startswith(_ZIP_MAGIC)
+    if name.endswith('.doc'):
+        return head.startswith(_OLE_MAGIC) or head.startswith(_ZIP_MAGIC)
+    return False
+
+
+def spool_file(
+    source: BinaryIO, filename: str, max_bytes: int = UPLOAD_MAX_BYTES, copy: bool = False
+) -> SpooledUpload:
+    """Hash an upload and enforce its size and format, returning a source workers can read.
+
+    Starlette has already spooled multipart files, so those are not copied again: a small
+    one is returned as bytes and a larger one as a /proc path to its open file. Other
+    streams, uploads that must outlive the request (copy=True), and large uploads where
+    there is no /proc are copied to a temp file of our own instead.
+    """
+    if not copy and isinstance(source, tempfile.SpooledTemporaryFile):
+        if _remaining_bytes(source) <= _MEMORY_SPOOL_BYTES:
+            data = source.read(max_bytes + 1)
+            size, sha256 = _check(io.BytesIO(data), filename, max_bytes, None)
+            return SpooledUpload(data, size, sha256, False)
+        path = _open_file_path(source)
+        if path is not None:
+            size, sha256 = _check(source, filename, max_bytes, None)
+            return SpooledUpload(path, size, sha256, False)
+
+    fd, path = tempfile.mkstemp(prefix="upload-", dir=UPLOAD_TMP_DIR)
+    try:
+        with os.fdopen(fd, "wb") as target:
+            size, sha256 = _check(source, filename, max_bytes, target)
+    except BaseException:
+        discard(path)
+        raise
+    return SpooledUpload(path, size, sha256, True)
+
+
+def _remaining_bytes(source: BinaryIO) -> int:
+    position = source.tell()
+    end = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return end - position
+
+
+def _open_file_path(source: BinaryIO) -> Optional[str]:
+    """Path other processes of this user can open for as long as source stays open, where the OS has one"""
+    # fileno() moves a spool still in memory to disk first
+    path = f"/proc/{os.getpid()}/fd/{source.fileno()}"
+    return path if os.access(path, os.R_OK) else None
+
+
+def _check(source: BinaryIO, filename: str, max_bytes: int, target: Optional[BinaryIO]) -> Tuple[int, str]:
+    """Read an upload once, returning its size and SHA-256 and copying it to target if given"""
+    digest = hashlib.sha256()
+    size = 0
+    head = source.read(_CHUNK_BYTES)
+    if not has_expected_magic(filename, head):
+        raise HTTPException(status_code=400, detail="File content does not match its format")
+    chunk = head
+    while chunk:
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(status_code=413, detail=f"File too large (limit {max_bytes} bytes)")
+        digest.update(chunk)
+        if target is not None:
+            target.write(chunk)
+        chunk = source.read(_CHUNK_BYTES)
+    return size, digest.hexdigest()
+
+
+def release(upload: SpooledUpload) -> None:
+    """Remove the temp file spool_file made for an upload, if it made one"""
+    if upload.copied:
+        discard(upload.source)
+
+
+def discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def open_document(source: DocumentSource, mapped: bool = True) -> Iterator[BinaryIO]:
+    """Read-only file view of a document; spooled files are memory-mapped rather than copied.
+
+    zipfile needs a seekable() stream, which mmap lacks before Python 3.13, so zip-based
+    formats pass mapped=False and read through the plain file handle instead.
+    """
+    if isinstance(source, bytes):
+        yield io.BytesIO(source)
+        return
+    with open(source, "rb") as document:
+        if not mapped:
+            yield document
+            return
+        if os.fstat(document.fileno()).st_size == 0:
+            yield io.BytesIO(b"")
+            return
+        with mmap.mmap(document.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
@@ -25,6 +25,113 @@ async function extractTextLocally(fileBuffer: Buffer, fileName: string): Promise
   throw new Error('Unsupported file format')
 }
 
+// Parse jobs are submitted to the AI service queue and the client polls GET ?jobId=
+// for the result, so no request is held open for the whole parse
+const AI_JOB_ID = /^[0-9a-f]{32}$/
+
+function aiServiceUrl(): string {
+  return process.env.NEXT_PUBLIC_AI_SERVICE_URL || 'http://localhost:8001'
+}
+
+async function submitAiParseJob(fileBuffer: Buffer, fileName: string): Promise<string> {
+  const formData = new FormData()
+  const blob = new Blob([new Uint8Array(fileBuffer)], {
+    type: fileName.toLowerCase().endsWith('.pdf') ? 'application/pdf' : 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+  })
+  formData.append('file', blob, fileName)
+
+  const submitResponse = await fetch(`${aiServiceUrl()}/jobs/parse-resume-file`, {
+    method: 'POST',
+    body: formData,
+    signal: AbortSignal.timeout(5000) // 5 second timeout
+  })
+  if (!submitResponse.ok) {
+    throw new Error(`AI service rejected the parse job (${submitResponse.status})`)
+  }
+  const { job_id: jobId } = await submitResponse.json()
+  return jobId
+}
+
+// Transform AI service response to expected format
+function mapAiResult(aiResult: any) {
+  return {
+    personalInfo: {
+      name: aiResult.personal_info?.name || '',
+      email: aiResult.personal_info?.email || '',
+      phone: aiResult.personal_info?.phone || '',
+      location: aiResult.personal_info?.location || '',
+      linkedin: aiResult.personal_info?.linkedin || '',
+      github: aiResult.personal_info?.github || ''
+    },
+    professionalSummary: '',
+    experience: (aiResult.experience || []).map((exp: any) => ({
+      id: uuidv4(),
+      company: exp.company || '',
+      position: exp.position || '',
+      location: '',
+      startDate: exp.duration ? exp.duration.split(' - ')[0] : '',
+      endDate: exp.duration ? exp.duration.split(' - ')[1] : '',
+      current: exp.duration?.toLowerCase().includes('present') || exp.duration?.toLowerCase().includes('current'),
+      description: exp.description || '',
+      proofUploaded: false
+    })),
+    education: (aiResult.education || []).map((edu: any) => ({
+      id: uuidv4(),
+      institution: edu.institution || '',
+      degree: edu.degree || '',
+      field: '',
+      startDate: '',
+      endDate: edu.year || '',
+      grade: '',
+      location: ''
+    })),
+    skills: {
+      technical: (aiResult.skills || [])
+        .filter((skill: any) => skill.category === 'programming' || skill.category === 'databases' || skill.category === 'cloud' || skill.category === 'tools')
+        .map((skill: any) => skill.name) || [],
+      soft: (aiResult.skills || [])
+        .filter((skill: any) => skill.category === 'soft_skills')
+        .map((skill: any) => skill.name) || []
+    },
+    certificates: (aiResult.certificates || []).map((cert: any) => ({
+      id: uuidv4(),
+      name: cert.name || '',
+      issuer: cert.issuer || '',
+      certificateId: cert.certificateId || '',
+      issueDate: cert.date || '',
+      verificationStatus: cert.certificateId ? 'pending' : 'pending',
+      verified: false
+    })),
+    projects: [],
+    awards: [],
+    languages: []
+  }
+}
+
+// Resume data built by the local parsers, used when the AI service cannot parse the file
+async function extractDataLocally(fileBuffer: Buffer, fileName: string) {
+  const text = await extractTextLocally(fileBuffer, fileName)
+  const personal = extractPersonalInfo(text)
+  return {
+    personalInfo: {
+      name: personal.name || '',
+      email: personal.email || '',
+      phone: personal.phone || '',
+      location: personal.location || '',
+      linkedin: personal.linkedin || '',
+      github: personal.github || ''
+    },
+    professionalSummary: '',
+    experience: extractExperience(text),
+    education: extractEducation(text),
+    skills: extractSkills(text),
+    certificates: extractCertificates(text),
+    projects: [],
+    awards: [],
+    languages: []
+  }
+}
+
 // Parsers
 function extractPersonalInfo(text: string) {
   const emailMatch = text.match(/[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}/)
@@ -245,122 +352,34 @@ export async function POST(request: NextRequest) {
       // Read file content
       const fileBuffer = await fs.readFile(filePath)
 
-      let extractedData: any
-
-      try {
-        // Try to call AI service for extraction
-        const aiServiceUrl = process.env.NEXT_PUBLIC_AI_SERVICE_URL || 'http://localhost:8001'
-        const formData = new FormData()
-        const blob = new Blob([new Uint8Array(fileBuffer)], {
-          type: file.name.toLowerCase().endsWith('.pdf') ? 'application/pdf' : 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        })
-        formData.append('file', blob, file.name)
-
-        const aiResponse = await fetch(`${aiServiceUrl}/parse-resume-file`, {
-          method: 'POST',
-          body: formData,
-          signal: AbortSignal.timeout(5000) // 5 second timeout
-        })
-
-        if (aiResponse.ok) {
-          const aiResult = await aiResponse.json()
-
-          // Transform AI service response to expected format
-          extractedData = {
-            personalInfo: {
-              name: aiResult.personal_info?.name || '',
-              email: aiResult.personal_info?.email || '',
-              phone: aiResult.personal_info?.phone || '',
-              location: aiResult.personal_info?.location || '',
-              linkedin: aiResult.personal_info?.linkedin || '',
-              github: aiResult.personal_info?.github || ''
-            },
-            professionalSummary: '',
-            experience: (aiResult.experience || []).map((exp: any) => ({
-              id: uuidv4(),
-              company: exp.company || '',
-              position: exp.position || '',
-              location: '',
-              startDate: exp.duration ? exp.duration.split(' - ')[0] : '',
-              endDate: exp.duration ? exp.duration.split(' - ')[1] : '',
-              current: exp.duration?.toLowerCase().includes('present') || exp.duration?.toLowerCase().includes('current'),
-              description: exp.description || '',
-              proofUploaded: false
-            })),
-            education: (aiResult.education || []).map((edu: any) => ({
-              id: uuidv4(),
-              institution: edu.institution || '',
-              degree: edu.degree || '',
-              field: '',
-              startDate: '',
-              endDate: edu.year || '',
-              grade: '',
-              location: ''
-            })),
-            skills: {
-              technical: (aiResult.skills || [])
-                .filter((skill: any) => skill.category === 'programming' || skill.category === 'databases' || skill.category === 'cloud' || skill.category === 'tools')
-                .map((skill: any) => skill.name) || [],
-              soft: (aiResult.skills || [])
-                .filter((skill: any) => skill.category === 'soft_skills')
-                .map((skill: any) => skill.name) || []
-            },
-            certificates: (aiResult.certificates || []).map((cert: any) => ({
-              id: uuidv4(),
-              name: cert.name || '',
-              issuer: cert.issuer || '',
-              certificateId: cert.certificateId || '',
-              issueDate: cert.date || '',
-              verificationStatus: cert.certificateId ? 'pending' : 'pending',
-              verified: false
-            })),
-            projects: [],
-            awards: [],
-            languages: []
+      let extractedData: any = null
+      let jobId: string | null = null
+
+      // Clients send extraction=local after the AI parse job failed or timed out
+      if (formData.get('extraction') !== 'local') {
+        try {
+          // Try to queue the parse on the AI service; the client polls GET for the result
+          jobId = await submitAiParseJob(fileBuffer, file.name)
+        } catch (aiError) {
+          if (aiError instanceof Error) {
+            console.log('AI service not available, falling back to local extraction:', aiError.message)
+          } else {
+            console.log('AI service not available, falling back to local extraction:', String(aiError))
           }
-        } else {
-          throw new Error('AI service not available')
-        }
-      } catch (aiError) {
-        if (aiError instanceof Error) {
-          console.log('AI service not available, falling back to local extraction:', aiError.message)
-        } else {
-          console.log('AI service not available, falling back to local extraction:', String(aiError))
         }
+      }
 
+      if (!jobId) {
         // Fallback to local extraction when AI service is not available
-        const text = await extractTextLocally(fileBuffer, file.name)
-
-        // Build extracted data using local parsers
-        const personal = extractPersonalInfo(text)
-        const experience = extractExperience(text)
-        const education = extractEducation(text)
-        const skills = extractSkills(text)
-        const certifications = extractCertificates(text)
-
-        extractedData = {
-          personalInfo: {
-            name: personal.name || '',
-            email: personal.email || '',
-            phone: personal.phone || '',
-            location: personal.location || '',
-            linkedin: personal.linkedin || '',
-            github: personal.github || ''
-          },
-          professionalSummary: '',
-          experience,
-          education,
-          skills,
-          certificates: certifications,
-          projects: [],
-          awards: [],
-          languages: []
-        }
+        extractedData = await extractDataLocally(fileBuffer, file.name)
       }
 
       // Clean up temporary file
       await fs.unlink(filePath)
 
+      if (jobId) {
+        return NextResponse.json({ success: true, jobId, status: 'queued' }, { status: 202 })
+      }
       return NextResponse.json({
         success: true,
         data: extractedData,
@@ -388,3 +407,38 @@ export async function POST(request: NextRequest) {
     )
   }
 }
+
+// Result of a parse job queued by POST: 202 while it is still queued or running. Errors
+// carry fallback: 'local', telling the client to POST the file again with extraction=local
+export async function GET(request: NextRequest) {
+  const jobId = request.nextUrl.searchParams.get('jobId') || ''
+  if (!AI_JOB_ID.test(jobId)) {
+    return NextResponse.json({ error: 'Invalid job id' }, { status: 400 })
+  }
+
+  try {
+    const resultResponse = await fetch(`${aiServiceUrl()}/jobs/${jobId}/result`, {
+      signal: AbortSignal.timeout(5000)
+    })
+    if (resultResponse.ok) {
+      return NextResponse.json({
+        success: true,
+        data: mapAiResult(await resultResponse.json()),
+        message: 'Resume processed successfully'
+      })
+    }
+    // 409 means the job is still queued or running
+    if (resultResponse.status === 409) {
+      return NextResponse.json({ success: true, jobId, status: 'pending' }, { status: 202 })
+    }
+    if (resultResponse.status === 404) {
+      return NextResponse.json({ error: 'Job not found', fallback: 'local' }, { status: 404 })
+    }
+    // 422 means the AI service could not parse the file
+    console.error(`AI service parse job ${jobId} failed (${resultResponse.status})`)
+    return NextResponse.json({ error: 'Failed to extract data from resume', fallback: 'local' }, { status: 422 })
+  } catch (error) {
+    console.error('Resume job status error:', error)
+    return NextResponse.json({ error: 'AI service not available', fallback: 'local' }, { status: 502 })
+  }
+}
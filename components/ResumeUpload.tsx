@@ -4,7 +4,7 @@ import { useState, useCallback } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import { Upload, FileText, CheckCircle, AlertCircle, Loader2, X } from 'lucide-react'
 import ResumeDataReview from './ResumeDataReview'
-import { extractResumeData as extractFromImageOrPdf } from '../utils/ocrExtractor'
+import { extractResumeData as extractFromImageOrPdf, requestResumeExtraction } from '../utils/ocrExtractor'
 
 interface ResumeUploadProps {
   onResumeExtracted: (extractedData: any) => void
@@ -111,30 +111,20 @@ export default function ResumeUpload({ onResumeExtracted, hasExistingResume = fa
         setExtractedData(mapped)
         setShowReview(true)
       } else {
-        // Create FormData for file upload (PDF/DOCX)
-        const formData = new FormData()
-        formData.append('resume', file)
-
-        // Upload and extract resume data via server
-        const response = await fetch('/api/resume/extract', {
-          method: 'POST',
-          body: formData,
-        })
-
-        clearInterval(progressInterval)
-        setUploadProgress(100)
-
-        if (!response.ok) {
-          throw new Error('Failed to process resume')
+        // Upload and extract resume data via server (PDF/DOCX), polling its parse job
+        let serverData: any
+        try {
+          serverData = await requestResumeExtraction(file)
+        } finally {
+          clearInterval(progressInterval)
         }
-
-        const extractedData = await response.json()
+        setUploadProgress(100)
 
         setExtractionStatus('success')
         setIsUploading(false)
 
         // Store extracted data and show review component
-        setExtractedData(extractedData.data)
+        setExtractedData(serverData)
         setShowReview(true)
       }
 
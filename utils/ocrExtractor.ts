@@ -252,6 +252,63 @@ function extractSocialProfiles(text: string): ExtractedData['socialProfiles'] {
   }
 }
 
+// Server-side extraction queues a parse job and answers with its id; poll for the result
+// here rather than holding the upload request open for the whole parse
+const EXTRACTION_TIMEOUT_MS = 60000
+const EXTRACTION_POLL_INTERVAL_MS = 1000
+
+async function postResume(file: File, extraction?: 'local'): Promise<any> {
+  const formData = new FormData()
+  formData.append('resume', file)
+  if (extraction) {
+    formData.append('extraction', extraction)
+  }
+
+  const response = await fetch('/api/resume/extract', {
+    method: 'POST',
+    body: formData
+  })
+  if (!response.ok) {
+    throw new Error('Failed to process resume')
+  }
+  return response.json()
+}
+
+async function pollParseJob(jobId: string): Promise<any> {
+  const deadline = Date.now() + EXTRACTION_TIMEOUT_MS
+  while (Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, EXTRACTION_POLL_INTERVAL_MS))
+    // 202 means the job is still queued or running
+    const poll = await fetch(`/api/resume/extract?jobId=${encodeURIComponent(jobId)}`)
+    const payload = await poll.json()
+    if (!poll.ok) {
+      throw new Error(payload.error || 'Failed to process resume')
+    }
+    if (payload.data) {
+      return payload.data
+    }
+  }
+  throw new Error('Resume processing timed out')
+}
+
+export async function requestResumeExtraction(file: File): Promise<any> {
+  const payload = await postResume(file)
+  if (payload.data) {
+    return payload.data
+  }
+  if (!payload.jobId) {
+    throw new Error('Failed to process resume')
+  }
+
+  try {
+    return await pollParseJob(payload.jobId)
+  } catch (error) {
+    // A job the AI service could not finish falls back to the server's local extraction
+    console.log('AI parse job did not finish, falling back to local extraction:', error instanceof Error ? error.message : String(error))
+    return (await postResume(file, 'local')).data
+  }
+}
+
 // Main extraction function
 export async function extractResumeData(file: File): Promise<ExtractedData> {
   // Prefer server-side extraction via existing API route for PDFs/DOCX
@@ -259,23 +316,10 @@ export async function extractResumeData(file: File): Promise<ExtractedData> {
     file.type === 'application/pdf' ||
     file.type === 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
   ) {
-    const formData = new FormData()
-    formData.append('resume', file)
-
-    const response = await fetch('/api/resume/extract', {
-      method: 'POST',
-      body: formData
-    })
-
-    if (!response.ok) {
-      throw new Error('Failed to extract resume data')
-    }
-
-    const payload = await response.json()
-    return mapServerToExtractedData(payload.data)
+    return mapServerToExtractedData(await requestResumeExtraction(file))
   }
 
-  // Basic fallback: attempt local parse only if text can be derived (currently returns empty)
+  // Images are read with client-side OCR
   if (file.type.startsWith('image/')) {
     const text = await extractTextFromImage(file)
     return parseResumeText(text)